@@ -0,0 +1,418 @@
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from types import ModuleType
+from typing import Any, Dict, List
+
+import exercise1
+import exercise1_nosimpy
+import exercise1_vectorized
+from event_list import EVENT_LISTS, make_event_list
+
+# Engines under comparison
+ENGINES: Dict[str, ModuleType] = {
+    "nosimpy": exercise1_nosimpy,
+    "simpy": exercise1,
+    "vectorized": exercise1_vectorized,
+}
+REFERENCE: str = "nosimpy"  # Engine the others are checked against
+
+# Command lines timed by the startup benchmark (run with this interpreter)
+STARTUP_COMMANDS: Dict[str, List[str]] = {
+    "python": ["-c", "pass"],
+    "numpy": ["-c", "import numpy"],
+    "exercise2 --no-plot": ["exercise2.py", "--no-plot", "--tfinal", "1"],
+    "exercise2 rk45 --no-plot": [
+        "exercise2.py",
+        "--no-plot",
+        "--method",
+        "rk45",
+        "--tfinal",
+        "1",
+    ],
+}
+
+
+def code_version() -> str:
+    """
+    Identify the version of the code being benchmarked.
+
+    Returns:
+        str: Short git commit hash, or 'unknown' outside a git checkout.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def configure(module: ModuleType, params: Dict[str, float]) -> None:
+    """
+    Set the simulation parameters (module constants) of an engine.
+
+    Args:
+        module (ModuleType): Engine module.
+        params (Dict[str, float]): Constant names and values.
+    """
+    for name, value in params.items():
+        setattr(module, name, value)
+
+
+def bench_engine(
+    module: ModuleType, params: Dict[str, float], seeds: List[int]
+) -> Dict[str, Any]:
+    """
+    Time one engine over several seeds and measure its peak memory.
+
+    Args:
+        module (ModuleType): Engine module.
+        params (Dict[str, float]): Simulation parameters.
+        seeds (List[int]): One replication per seed.
+
+    Returns:
+        Dict[str, Any]: Wall time, events/second, peak memory and per-replication statistics.
+    """
+    configure(module, params)
+    runs: List[Dict[str, float]] = []
+    wall: float = 0.0
+    events: int = 0
+    for seed in seeds:
+        start = time.perf_counter()
+        runs.append(module.run_simulation(seed=seed, print_report=False))
+        wall += time.perf_counter() - start
+        # The engines schedule different internal events, so count what both share:
+        # one event per inspection or repair started
+        events += len(module.inspection_wait_times) + len(module.repair_wait_times)
+
+    # Memory is measured on a separate run so tracing does not distort the timings
+    tracemalloc.start()
+    module.run_simulation(seed=seeds[0], print_report=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_time": wall,
+        "events": events,
+        "events_per_second": events / wall,
+        "peak_memory_kib": peak / 1024,
+        "runs": runs,
+    }
+
+
+def agreement(a: List[Dict[str, float]], b: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Compare the replication means of two engines metric by metric.
+
+    Args:
+        a (List[Dict[str, float]]): Per-replication statistics of the first engine.
+        b (List[Dict[str, float]]): Per-replication statistics of the second engine.
+
+    Returns:
+        Dict[str, float]: |difference of means| / standard error per metric
+        (values above ~2 suggest the engines disagree).
+    """
+    z: Dict[str, float] = {}
+    for metric in a[0]:
+        xa = [r[metric] for r in a]
+        xb = [r[metric] for r in b]
+        var = (statistics.variance(xa) if len(xa) > 1 else 0.0) / len(xa) + (
+            statistics.variance(xb) if len(xb) > 1 else 0.0
+        ) / len(xb)
+        diff = abs(statistics.fmean(xa) - statistics.fmean(xb))
+        z[metric] = (
+            diff / math.sqrt(var) if var > 0 else (0.0 if diff == 0 else math.inf)
+        )
+    return z
+
+
+def run_benchmarks(
+    sim_times: List[float],
+    interarrivals: List[float],
+    capacities: List[int],
+    replications: int,
+) -> Dict[str, Any]:
+    """
+    Run every engine over the cartesian grid of parameters.
+
+    Args:
+        sim_times (List[float]): Values of SIMULATION_TIME.
+        interarrivals (List[float]): Values of MEAN_INTERARRIVAL.
+        capacities (List[int]): Values of REPAIR_CAPACITY.
+        replications (int): Replications per engine and grid point.
+
+    Returns:
+        Dict[str, Any]: Benchmark document (metadata and one entry per grid point).
+    """
+    seeds = list(range(replications))
+    results = []
+    for sim_time, interarrival, capacity in itertools.product(
+        sim_times, interarrivals, capacities
+    ):
+        params = {
+            "SIMULATION_TIME": sim_time,
+            "MEAN_INTERARRIVAL": interarrival,
+            "REPAIR_CAPACITY": capacity,
+        }
+        engines = {name: bench_engine(m, params, seeds) for name, m in ENGINES.items()}
+        z = {
+            name: agreement(engines[REFERENCE]["runs"], e["runs"])
+            for name, e in engines.items()
+            if name != REFERENCE
+        }
+        for e in engines.values():
+            del e["runs"]
+        results.append({"params": params, "engines": engines, "agreement_z": z})
+
+    return {
+        "benchmark": "bus_depot_engines",
+        "version": code_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "replications": replications,
+        "results": results,
+    }
+
+
+def hold(kind: str, size: int, operations: int, seed: int = 0) -> float:
+    """
+    Time the classic hold model on a future event list: with `size` pending events,
+    repeatedly remove the earliest one and schedule a new one an exponential time
+    later, so the number of pending events stays constant.
+
+    Args:
+        kind (str): Event list implementation ('heap', 'calendar' or 'ladder').
+        size (int): Number of pending events.
+        operations (int): Number of timed hold operations (after as many warm-up ones).
+        seed (int): Seed of the event times.
+
+    Returns:
+        float: Mean time of one hold operation (one pop and one push), in nanoseconds.
+    """
+    rng = random.Random(seed)
+    events = make_event_list(kind)
+    for i in range(size):
+        events.push((rng.expovariate(1.0), i))
+    seq = size
+    # The first (untimed) pass lets the calendar and ladder queues settle after
+    # the initial fill; only the second pass is measured
+    for _ in range(2):
+        delays = [rng.expovariate(1.0) for _ in range(operations)]
+        start = time.perf_counter()
+        for delay in delays:
+            seq += 1
+            events.push((events.pop()[0] + delay, seq))
+        elapsed = time.perf_counter() - start
+    return 1e9 * elapsed / operations
+
+
+def check_event_lists(
+    size: int = 5000, operations: int = 20000, seeds: int = 4
+) -> None:
+    """
+    Check every event list against heapq on a random hold sequence whose times
+    are mostly whole numbers, so many events tie and buckets are split into
+    nested ladder rungs.
+
+    Args:
+        size (int): Number of pending events.
+        operations (int): Number of hold operations (one pop and one push).
+        seeds (int): Number of random sequences (seeds 0, 1, ...) per event list.
+
+    Raises:
+        RuntimeError: If an event list pops an event in a different order than
+            heapq, loses one or reports a different length.
+    """
+    for kind, seed in itertools.product(EVENT_LISTS, range(seeds)):
+        rng = random.Random(seed)
+        events = make_event_list(kind)
+        reference: List[Any] = []
+        for seq in range(size):
+            event = (float(rng.randint(0, 100)), seq)
+            events.push(event)
+            heapq.heappush(reference, event)
+        for seq in range(size, size + operations):
+            expected = heapq.heappop(reference)
+            try:
+                got = events.pop()
+            except IndexError:
+                got = None
+            if got != expected or len(events) != len(reference):
+                raise RuntimeError(
+                    f"{kind} event list popped {got} instead of {expected}"
+                )
+            delay = rng.randint(0, 60) if rng.random() < 0.9 else rng.expovariate(0.1)
+            event = (expected[0] + delay, seq)
+            events.push(event)
+            heapq.heappush(reference, event)
+
+
+def bench_event_lists(sizes: List[int], operations: int) -> Dict[str, Any]:
+    """
+    Run the hold model for every event list implementation and pending-event count.
+
+    Args:
+        sizes (List[int]): Numbers of pending events.
+        operations (int): Timed hold operations per measurement.
+
+    Returns:
+        Dict[str, Any]: Benchmark document with nanoseconds per hold operation
+        and the fastest implementation at each size.
+    """
+    # Every implementation must pop the same events as heapq before it is timed
+    check_event_lists()
+    results = []
+    for size in sizes:
+        ns = {kind: hold(kind, size, operations) for kind in EVENT_LISTS}
+        results.append(
+            {"size": size, "ns_per_hold": ns, "fastest": min(ns, key=ns.get)}
+        )
+    return {
+        "benchmark": "event_lists_hold",
+        "version": code_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "operations": operations,
+        "results": results,
+    }
+
+
+def bench_startup(runs: int) -> Dict[str, Any]:
+    """
+    Time short command line runs from process start to exit.
+
+    Every command runs `runs` times in a fresh interpreter, so the measurement
+    includes interpreter startup and every module import; the 'python' and
+    'numpy' entries give the floor that no script can go below.
+
+    Args:
+        runs (int): Runs per command.
+
+    Returns:
+        Dict[str, Any]: Benchmark document with the best and median wall time of
+        each command in milliseconds.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, command in STARTUP_COMMANDS.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, *command], cwd=here, check=True, capture_output=True
+            )
+            times.append(1e3 * (time.perf_counter() - start))
+        results[name] = {"best_ms": min(times), "median_ms": statistics.median(times)}
+    return {
+        "benchmark": "startup",
+        "version": code_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "runs": runs,
+        "results": results,
+    }
+
+
+def report(document: Dict[str, Any]) -> None:
+    """
+    Print a summary table of a benchmark document.
+
+    Args:
+        document (Dict[str, Any]): Output of run_benchmarks().
+    """
+    print(f"=== Engine benchmark ({document['version']}) ===")
+    for r in document["results"]:
+        p = r["params"]
+        print(
+            f"T={p['SIMULATION_TIME']:g} ia={p['MEAN_INTERARRIVAL']:g} "
+            f"c={p['REPAIR_CAPACITY']}"
+        )
+        for name, e in r["engines"].items():
+            z = r["agreement_z"].get(name)
+            print(
+                f"    {name:>10}: {e['wall_time']:8.3f} s, "
+                f"{e['events_per_second']:10.0f} events/s, "
+                f"peak {e['peak_memory_kib']:8.1f} KiB"
+                + (f", max z vs {REFERENCE} = {max(z.values()):.2f}" if z else "")
+            )
+
+
+def main() -> None:
+    """
+    Parse command line arguments, run the benchmark grid and store it as JSON.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the SimPy and hand-written bus depot engines"
+    )
+    parser.add_argument("--simtime", type=float, nargs="+", default=[160.0, 1600.0])
+    parser.add_argument("--interarrival", type=float, nargs="+", default=[2.0, 1.0])
+    parser.add_argument("--capacity", type=int, nargs="+", default=[2])
+    parser.add_argument(
+        "--replications", type=int, default=10, help="Replications per grid point"
+    )
+    parser.add_argument(
+        "--output", type=str, default="", help="JSON file to store the results"
+    )
+    parser.add_argument(
+        "--hold",
+        type=int,
+        nargs="+",
+        default=None,
+        metavar="SIZE",
+        help="Run the hold-model event list benchmark at these pending-event counts",
+    )
+    parser.add_argument(
+        "--operations", type=int, default=100000, help="Hold operations per size"
+    )
+    parser.add_argument(
+        "--startup",
+        type=int,
+        default=0,
+        metavar="RUNS",
+        help="Time the startup of short command line runs, RUNS times each",
+    )
+    args = parser.parse_args()
+
+    if args.startup:
+        document = bench_startup(args.startup)
+        print("=== Command line startup (ms) ===")
+        for name, r in document["results"].items():
+            print(f"{name:>26}: best {r['best_ms']:7.1f}, median {r['median_ms']:7.1f}")
+    elif args.hold:
+        document = bench_event_lists(args.hold, args.operations)
+        print("=== Event list hold model (ns per pop + push) ===")
+        print(f"{'size':>10} " + " ".join(f"{kind:>10}" for kind in EVENT_LISTS))
+        for r in document["results"]:
+            print(
+                f"{r['size']:>10} "
+                + " ".join(f"{r['ns_per_hold'][k]:>10.0f}" for k in EVENT_LISTS)
+                + f"  fastest: {r['fastest']}"
+            )
+    else:
+        document = run_benchmarks(
+            args.simtime, args.interarrival, args.capacity, args.replications
+        )
+        report(document)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
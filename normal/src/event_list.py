@@ -0,0 +1,294 @@
+import bisect
+import heapq
+import math
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+# Events are tuples whose first field is the event time; the remaining fields must
+# make every event unique (e.g. a sequence number) so ties never compare payloads
+Event = Tuple[Any, ...]
+
+
+class HeapEventList(list):
+    """
+    Future event list kept as a binary heap (O(log n) per operation).
+
+    Subclassing list keeps len() and truth tests at C speed, and heapq does the
+    sifting in C, which makes it the fastest choice for small and medium lists.
+    """
+
+    def push(self, event: Event) -> None:
+        """Insert an event."""
+        heapq.heappush(self, event)
+
+    def pop(self) -> Event:  # type: ignore[override]
+        """Remove and return the earliest event."""
+        return heapq.heappop(self)
+
+    def peek(self) -> Event:
+        """Return the earliest event without removing it."""
+        return self[0]
+
+
+class CalendarQueue:
+    """
+    Calendar queue (Brown, 1988): events are hashed by time into a ring of buckets
+    ("days") of a fixed width, each kept sorted, and dequeued by walking the days
+    of the current "year". The number of buckets doubles or halves with the
+    number of events and the width is re-estimated from the spacing of the
+    earliest events, so enqueue and dequeue take O(1) expected time.
+    """
+
+    MIN_BUCKETS: int = 4  # The calendar never shrinks below this many buckets
+    SAMPLE_SIZE: int = 25  # Earliest events used to estimate the bucket width
+
+    def __init__(self, width: float = 1.0) -> None:
+        """
+        Create an empty calendar.
+
+        Args:
+            width (float): Initial bucket width (re-estimated on every resize).
+        """
+        self.width: float = width
+        self.buckets: List[List[Event]] = [[] for _ in range(self.MIN_BUCKETS)]
+        self.current: int = 0  # Absolute number of the day being dequeued
+        self.last_time: float = 0.0  # Time of the last dequeued event
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, event: Event) -> None:
+        """Insert an event into the bucket of its day."""
+        buckets = self.buckets
+        bisect.insort(buckets[int(event[0] / self.width) % len(buckets)], event)
+        self.size += 1
+        if self.size > 2 * len(buckets):
+            self.resize(2 * len(buckets))
+
+    def locate(self) -> List[Event]:
+        """
+        Find the bucket holding the earliest event and make its day current.
+
+        Returns:
+            List[Event]: The bucket; its first event is the earliest one.
+        """
+        if not self.size:
+            raise IndexError("pop from an empty event list")
+        buckets, width = self.buckets, self.width
+        n = len(buckets)
+        day = self.current
+        for _ in range(n):
+            bucket = buckets[day % n]
+            if bucket and int(bucket[0][0] / width) <= day:
+                self.current = day
+                return bucket
+            day += 1
+        # No event in the coming year: jump straight to the earliest one
+        bucket = min((b for b in buckets if b), key=lambda b: b[0])
+        self.current = int(bucket[0][0] / width)
+        return bucket
+
+    def pop(self) -> Event:
+        """Remove and return the earliest event."""
+        event = self.locate().pop(0)
+        self.last_time = event[0]
+        self.size -= 1
+        if self.size < len(self.buckets) // 2 and len(self.buckets) > self.MIN_BUCKETS:
+            self.resize(len(self.buckets) // 2)
+        return event
+
+    def peek(self) -> Event:
+        """Return the earliest event without removing it."""
+        return self.locate()[0]
+
+    def resize(self, num_buckets: int) -> None:
+        """
+        Rebuild the calendar with a new number of buckets and a new bucket width.
+
+        Args:
+            num_buckets (int): Number of buckets of the new calendar.
+        """
+        events = sorted(event for bucket in self.buckets for event in bucket)
+        sample = [event[0] for event in events[: self.SAMPLE_SIZE]]
+        gaps = [b - a for a, b in zip(sample, sample[1:])]
+        if gaps:
+            mean = sum(gaps) / len(gaps)
+            # Ignore clusters of distant events, as in Brown's estimate
+            close = [g for g in gaps if g <= 2 * mean]
+            if close and sum(close) > 0:
+                self.width = 3 * sum(close) / len(close)
+        self.buckets = [[] for _ in range(num_buckets)]
+        for event in events:
+            self.buckets[int(event[0] / self.width) % num_buckets].append(event)
+        # Events may still be scheduled from the last dequeued time on
+        start = min(events[0][0], self.last_time) if events else self.last_time
+        self.current = int(start / self.width)
+
+
+class LadderRung:
+    """One rung of a ladder queue: equal-width buckets starting at `start`."""
+
+    def __init__(self, start: float, width: float, events: List[Event]) -> None:
+        """
+        Create a rung with one bucket per event and spread the events over it.
+
+        Args:
+            start (float): Start time of the first bucket (at most the earliest event).
+            width (float): Bucket width.
+            events (List[Event]): Events to distribute.
+        """
+        self.start: float = start
+        self.width: float = width
+        self.buckets: List[List[Event]] = [[] for _ in events]
+        self.current: int = 0  # First bucket not yet moved down the ladder
+        if width > 0:
+            buckets, last = self.buckets, len(events) - 1
+            for event in events:
+                index = int((event[0] - start) / width)
+                buckets[
+                    index if 0 <= index < last else (0 if index < 0 else last)
+                ].append(event)
+        else:
+            self.buckets[0].extend(events)
+
+    def threshold(self) -> float:
+        """Start time of the first bucket not yet moved down the ladder."""
+        return self.start + self.current * self.width
+
+    def index(self, time: float) -> int:
+        """
+        Bucket of an event time, computed exactly as when the rung was filled.
+
+        The index never decreases with the time, so comparing it with `current`
+        tells whether an event belongs to this rung or further down the ladder
+        without the rounding of a recomputed threshold time.
+
+        Args:
+            time (float): Event time.
+
+        Returns:
+            int: Bucket index (times outside the rung go to the first or last bucket).
+        """
+        if self.width <= 0:
+            return 0
+        index = int((time - self.start) / self.width)
+        last = len(self.buckets) - 1
+        return index if 0 <= index < last else (0 if index < 0 else last)
+
+
+class LadderQueue:
+    """
+    Ladder queue (Tang, Goh and Thng, 2005): far-future events are appended
+    unsorted to Top; when the near future runs out, Top is spread over a rung of
+    buckets and buckets are split into finer child rungs until one is small
+    enough to be sorted into Bottom, from which events are dequeued. Events are
+    sorted only when they are about to be used, which gives O(1) amortised time
+    without the resizes of the calendar queue.
+    """
+
+    THRESHOLD: int = 50  # Largest bucket sorted into Bottom instead of split
+    MAX_RUNGS: int = 8  # Deepest ladder; larger buckets are then sorted anyway
+
+    def __init__(self) -> None:
+        self.top: List[Event] = []
+        self.top_min: float = math.inf
+        self.top_max: float = -math.inf
+        self.top_start: float = -math.inf  # Events after this time go to Top
+        self.rungs: List[LadderRung] = []
+        self.bottom: List[Event] = []
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, event: Event) -> None:
+        """Insert an event into Top, the rung covering its time or Bottom."""
+        self.size += 1
+        time = event[0]
+        if time > self.top_start:
+            self.top.append(event)
+            if time < self.top_min:
+                self.top_min = time
+            if time > self.top_max:
+                self.top_max = time
+            return
+        # A rung only takes events for buckets it has not yet moved down the ladder
+        # (never for an exhausted rung); earlier ones go down to the next rung
+        for rung in self.rungs:
+            index = rung.index(time)
+            if index >= rung.current:
+                rung.buckets[index].append(event)
+                return
+        bisect.insort(self.bottom, event)
+
+    def refill(self) -> None:
+        """Move the earliest bucket of the ladder, sorted, into Bottom."""
+        while True:
+            if not self.rungs:
+                if not self.top:
+                    raise IndexError("pop from an empty event list")
+                width = (self.top_max - self.top_min) / len(self.top)
+                self.rungs.append(LadderRung(self.top_min, width, self.top))
+                self.top_start = self.top_max
+                self.top, self.top_min, self.top_max = [], math.inf, -math.inf
+            rung = self.rungs[-1]
+            buckets = rung.buckets
+            while rung.current < len(buckets) and not buckets[rung.current]:
+                rung.current += 1
+            if rung.current == len(buckets):
+                self.rungs.pop()
+                continue
+            bucket = buckets[rung.current]
+            buckets[rung.current] = []
+            start = rung.threshold()
+            rung.current += 1
+            if (
+                len(bucket) > self.THRESHOLD
+                and len(self.rungs) < self.MAX_RUNGS
+                and rung.width > 0
+            ):
+                width = rung.width / len(bucket)
+                self.rungs.append(LadderRung(start, width, bucket))
+                continue
+            bucket.sort()
+            self.bottom = bucket
+            return
+
+    def pop(self) -> Event:
+        """Remove and return the earliest event."""
+        if not self.bottom:
+            self.refill()
+        self.size -= 1
+        return self.bottom.pop(0)
+
+    def peek(self) -> Event:
+        """Return the earliest event without removing it."""
+        if not self.bottom:
+            self.refill()
+        return self.bottom[0]
+
+
+EventList = Union[HeapEventList, CalendarQueue, LadderQueue]
+
+# Future event list implementations selectable by name
+EVENT_LISTS: Dict[str, Callable[[], EventList]] = {
+    "heap": HeapEventList,
+    "calendar": CalendarQueue,
+    "ladder": LadderQueue,
+}
+
+
+def make_event_list(kind: str = "heap") -> EventList:
+    """
+    Create an empty future event list.
+
+    Args:
+        kind (str): 'heap', 'calendar' or 'ladder'.
+
+    Returns:
+        EventList: The new event list; every kind supports push(), pop(), peek()
+        and len().
+    """
+    if kind not in EVENT_LISTS:
+        raise ValueError(f"Unknown event list: {kind}")
+    return EVENT_LISTS[kind]()
@@ -27,8 +27,53 @@ def convert_hours_to_hms(hours: float) -> str:
 # Global lists for statistics
 inspection_wait_times: List[float] = []  # Waiting times for inspection
 repair_wait_times: List[float] = []  # Waiting times for repair
-inspection_queue_lengths: List[int] = []  # Sampled lengths of the inspection queue
-repair_queue_lengths: List[int] = []  # Sampled lengths of the repair queue
+
+
+def reset_statistics() -> None:
+    """
+    Clear the global statistics lists so a new replication starts from scratch.
+    """
+    inspection_wait_times.clear()
+    repair_wait_times.clear()
+
+
+class QueueMonitor:
+    """
+    Time-weighted accumulator of the number of buses waiting at a station.
+
+    Updated only when a bus joins or leaves the queue, instead of sampling it.
+    """
+
+    def __init__(self, env: simpy.Environment) -> None:
+        self.env: simpy.Environment = env
+        self.length: int = 0  # Buses currently waiting
+        self.area: float = 0.0  # Time-integral of the queue length
+        self.last_time: float = env.now  # Time of the last change
+
+    def update(self, change: int) -> None:
+        """
+        Accumulate the area up to now and apply a change to the queue length.
+
+        Args:
+            change (int): +1 when a bus joins the queue, -1 when it leaves.
+        """
+        now: float = self.env.now
+        self.area += self.length * (now - self.last_time)
+        self.last_time = now
+        self.length += change
+
+    def average(self, until: float) -> float:
+        """
+        Time-average queue length over [0, until].
+
+        Args:
+            until (float): End of the observation period.
+
+        Returns:
+            float: Average number of buses waiting.
+        """
+        area: float = self.area + self.length * (until - self.last_time)
+        return area / until
 
 
 class InspectionStation:
@@ -40,6 +85,7 @@ class InspectionStation:
         self.env: simpy.Environment = env
         self.resource: simpy.Resource = simpy.Resource(env, INSPECTION_CAPACITY)
         self.busy_time: float = 0.0  # Total time the station is occupied
+        self.queue: QueueMonitor = QueueMonitor(env)
 
     def inspect(self, bus_id: str) -> Generator[Any, None, None]:
         """
@@ -65,6 +111,7 @@ class RepairStation:
         self.env: simpy.Environment = env
         self.resource: simpy.Resource = simpy.Resource(env, REPAIR_CAPACITY)
         self.busy_time: float = 0.0  # Combined busy time for both repair units
+        self.queue: QueueMonitor = QueueMonitor(env)
 
     def repair(self, bus_id: str) -> Generator[Any, None, None]:
         """
@@ -103,7 +150,9 @@ def bus(
 
     # Inspection Phase
     with inspection_station.resource.request() as req:
+        inspection_station.queue.update(+1)
         yield req
+        inspection_station.queue.update(-1)
         wait_time: float = env.now - arrival_time
         inspection_wait_times.append(wait_time)
         yield env.process(inspection_station.inspect(bus_id))
@@ -112,7 +161,9 @@ def bus(
     if random.random() < REPAIR_PROB:
         repair_arrival_time: float = env.now
         with repair_station.resource.request() as req:
+            repair_station.queue.update(+1)
             yield req
+            repair_station.queue.update(-1)
             repair_wait: float = env.now - repair_arrival_time
             repair_wait_times.append(repair_wait)
             yield env.process(repair_station.repair(bus_id))
@@ -142,35 +193,9 @@ def bus_generator(
         yield env.timeout(interarrival_time)
 
 
-def monitor_queues(
-    env: simpy.Environment,
-    inspection_station: InspectionStation,
-    repair_station: RepairStation,
-    sample_interval: float = 0.1,
-) -> Generator[Any, None, None]:
-    """
-    Periodically samples the lengths of the inspection and repair queues.
-
-    Args:
-        env (simpy.Environment): The simulation environment.
-        inspection_station (InspectionStation): The inspection station instance.
-        repair_station (RepairStation): The repair station instance.
-        sample_interval (float, optional): Time interval between samples. Defaults to 0.1.
-
-    Yields:
-        Generator events for sampling the queue lengths.
-    """
-    while True:
-        inspection_queue_lengths.append(len(inspection_station.resource.queue))
-        repair_queue_lengths.append(len(repair_station.resource.queue))
-        yield env.timeout(sample_interval)
-
-
 def calculate_statistics(
     inspection_wait_times: List[float],
     repair_wait_times: List[float],
-    inspection_queue_lengths: List[int],
-    repair_queue_lengths: List[int],
     inspection_station: InspectionStation,
     repair_station: RepairStation,
 ) -> dict:
@@ -179,8 +204,6 @@ def calculate_statistics(
     Args:
         inspection_wait_times (List[float]): List of inspection wait times.
         repair_wait_times (List[float]): List of repair wait times.
-        inspection_queue_lengths (List[int]): List of inspection queue lengths.
-        repair_queue_lengths (List[int]): List of repair queue lengths.
         inspection_station (InspectionStation): The inspection station instance.
         repair_station (RepairStation): The repair station instance.
     Returns:
@@ -193,12 +216,8 @@ def calculate_statistics(
     avg_repair_wait: float = (
         statistics.mean(repair_wait_times) if repair_wait_times else 0.0
     )
-    avg_inspection_queue: float = (
-        statistics.mean(inspection_queue_lengths) if inspection_queue_lengths else 0.0
-    )
-    avg_repair_queue: float = (
-        statistics.mean(repair_queue_lengths) if repair_queue_lengths else 0.0
-    )
+    avg_inspection_queue: float = inspection_station.queue.average(SIMULATION_TIME)
+    avg_repair_queue: float = repair_station.queue.average(SIMULATION_TIME)
     utilization_inspection: float = (
         inspection_station.busy_time / (INSPECTION_CAPACITY * SIMULATION_TIME) * 100
     )
@@ -236,34 +255,41 @@ def report(stats: dict) -> None:
     print(f"Repair station utilization: {stats['utilization_repair']:.3f} %")
 
 
-def run_simulation() -> None:
+def run_simulation(seed: int = RANDOM_SEED, print_report: bool = True) -> dict:
     """
     Sets up and executes the simulation, then prints collected statistics.
+
+    Args:
+        seed (int, optional): Seed for the random number generator. Defaults to RANDOM_SEED.
+        print_report (bool, optional): Whether to print the report. Defaults to True.
+
+    Returns:
+        dict: Dictionary containing the calculated statistics.
     """
-    random.seed(RANDOM_SEED)
+    reset_statistics()
+    random.seed(seed)
     env: simpy.Environment = simpy.Environment()
 
     # Create service stations
     inspection_station: InspectionStation = InspectionStation(env)
     repair_station: RepairStation = RepairStation(env)
 
-    # Initiate processes: bus arrivals and queue monitoring
+    # Initiate the bus arrival process
     env.process(bus_generator(env, inspection_station, repair_station))
-    env.process(monitor_queues(env, inspection_station, repair_station))
     env.run(until=SIMULATION_TIME)
 
     # Calculate statistics
     stats = calculate_statistics(
         inspection_wait_times,
         repair_wait_times,
-        inspection_queue_lengths,
-        repair_queue_lengths,
         inspection_station,
         repair_station,
     )
 
     # Report statistics
-    report(stats)
+    if print_report:
+        report(stats)
+    return stats
 
 
 if __name__ == "__main__":
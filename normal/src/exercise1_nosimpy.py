@@ -1,10 +1,11 @@
-import random
 import statistics
-from typing import Any
-import random
-import statistics
-import heapq
-from typing import List, Dict, Any, Callable
+import argparse
+import itertools
+from collections import deque
+from typing import Deque, List, Dict, Callable, Iterator, Tuple
+
+from event_list import EVENT_LISTS, EventList, make_event_list
+from variates import VariateBuffer, make_buffers
 
 # Simulation Parameters (Constants)
 RANDOM_SEED: int = 42
@@ -17,20 +18,65 @@ REPAIR_CAPACITY: int = 2  # Capacity of the repair station
 REPAIR_TIME_MIN: float = 2.1  # Minimum repair duration (hours)
 REPAIR_TIME_MAX: float = 4.5  # Maximum repair duration (hours)
 REPAIR_PROB: float = 0.3  # Probability that a bus requires repair
+EVENT_LIST: str = "heap"  # Future event list: 'heap', 'calendar' or 'ladder'
 
 
 # Global statistics
 inspection_wait_times: List[float] = []
 repair_wait_times: List[float] = []
-inspection_queue_lengths: List[int] = []
-repair_queue_lengths: List[int] = []
-inspection_queue: List[Dict[str, Any]] = []
-repair_queue: List[Dict[str, Any]] = []
+area_inspection_queue: float = 0.0  # Time-integral of the inspection queue length
+area_repair_queue: float = 0.0  # Time-integral of the repair queue length
+inspection_queue: Deque[float] = (
+    deque()
+)  # Arrival times of buses waiting for inspection
+repair_queue: Deque[float] = deque()  # Arrival times of buses waiting for repair
 inspection_busy: int = 0
 repair_busy: int = 0
 total_inspection_service: float = 0.0
 total_repair_service: float = 0.0
 
+# Pre-generated random variates, one supply per purpose (seeded by run_simulation)
+VARIATE_KINDS: Dict[str, str] = {
+    "interarrival": "exponential",
+    "inspection": "uniform",
+    "repair_decision": "uniform",
+    "repair": "uniform",
+}
+variates: Dict[str, VariateBuffer] = {}
+
+# Event type codes (indices into EVENT_HANDLERS)
+ARRIVAL: int = 0
+END_INSPECTION: int = 1
+END_REPAIR: int = 2
+
+# Events on the future event list are (time, sequence, code) tuples; the sequence
+# number breaks ties between simultaneous events in scheduling order
+event_sequence: Iterator[int] = itertools.count()
+
+
+def reset_state() -> None:
+    """Clear all statistics and queues so a new replication starts from scratch."""
+    global inspection_busy, repair_busy, total_inspection_service, total_repair_service
+    global area_inspection_queue, area_repair_queue, event_sequence
+    inspection_wait_times.clear()
+    repair_wait_times.clear()
+    inspection_queue.clear()
+    repair_queue.clear()
+    inspection_busy = 0
+    repair_busy = 0
+    total_inspection_service = 0.0
+    total_repair_service = 0.0
+    area_inspection_queue = 0.0
+    area_repair_queue = 0.0
+    event_sequence = itertools.count()
+
+
+def update_queue_areas(elapsed: float) -> None:
+    """Accumulate the time-weighted queue lengths over the last `elapsed` hours."""
+    global area_inspection_queue, area_repair_queue
+    area_inspection_queue += len(inspection_queue) * elapsed
+    area_repair_queue += len(repair_queue) * elapsed
+
 
 def convert_hours_to_hms(hours: float) -> str:
     total_seconds = int(hours * 3600)
@@ -40,109 +86,88 @@ def convert_hours_to_hms(hours: float) -> str:
     return f"{h}h:{m}m:{s}s"
 
 
-def schedule_event(
-    event_list: List[Any], time: float, event_type: str, data: Dict[str, Any]
-) -> None:
-    heapq.heappush(event_list, (time, event_type, data))
+def schedule_event(event_list: EventList, time: float, code: int) -> None:
+    """Push an event with the given type code onto the future event list."""
+    event_list.push((time, next(event_sequence), code))
 
 
 # --- Modular event handlers and statistics ---
-def handle_arrival(event_list: List[Any], current_time: float, bus_count: int) -> int:
+def handle_arrival(event_list: EventList, current_time: float) -> None:
     """Process a bus arrival event, schedule inspection or enqueue."""
     global inspection_busy, total_inspection_service
-    bus_count += 1
-    bus_id = f"Bus {bus_count}"
     # Schedule next arrival
-    next_arrival = current_time + random.expovariate(1.0 / MEAN_INTERARRIVAL)
-    schedule_event(event_list, next_arrival, "arrival", {})
+    next_arrival = current_time + MEAN_INTERARRIVAL * variates["interarrival"].next()
+    schedule_event(event_list, next_arrival, ARRIVAL)
     # Attempt inspection
     if inspection_busy < INSPECTION_CAPACITY:
         inspection_wait_times.append(0.0)
-        service_time = random.uniform(INSPECTION_TIME_MIN, INSPECTION_TIME_MAX)
+        service_time = (
+            INSPECTION_TIME_MIN
+            + (INSPECTION_TIME_MAX - INSPECTION_TIME_MIN)
+            * variates["inspection"].next()
+        )
         total_inspection_service += service_time
         inspection_busy += 1
-        schedule_event(
-            event_list,
-            current_time + service_time,
-            "end_inspection",
-            {"bus_id": bus_id},
-        )
+        schedule_event(event_list, current_time + service_time, END_INSPECTION)
     else:
-        inspection_queue.append({"bus_id": bus_id, "arrival_time": current_time})
-    return bus_count
+        inspection_queue.append(current_time)
 
 
-def handle_end_inspection(
-    event_list: List[Any], current_time: float, data: Dict[str, Any]
-) -> None:
+def handle_end_inspection(event_list: EventList, current_time: float) -> None:
     """Process end of inspection, possibly start repair or next inspection."""
     global inspection_busy, total_inspection_service, repair_busy, total_repair_service
-    bus_id = data["bus_id"]
     inspection_busy -= 1
     # Start next inspection if queued
     if inspection_queue:
-        nxt = inspection_queue.pop(0)
-        wait = current_time - nxt["arrival_time"]
+        wait = current_time - inspection_queue.popleft()
         inspection_wait_times.append(wait)
-        service_time = random.uniform(INSPECTION_TIME_MIN, INSPECTION_TIME_MAX)
+        service_time = (
+            INSPECTION_TIME_MIN
+            + (INSPECTION_TIME_MAX - INSPECTION_TIME_MIN)
+            * variates["inspection"].next()
+        )
         total_inspection_service += service_time
         inspection_busy += 1
-        schedule_event(
-            event_list,
-            current_time + service_time,
-            "end_inspection",
-            {"bus_id": nxt["bus_id"]},
-        )
+        schedule_event(event_list, current_time + service_time, END_INSPECTION)
     # Decide on repair
-    if random.random() < REPAIR_PROB:
+    if variates["repair_decision"].next() < REPAIR_PROB:
         if repair_busy < REPAIR_CAPACITY:
             repair_wait_times.append(0.0)
-            service_time = random.uniform(REPAIR_TIME_MIN, REPAIR_TIME_MAX)
+            service_time = (
+                REPAIR_TIME_MIN
+                + (REPAIR_TIME_MAX - REPAIR_TIME_MIN) * variates["repair"].next()
+            )
             total_repair_service += service_time
             repair_busy += 1
-            schedule_event(
-                event_list,
-                current_time + service_time,
-                "end_repair",
-                {"bus_id": bus_id},
-            )
+            schedule_event(event_list, current_time + service_time, END_REPAIR)
         else:
-            repair_queue.append({"bus_id": bus_id, "arrival_time": current_time})
+            repair_queue.append(current_time)
 
 
-def handle_end_repair(
-    event_list: List[Any], current_time: float, data: Dict[str, Any]
-) -> None:
+def handle_end_repair(event_list: EventList, current_time: float) -> None:
     """Process end of repair, start next repair if queued."""
     global repair_busy, total_repair_service
     repair_busy -= 1
     if repair_queue:
-        nxt = repair_queue.pop(0)
-        wait = current_time - nxt["arrival_time"]
+        wait = current_time - repair_queue.popleft()
         repair_wait_times.append(wait)
-        service_time = random.uniform(REPAIR_TIME_MIN, REPAIR_TIME_MAX)
+        service_time = (
+            REPAIR_TIME_MIN
+            + (REPAIR_TIME_MAX - REPAIR_TIME_MIN) * variates["repair"].next()
+        )
         total_repair_service += service_time
         repair_busy += 1
-        schedule_event(
-            event_list,
-            current_time + service_time,
-            "end_repair",
-            {"bus_id": nxt["bus_id"]},
-        )
+        schedule_event(event_list, current_time + service_time, END_REPAIR)
 
 
 def calculate_statistics() -> Dict[str, float]:
-    """Compute averages and utilization metrics."""
+    """Compute averages (queue lengths are time-weighted) and utilization metrics."""
     avg_inspection_wait = (
         statistics.mean(inspection_wait_times) if inspection_wait_times else 0.0
     )
     avg_repair_wait = statistics.mean(repair_wait_times) if repair_wait_times else 0.0
-    avg_inspection_queue = (
-        statistics.mean(inspection_queue_lengths) if inspection_queue_lengths else 0.0
-    )
-    avg_repair_queue = (
-        statistics.mean(repair_queue_lengths) if repair_queue_lengths else 0.0
-    )
+    avg_inspection_queue = area_inspection_queue / SIMULATION_TIME
+    avg_repair_queue = area_repair_queue / SIMULATION_TIME
     utilization_inspection = (
         total_inspection_service / (INSPECTION_CAPACITY * SIMULATION_TIME) * 100
     )
@@ -174,49 +199,79 @@ def report(stats: Dict[str, float]) -> None:
     print(f"Repair station utilization: {stats['utilization_repair']:.3f} %")
 
 
-# Mapping of event types to their handler functions (excluding 'sample')
-EVENT_HANDLERS: Dict[str, Callable[..., Any]] = {
-    "arrival": handle_arrival,
-    "end_inspection": handle_end_inspection,
-    "end_repair": handle_end_repair,
-}
+# Handler of each event type, indexed by its code
+EVENT_HANDLERS: Tuple[Callable[[EventList, float], None], ...] = (
+    handle_arrival,
+    handle_end_inspection,
+    handle_end_repair,
+)
 
 
-def run_simulation() -> None:
-    global inspection_busy, repair_busy, total_inspection_service, total_repair_service
-    random.seed(RANDOM_SEED)
+def run_simulation(
+    seed: int = RANDOM_SEED, print_report: bool = True
+) -> Dict[str, float]:
+    """
+    Run one replication of the bus depot simulation.
+
+    Args:
+        seed (int): Seed of the random variate supplies.
+        print_report (bool): Whether to print the simulation report.
+
+    Returns:
+        Dict[str, float]: Statistics computed by calculate_statistics().
+    """
+    reset_state()
+    variates.update(make_buffers(seed, VARIATE_KINDS))
     current_time: float = 0.0
-    event_list: List[Any] = []
+    last_event_time: float = 0.0
+    event_list = make_event_list(EVENT_LIST)
     # Schedule first arrival
     schedule_event(
-        event_list, random.expovariate(1.0 / MEAN_INTERARRIVAL), "arrival", {}
+        event_list, MEAN_INTERARRIVAL * variates["interarrival"].next(), ARRIVAL
     )
 
-    bus_count: int = 0
-
     while event_list:
-        time, event_type, data = heapq.heappop(event_list)
+        time, _, code = event_list.pop()
         if time > SIMULATION_TIME:
             break
         current_time = time
 
-        # Record queue length metrics on every event
-        inspection_queue_lengths.append(len(inspection_queue))
-        repair_queue_lengths.append(len(repair_queue))
+        # Queue lengths held constant since the previous event
+        update_queue_areas(current_time - last_event_time)
+        last_event_time = current_time
 
-        if event_type == "arrival":
-            bus_count = handle_arrival(event_list, current_time, bus_count)
+        EVENT_HANDLERS[code](event_list, current_time)
 
-        elif event_type == "end_inspection":
-            handle_end_inspection(event_list, current_time, data)
-
-        elif event_type == "end_repair":
-            handle_end_repair(event_list, current_time, data)
+    # Close the queue areas at the end of the horizon
+    update_queue_areas(SIMULATION_TIME - last_event_time)
 
     # Final reporting
     stats = calculate_statistics()
-    report(stats)
+    if print_report:
+        report(stats)
+    return stats
+
+
+def main() -> None:
+    """
+    Parse command line arguments and run one replication.
+    """
+    global EVENT_LIST
+    parser = argparse.ArgumentParser(description="Bus depot simulation without SimPy")
+    parser.add_argument(
+        "--seed", type=int, default=RANDOM_SEED, help="Seed of the random variates"
+    )
+    parser.add_argument(
+        "--event-list",
+        type=str,
+        choices=list(EVENT_LISTS),
+        default=EVENT_LIST,
+        help="Future event list implementation",
+    )
+    args = parser.parse_args()
+    EVENT_LIST = args.event_list
+    run_simulation(seed=args.seed)
 
 
 if __name__ == "__main__":
-    run_simulation()
+    main()
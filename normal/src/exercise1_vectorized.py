@@ -0,0 +1,466 @@
+import argparse
+import heapq
+import math
+import time
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+import exercise1_nosimpy
+from replications import spawn_seeds
+
+# Simulation Parameters (Constants)
+RANDOM_SEED: int = 42
+SIMULATION_TIME: float = 160.0  # Total simulation time in hours
+MEAN_INTERARRIVAL: float = 2.0  # Mean interarrival time (hours)
+INSPECTION_CAPACITY: int = 1  # Capacity of the inspection station
+INSPECTION_TIME_MIN: float = 0.25  # Minimum inspection duration (hours)
+INSPECTION_TIME_MAX: float = 1.05  # Maximum inspection duration (hours)
+REPAIR_CAPACITY: int = 2  # Capacity of the repair station
+REPAIR_TIME_MIN: float = 2.1  # Minimum repair duration (hours)
+REPAIR_TIME_MAX: float = 4.5  # Maximum repair duration (hours)
+REPAIR_PROB: float = 0.3  # Probability that a bus requires repair
+
+# Waiting times of the last run (one entry per service started within the horizon)
+inspection_wait_times: np.ndarray = np.empty(0)
+repair_wait_times: np.ndarray = np.empty(0)
+
+# Independent random streams of a replication, one per purpose
+STREAMS: List[str] = ["interarrival", "inspection", "repair_decision", "repair"]
+
+# Parameter overrides under which no bus reaches repair, checked by validate()
+DEGENERATE_CASES: Dict[str, Dict[str, float]] = {
+    "no repairs": {"REPAIR_PROB": 0.0},
+    "short horizon": {"SIMULATION_TIME": 0.01},
+}
+
+
+def arrival_times(rng: np.random.Generator, horizon: float, mean: float) -> np.ndarray:
+    """
+    Generate the arrival times of a Poisson process up to the horizon.
+
+    Args:
+        rng (np.random.Generator): Generator of the interarrival times.
+        horizon (float): Last time of interest.
+        mean (float): Mean interarrival time.
+
+    Returns:
+        np.ndarray: Increasing arrival times, all at most `horizon`.
+    """
+    expected = horizon / mean
+    n = int(expected + 6 * math.sqrt(expected) + 16)
+    times = np.cumsum(mean * rng.standard_exponential(n))
+    # Extending is rare: the first block covers six standard deviations
+    while times[-1] <= horizon:
+        more = times[-1] + np.cumsum(mean * rng.standard_exponential(n))
+        times = np.concatenate((times, more))
+    return times[: np.searchsorted(times, horizon, side="right")]
+
+
+def fifo_starts(arrivals: np.ndarray, services: np.ndarray, servers: int) -> np.ndarray:
+    """
+    Service start times of a FIFO queue with identical parallel servers.
+
+    With one server the Lindley recursion D[i] = max(A[i], D[i-1]) + S[i] is solved
+    in closed form, D[i] = C[i] + max_{j<=i} (A[j] - C[j-1]) with C the cumulative
+    service times, using NumPy cumulative sums and maxima. With several servers
+    the Kiefer-Wolfowitz recursion (each customer takes the server that frees up
+    first) runs as a loop over a heap of server free times, or, for 2-D inputs,
+    as a loop over customers that advances every row at once.
+
+    Args:
+        arrivals (np.ndarray): Arrival times in FIFO order (non-decreasing), or one
+            independent queue per row (rows may be padded with +inf at the end).
+        services (np.ndarray): Service time of each customer, same shape.
+        servers (int): Number of servers.
+
+    Returns:
+        np.ndarray: Service start time of each customer, same shape.
+    """
+    if servers == 1:
+        completed = np.cumsum(services, axis=-1)
+        departures = completed + np.maximum.accumulate(
+            arrivals - (completed - services), axis=-1
+        )
+        # Rounding in the cumulative sums must not create negative waits
+        return np.maximum(departures - services, arrivals)
+    if arrivals.ndim == 2:
+        rows = np.arange(arrivals.shape[0])
+        free = np.zeros((arrivals.shape[0], servers))
+        starts = np.empty_like(arrivals)
+        for k in range(arrivals.shape[1]):
+            first = free.argmin(axis=1)
+            starts[:, k] = np.maximum(arrivals[:, k], free[rows, first])
+            free[rows, first] = starts[:, k] + services[:, k]
+        return starts
+    free = [0.0] * servers
+    starts = []
+    for arrival, service in zip(arrivals.tolist(), services.tolist()):
+        start = arrival if arrival > free[0] else free[0]
+        heapq.heapreplace(free, start + service)
+        starts.append(start)
+    return np.array(starts)
+
+
+def calculate_statistics(
+    inspection_waits: np.ndarray,
+    repair_waits: np.ndarray,
+    inspection_queue_area: float,
+    repair_queue_area: float,
+    inspection_service: float,
+    repair_service: float,
+) -> Dict[str, float]:
+    """
+    Compute the same statistics as exercise1_nosimpy.calculate_statistics().
+
+    Args:
+        inspection_waits (np.ndarray): Waits of the inspections started.
+        repair_waits (np.ndarray): Waits of the repairs started.
+        inspection_queue_area (float): Time-integral of the inspection queue length.
+        repair_queue_area (float): Time-integral of the repair queue length.
+        inspection_service (float): Service time of the inspections started.
+        repair_service (float): Service time of the repairs started.
+
+    Returns:
+        Dict[str, float]: Average waits, time-averaged queue lengths and utilizations.
+    """
+    return {
+        "avg_inspection_wait": (
+            float(inspection_waits.mean()) if inspection_waits.size else 0.0
+        ),
+        "avg_repair_wait": float(repair_waits.mean()) if repair_waits.size else 0.0,
+        "avg_inspection_queue": inspection_queue_area / SIMULATION_TIME,
+        "avg_repair_queue": repair_queue_area / SIMULATION_TIME,
+        "utilization_inspection": inspection_service
+        / (INSPECTION_CAPACITY * SIMULATION_TIME)
+        * 100,
+        "utilization_repair": repair_service
+        / (REPAIR_CAPACITY * SIMULATION_TIME)
+        * 100,
+    }
+
+
+def run_simulation(
+    seed: int = RANDOM_SEED, print_report: bool = True
+) -> Dict[str, float]:
+    """
+    Run one replication of the bus depot without an event calendar.
+
+    All interarrival, inspection, routing and repair variates are drawn as NumPy
+    arrays and the start of every inspection and repair follows from the FIFO
+    recursions of fifo_starts(). Only what the event-driven engine observes within
+    the horizon is counted: waits and service times of the services started by
+    SIMULATION_TIME, queue areas truncated at SIMULATION_TIME, and repair decisions
+    of the inspections finished by then.
+
+    Args:
+        seed (int): Seed of the replication (each purpose gets a spawned stream).
+        print_report (bool): Whether to print the simulation report.
+
+    Returns:
+        Dict[str, float]: Statistics with the keys of
+        exercise1_nosimpy.calculate_statistics().
+    """
+    global inspection_wait_times, repair_wait_times
+    horizon = SIMULATION_TIME
+    streams = dict(
+        zip(
+            STREAMS,
+            map(
+                np.random.default_rng, np.random.SeedSequence(seed).spawn(len(STREAMS))
+            ),
+        )
+    )
+
+    # Inspection: every arrival, single FIFO queue
+    arrivals = arrival_times(streams["interarrival"], horizon, MEAN_INTERARRIVAL)
+    inspection = INSPECTION_TIME_MIN + (
+        INSPECTION_TIME_MAX - INSPECTION_TIME_MIN
+    ) * streams["inspection"].random(arrivals.size)
+    starts = fifo_starts(arrivals, inspection, INSPECTION_CAPACITY)
+    started = starts <= horizon
+    inspection_wait_times = (starts - arrivals)[started]
+    inspection_queue_area = float(np.sum(np.minimum(starts, horizon) - arrivals))
+    inspection_service = float(inspection[started].sum())
+
+    # Repair: buses routed at the end of an inspection finished within the horizon,
+    # queued in the order they finish
+    ends = starts + inspection
+    routed = (ends <= horizon) & (
+        streams["repair_decision"].random(arrivals.size) < REPAIR_PROB
+    )
+    repair_arrivals = np.sort(ends[routed])
+    repair = REPAIR_TIME_MIN + (REPAIR_TIME_MAX - REPAIR_TIME_MIN) * streams[
+        "repair"
+    ].random(repair_arrivals.size)
+    repair_starts = fifo_starts(repair_arrivals, repair, REPAIR_CAPACITY)
+    started = repair_starts <= horizon
+    repair_wait_times = (repair_starts - repair_arrivals)[started]
+    repair_queue_area = float(
+        np.sum(np.minimum(repair_starts, horizon) - repair_arrivals)
+    )
+    repair_service = float(repair[started].sum())
+
+    stats = calculate_statistics(
+        inspection_wait_times,
+        repair_wait_times,
+        inspection_queue_area,
+        repair_queue_area,
+        inspection_service,
+        repair_service,
+    )
+    if print_report:
+        exercise1_nosimpy.report(stats)
+    return stats
+
+
+def run_lockstep(seeds: Sequence[int]) -> List[Dict[str, float]]:
+    """
+    Run many replications in lock step, one per row of 2-D arrays.
+
+    Each row draws its variates from the streams of its own seed, exactly as
+    run_simulation() does, and rows are padded to a common length (arrivals after
+    the horizon, repair arrivals at +inf) so both stations are computed for every
+    replication at once by fifo_starts(). Row r therefore reproduces
+    run_simulation(seed=seeds[r]) up to floating point rounding, without the
+    per-replication interpreter overhead.
+
+    Args:
+        seeds (Sequence[int]): Seed of each replication.
+
+    Returns:
+        List[Dict[str, float]]: Statistics of each replication, with the keys of
+        exercise1_nosimpy.calculate_statistics().
+    """
+    horizon = SIMULATION_TIME
+    streams = [
+        dict(
+            zip(
+                STREAMS,
+                map(
+                    np.random.default_rng,
+                    np.random.SeedSequence(seed).spawn(len(STREAMS)),
+                ),
+            )
+        )
+        for seed in seeds
+    ]
+
+    # Inspection: the same arrival block sizes as arrival_times(), so every row
+    # gets the arrival times of its single-replication run
+    expected = horizon / MEAN_INTERARRIVAL
+    n = int(expected + 6 * math.sqrt(expected) + 16)
+    arrivals = np.cumsum(
+        [
+            MEAN_INTERARRIVAL * s["interarrival"].standard_exponential(n)
+            for s in streams
+        ],
+        axis=1,
+    )
+    while arrivals[:, -1].min() <= horizon:
+        more = arrivals[:, -1:] + np.cumsum(
+            [
+                MEAN_INTERARRIVAL * s["interarrival"].standard_exponential(n)
+                for s in streams
+            ],
+            axis=1,
+        )
+        arrivals = np.concatenate((arrivals, more), axis=1)
+    arrivals = arrivals[:, : int((arrivals <= horizon).sum(axis=1).max())]
+    size = arrivals.shape[1]
+    inspection = INSPECTION_TIME_MIN + (INSPECTION_TIME_MAX - INSPECTION_TIME_MIN) * (
+        np.array([s["inspection"].random(size) for s in streams])
+    )
+    starts = fifo_starts(arrivals, inspection, INSPECTION_CAPACITY)
+    started = starts <= horizon
+    inspection_waits = np.where(started, starts - arrivals, 0.0).sum(axis=1)
+    inspection_count = started.sum(axis=1)
+    # Padded arrivals lie after the horizon and contribute horizon - horizon = 0
+    inspection_queue_area = (
+        np.minimum(starts, horizon) - np.minimum(arrivals, horizon)
+    ).sum(axis=1)
+    inspection_service = np.where(started, inspection, 0.0).sum(axis=1)
+
+    # Repair: each row's routed buses sorted by end of inspection, padded with +inf
+    ends = starts + inspection
+    decisions = np.array([s["repair_decision"].random(size) for s in streams])
+    routed = (ends <= horizon) & (decisions < REPAIR_PROB)
+    repair_arrivals = np.sort(np.where(routed, ends, np.inf), axis=1)
+    repair_arrivals = repair_arrivals[:, : int(routed.sum(axis=1).max())]
+    size = repair_arrivals.shape[1]
+    repair = REPAIR_TIME_MIN + (REPAIR_TIME_MAX - REPAIR_TIME_MIN) * (
+        np.array([s["repair"].random(size) for s in streams]).reshape(len(seeds), size)
+    )
+    repair_starts = fifo_starts(repair_arrivals, repair, REPAIR_CAPACITY)
+    started = repair_starts <= horizon
+    with np.errstate(invalid="ignore"):  # inf - inf in the padding, masked out
+        repair_waits = np.where(started, repair_starts - repair_arrivals, 0.0).sum(
+            axis=1
+        )
+    repair_count = started.sum(axis=1)
+    repair_queue_area = (
+        np.minimum(repair_starts, horizon) - np.minimum(repair_arrivals, horizon)
+    ).sum(axis=1)
+    repair_service = np.where(started, repair, 0.0).sum(axis=1)
+
+    columns = {
+        "avg_inspection_wait": np.divide(
+            inspection_waits,
+            inspection_count,
+            out=np.zeros(len(seeds)),
+            where=inspection_count > 0,
+        ),
+        "avg_repair_wait": np.divide(
+            repair_waits,
+            repair_count,
+            out=np.zeros(len(seeds)),
+            where=repair_count > 0,
+        ),
+        "avg_inspection_queue": inspection_queue_area / horizon,
+        "avg_repair_queue": repair_queue_area / horizon,
+        "utilization_inspection": inspection_service
+        / (INSPECTION_CAPACITY * horizon)
+        * 100,
+        "utilization_repair": repair_service / (REPAIR_CAPACITY * horizon) * 100,
+    }
+    return [
+        dict(zip(columns, values))
+        for values in zip(*(column.tolist() for column in columns.values()))
+    ]
+
+
+def lockstep_error(seeds: Sequence[int]) -> float:
+    """
+    Largest difference between run_lockstep() and run_simulation() over the seeds,
+    relative to the magnitude of each statistic.
+
+    Args:
+        seeds (Sequence[int]): Seed of each replication.
+
+    Returns:
+        float: Largest relative difference (0 when the engines agree exactly).
+    """
+    error = 0.0
+    for seed, stats in zip(seeds, run_lockstep(seeds)):
+        single = run_simulation(seed=seed, print_report=False)
+        for metric, value in single.items():
+            error = max(error, abs(stats[metric] - value) / max(1.0, abs(value)))
+    return error
+
+
+def validate(replications: int, seed: int = RANDOM_SEED) -> Dict[str, Dict[str, float]]:
+    """
+    Compare this engine with exercise1_nosimpy.run_simulation() over independent
+    replications (the engines draw their variates differently, so they agree in
+    distribution, not run by run).
+
+    Args:
+        replications (int): Replications per engine.
+        seed (int): Root seed from which the replication seeds are derived.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per metric, the mean of each engine and
+        |difference of means| / standard error (values above ~3 suggest the
+        engines disagree); under the key 'seconds', the wall time of each engine;
+        under the key 'lockstep', the lockstep_error() of the current parameters
+        and of each of DEGENERATE_CASES.
+    """
+    # The event-driven engine reads its own module constants
+    for name in (
+        "SIMULATION_TIME",
+        "MEAN_INTERARRIVAL",
+        "INSPECTION_CAPACITY",
+        "INSPECTION_TIME_MIN",
+        "INSPECTION_TIME_MAX",
+        "REPAIR_CAPACITY",
+        "REPAIR_TIME_MIN",
+        "REPAIR_TIME_MAX",
+        "REPAIR_PROB",
+    ):
+        setattr(exercise1_nosimpy, name, globals()[name])
+
+    seeds = spawn_seeds(seed, replications)
+    runs: Dict[str, List[Dict[str, float]]] = {}
+    seconds: Dict[str, float] = {}
+    for name, engine in (
+        ("vectorized", run_simulation),
+        ("nosimpy", exercise1_nosimpy.run_simulation),
+    ):
+        start = time.perf_counter()
+        runs[name] = [engine(seed=s, print_report=False) for s in seeds]
+        seconds[name] = time.perf_counter() - start
+
+    lockstep = {"current": lockstep_error(seeds)}
+    for case, overrides in DEGENERATE_CASES.items():
+        saved = {name: globals()[name] for name in overrides}
+        globals().update(overrides)
+        try:
+            lockstep[case] = lockstep_error(seeds)
+        finally:
+            globals().update(saved)
+
+    result: Dict[str, Dict[str, float]] = {"seconds": seconds, "lockstep": lockstep}
+    for metric in runs["vectorized"][0]:
+        a = np.array([r[metric] for r in runs["vectorized"]])
+        b = np.array([r[metric] for r in runs["nosimpy"]])
+        se = math.sqrt(a.var(ddof=1) / a.size + b.var(ddof=1) / b.size)
+        diff = abs(a.mean() - b.mean())
+        result[metric] = {
+            "vectorized": float(a.mean()),
+            "nosimpy": float(b.mean()),
+            "z": diff / se if se > 0 else (0.0 if diff == 0 else math.inf),
+        }
+    return result
+
+
+def main() -> None:
+    """
+    Parse command line arguments and run one replication or the validation.
+    """
+    global SIMULATION_TIME
+    parser = argparse.ArgumentParser(
+        description="Bus depot simulation with vectorized FIFO recursions"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=RANDOM_SEED, help="Seed of the random variates"
+    )
+    parser.add_argument(
+        "--simtime", type=float, default=SIMULATION_TIME, help="Simulation time"
+    )
+    parser.add_argument(
+        "--validate",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Compare N replications against exercise1_nosimpy",
+    )
+    args = parser.parse_args()
+    SIMULATION_TIME = args.simtime
+
+    if not args.validate:
+        run_simulation(seed=args.seed)
+        return
+    result = validate(args.validate, args.seed)
+    seconds = result.pop("seconds")
+    lockstep = result.pop("lockstep")
+    print(
+        f"=== Validation against exercise1_nosimpy ({args.validate} replications) ==="
+    )
+    print(f"{'metric':>24} {'vectorized':>12} {'nosimpy':>12} {'z':>6}")
+    for metric, r in result.items():
+        print(
+            f"{metric:>24} {r['vectorized']:>12.4f} {r['nosimpy']:>12.4f} {r['z']:>6.2f}"
+        )
+    print(
+        f"Wall time: vectorized {seconds['vectorized']:.3f} s, "
+        f"nosimpy {seconds['nosimpy']:.3f} s "
+        f"({seconds['nosimpy'] / seconds['vectorized']:.0f}x)"
+    )
+    print(
+        "Lock step vs single runs (max relative difference): "
+        + ", ".join(f"{case} {error:.1e}" for case, error in lockstep.items())
+    )
+
+
+if __name__ == "__main__":
+    main()
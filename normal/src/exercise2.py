@@ -1,7 +1,99 @@
+import math
+import os
 import numpy as np
-import matplotlib.pyplot as plt
 import argparse
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple, Union
+
+from trajectory import TrajectoryWriter, read_trajectory, thin
+
+# Butcher tableau of the embedded Dormand-Prince 5(4) method
+RK45_A: List[np.ndarray] = [
+    np.array([]),
+    np.array([1 / 5]),
+    np.array([3 / 40, 9 / 40]),
+    np.array([44 / 45, -56 / 15, 32 / 9]),
+    np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+]
+RK45_B: np.ndarray = np.array(
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]
+)
+# Difference between the 5th and 4th order solutions (local error estimate)
+RK45_E: np.ndarray = np.array(
+    [-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40]
+)
+# Coefficients of the 4th order continuous extension (dense output)
+RK45_P: np.ndarray = np.array(
+    [
+        [
+            1,
+            -8048581381 / 2820520608,
+            8663915743 / 2820520608,
+            -12715105075 / 11282082432,
+        ],
+        [0, 0, 0, 0],
+        [
+            0,
+            131558114200 / 32700410799,
+            -68118460800 / 10900136933,
+            87487479700 / 32700410799,
+        ],
+        [
+            0,
+            -1754552775 / 470086768,
+            14199869525 / 1410260304,
+            -10690763975 / 1880347072,
+        ],
+        [
+            0,
+            127303824393 / 49829197408,
+            -318862633887 / 49829197408,
+            701980252875 / 199316789632,
+        ],
+        [
+            0,
+            -282668133 / 205662961,
+            2019193451 / 616988883,
+            -1453857185 / 822651844,
+        ],
+        [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+    ]
+)
+
+
+def hermite(
+    t0: float,
+    s0: np.ndarray,
+    f0: np.ndarray,
+    t1: float,
+    s1: np.ndarray,
+    f1: np.ndarray,
+    times: np.ndarray,
+) -> np.ndarray:
+    """
+    Cubic Hermite interpolation of the state inside one step.
+
+    Uses the states and derivatives at both ends of the step, so it is third
+    order accurate in the step size without any extra derivative evaluations
+    beyond the end points.
+
+    Args:
+        t0, t1 (float): Start and end time of the step.
+        s0, s1 (np.ndarray): States at t0 and t1.
+        f0, f1 (np.ndarray): Derivatives of the state at t0 and t1.
+        times (np.ndarray): Output times inside [t0, t1].
+
+    Returns:
+        np.ndarray: One interpolated state per output time, shape (len(times), n).
+    """
+    h: float = t1 - t0
+    theta = ((times - t0) / h)[:, None]
+    return (
+        (1 + 2 * theta) * (1 - theta) ** 2 * s0
+        + theta * (1 - theta) ** 2 * h * f0
+        + theta**2 * (3 - 2 * theta) * s1
+        + theta**2 * (theta - 1) * h * f1
+    )
 
 
 class Simulation:
@@ -18,6 +110,8 @@ class Simulation:
         mass (float): Mass of the projectile.
         gravity (float): Gravitational acceleration.
         drag (float): Air resistance coefficient.
+        rtol (float): Relative tolerance of the adaptive RK45 method.
+        atol (float): Absolute tolerance of the adaptive RK45 method.
     """
 
     def __init__(
@@ -31,6 +125,8 @@ class Simulation:
         mass: float,
         gravity: float,
         drag: float,
+        rtol: float = 1e-6,
+        atol: float = 1e-9,
     ) -> None:
         self.x0: float = x0
         self.z0: float = z0
@@ -41,39 +137,92 @@ class Simulation:
         self.mass: float = mass
         self.gravity: float = gravity
         self.drag: float = drag
+        self.rtol: float = rtol
+        self.atol: float = atol
+        self.nfev: int = 0
         self.initialize()
 
-    def initialize(self) -> None:
-        """Reset the simulation state to the initial conditions."""
+    def initialize(self, output_every: Optional[int] = 1) -> None:
+        """
+        Reset the simulation state to the initial conditions.
+
+        Args:
+            output_every (Optional[int]): Record only every output_every-th step
+                (the initial state and the last step are always recorded). None
+                when the rows are collected elsewhere (interpolated or streamed
+                runs), in which case the history only holds the initial state.
+        """
         self.x: float = self.x0
         self.z: float = self.z0
         self.vx: float = self.vx0
         self.vz: float = self.vz0
         self.t: float = 0.0
 
-        self.t_history: List[float] = [self.t]
-        self.x_history: List[float] = [self.x]
-        self.z_history: List[float] = [self.z]
-        self.vx_history: List[float] = [self.vx]
-        self.vz_history: List[float] = [self.vz]
+        # One preallocated row per recorded step: [t, x, z, vx, vz] (40 bytes each)
+        num_steps: int = int(self.t_final / self.dt)
+        num_rows: int = -(-num_steps // output_every) + 1 if output_every else 1
+        self.history: np.ndarray = np.empty((num_rows, 5), dtype=np.float64)
+        self.history[0] = (self.t, self.x, self.z, self.vx, self.vz)
+        self.step: int = 0
+        # Flat float64 view of the history: scalar writes through it avoid the
+        # per-row tuple conversion done by NumPy indexing
+        self._buffer: memoryview = memoryview(self.history).cast("B").cast("d")
+
+    @property
+    def t_history(self) -> np.ndarray:
+        return self.history[: self.step + 1, 0]
+
+    @property
+    def x_history(self) -> np.ndarray:
+        return self.history[: self.step + 1, 1]
+
+    @property
+    def z_history(self) -> np.ndarray:
+        return self.history[: self.step + 1, 2]
+
+    @property
+    def vx_history(self) -> np.ndarray:
+        return self.history[: self.step + 1, 3]
+
+    @property
+    def vz_history(self) -> np.ndarray:
+        return self.history[: self.step + 1, 4]
 
     def observe(self) -> None:
         """
         Record the current state of the simulation and increment time by dt.
         """
         self.t += self.dt
-        self.t_history.append(self.t)
-        self.x_history.append(self.x)
-        self.z_history.append(self.z)
-        self.vx_history.append(self.vx)
-        self.vz_history.append(self.vz)
+        self.step += 1
+        i: int = 5 * self.step
+        buffer = self._buffer
+        buffer[i] = self.t
+        buffer[i + 1] = self.x
+        buffer[i + 2] = self.z
+        buffer[i + 3] = self.vx
+        buffer[i + 4] = self.vz
+
+    def acceleration(self, vx: float, vz: float) -> Tuple[float, float]:
+        """
+        Compute the acceleration of the projectile for a given velocity.
+
+        Args:
+            vx (float): Velocity in the x-axis.
+            vz (float): Velocity in the z-axis.
+
+        Returns:
+            Tuple[float, float]: Accelerations (ax, az).
+        """
+        k: float = self.drag / self.mass
+        return -k * vx * abs(vx), -self.gravity - k * vz * abs(vz)
 
     def update_euler(self) -> None:
         """
         Update the simulation state using the Euler integration method.
         """
-        ax: float = -(self.drag / self.mass) * self.vx * abs(self.vx)
-        az: float = -self.gravity - (self.drag / self.mass) * self.vz * abs(self.vz)
+        k: float = self.drag / self.mass
+        ax: float = -k * self.vx * abs(self.vx)
+        az: float = -self.gravity - k * self.vz * abs(self.vz)
         self.x += self.dt * self.vx
         self.vx += self.dt * ax
         self.z += self.dt * self.vz
@@ -82,55 +231,306 @@ class Simulation:
     def update_rk4(self) -> None:
         """
         Update the simulation state using the fourth-order Runge-Kutta (RK4) method.
+
+        The stages are kept in local floats: for a four-element state, allocating
+        NumPy arrays (or even calling ufuncs on reusable buffers) costs more than
+        the arithmetic itself.
         """
-        state: np.ndarray = np.array([self.x, self.z, self.vx, self.vz])
+        dt: float = self.dt
+        vx1, vz1 = self.vx, self.vz
+        ax1, az1 = self.acceleration(vx1, vz1)
+        vx2, vz2 = vx1 + 0.5 * dt * ax1, vz1 + 0.5 * dt * az1
+        ax2, az2 = self.acceleration(vx2, vz2)
+        vx3, vz3 = vx1 + 0.5 * dt * ax2, vz1 + 0.5 * dt * az2
+        ax3, az3 = self.acceleration(vx3, vz3)
+        vx4, vz4 = vx1 + dt * ax3, vz1 + dt * az3
+        ax4, az4 = self.acceleration(vx4, vz4)
+
+        self.x += (dt / 6.0) * (vx1 + 2 * vx2 + 2 * vx3 + vx4)
+        self.z += (dt / 6.0) * (vz1 + 2 * vz2 + 2 * vz3 + vz4)
+        self.vx += (dt / 6.0) * (ax1 + 2 * ax2 + 2 * ax3 + ax4)
+        self.vz += (dt / 6.0) * (az1 + 2 * az2 + 2 * az3 + az4)
+
+    def derivatives(self, state: np.ndarray) -> np.ndarray:
+        """
+        Compute the derivatives of the state.
 
-        def f(state: np.ndarray) -> np.ndarray:
-            """
-            Compute the derivatives of the state.
+        Args:
+            state (np.ndarray): Array containing [x, z, vx, vz].
 
-            Args:
-                state (np.ndarray): Array containing [x, z, vx, vz].
+        Returns:
+            np.ndarray: Derivatives [vx, vz, ax, az].
+        """
+        self.nfev += 1
+        ax, az = self.acceleration(state[2], state[3])
+        return np.array([state[2], state[3], ax, az])
 
-            Returns:
-                np.ndarray: Derivatives [vx, vz, ax, az].
-            """
-            x, z, vx, vz = state
-            ax: float = -(self.drag / self.mass) * vx * abs(vx)
-            az: float = -self.gravity - (self.drag / self.mass) * vz * abs(vz)
-            return np.array([vx, vz, ax, az])
+    def step_rk45(
+        self, state: np.ndarray, k1: np.ndarray, h: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Perform one Dormand-Prince 5(4) step.
 
-        dt: float = self.dt
-        k1: np.ndarray = f(state)
-        k2: np.ndarray = f(state + 0.5 * dt * k1)
-        k3: np.ndarray = f(state + 0.5 * dt * k2)
-        k4: np.ndarray = f(state + dt * k3)
-        state_next: np.ndarray = state + (dt / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
-        self.x, self.z, self.vx, self.vz = state_next
+        Args:
+            state (np.ndarray): Current state [x, z, vx, vz].
+            k1 (np.ndarray): Derivatives at the current state (reused from the last step).
+            h (float): Step size.
+
+        Returns:
+            Tuple containing the 5th order state after h, the (7, 4) stage
+            derivatives and the local error estimate.
+        """
+        K: np.ndarray = np.empty((7, len(state)))
+        K[0] = k1
+        for s in range(1, 6):
+            K[s] = self.derivatives(state + h * (RK45_A[s] @ K[:s]))
+        state_new: np.ndarray = state + h * (RK45_B @ K[:6])
+        K[6] = self.derivatives(state_new)
+        return state_new, K, h * (RK45_E @ K)
+
+    def state_derivatives(self) -> np.ndarray:
+        """
+        Compute the derivatives [vx, vz, ax, az] at the current state.
+
+        Unlike derivatives(), this does not count towards nfev.
+        """
+        ax, az = self.acceleration(self.vx, self.vz)
+        return np.array([self.vx, self.vz, ax, az])
+
+    def run_fixed(
+        self,
+        update: Callable[[], None],
+        output_every: int = 1,
+        writer: Optional[TrajectoryWriter] = None,
+    ) -> None:
+        """
+        Integrate with a fixed-step method and record every output_every-th step.
+
+        Args:
+            update (Callable[[], None]): Method advancing the state by dt.
+            output_every (int): Record only every output_every-th step (the
+                initial state and the last step are always recorded).
+            writer (Optional[TrajectoryWriter]): Destination of the recorded rows
+                instead of self.history.
+        """
+        if writer is not None:
+            self.initialize(None)
+            writer.append(self.history[0])
+            num_steps = int(self.t_final / self.dt)
+            for i in range(1, num_steps + 1):
+                update()
+                self.t += self.dt
+                if i % output_every == 0 or i == num_steps:
+                    writer.append((self.t, self.x, self.z, self.vx, self.vz))
+            return
+
+        self.initialize(output_every)
+        num_steps: int = len(self.history) - 1
+        if output_every == 1:
+            for _ in range(num_steps):
+                update()
+                self.observe()
+            return
+        num_steps = int(self.t_final / self.dt)
+        for i in range(1, num_steps + 1):
+            update()
+            if i % output_every == 0 or i == num_steps:
+                self.observe()
+            else:
+                self.t += self.dt
+
+    def run_fixed_eval(
+        self,
+        update: Callable[[], None],
+        t_eval: np.ndarray,
+        writer: Optional[TrajectoryWriter] = None,
+    ) -> None:
+        """
+        Integrate with a fixed-step method and record only the requested times.
+
+        The state at each output time is interpolated with a cubic Hermite
+        polynomial over the step that contains it, so no step is stored. Output
+        times after the last step are dropped, unless the last step ends at
+        t_final up to rounding.
+
+        Args:
+            update (Callable[[], None]): Method advancing the state by dt.
+            t_eval (np.ndarray): Sorted output times.
+            writer (Optional[TrajectoryWriter]): Destination of the recorded rows
+                instead of self.history.
+        """
+        num_steps: int = int(self.t_final / self.dt)
+        self.initialize(None)
+        t_eval = np.asarray(t_eval, dtype=float)
+        state: np.ndarray = np.array([self.x, self.z, self.vx, self.vz])
+        i_eval: int = int(np.searchsorted(t_eval, self.t, side="right"))
+        rows: Union[List[np.ndarray], TrajectoryWriter] = (
+            [] if writer is None else writer
+        )
+        rows.extend(np.concatenate(([te], state)) for te in t_eval[:i_eval])
+        # Only steps that reach the next output time pay for the interpolation
+        t_next: float = t_eval[i_eval] if i_eval < len(t_eval) else math.inf
+        for i in range(num_steps):
+            t0, x0, z0, vx0, vz0 = self.t, self.x, self.z, self.vx, self.vz
+            update()
+            self.t += self.dt
+            end: float = self.t
+            if i == num_steps - 1 and math.isclose(end, self.t_final):
+                end = max(end, self.t_final)
+            if t_next <= end:
+                j_eval: int = int(np.searchsorted(t_eval, end, side="right"))
+                s0 = np.array([x0, z0, vx0, vz0])
+                ax0, az0 = self.acceleration(vx0, vz0)
+                s1 = np.array([self.x, self.z, self.vx, self.vz])
+                dense = hermite(
+                    t0,
+                    s0,
+                    np.array([vx0, vz0, ax0, az0]),
+                    self.t,
+                    s1,
+                    self.state_derivatives(),
+                    t_eval[i_eval:j_eval],
+                )
+                rows.extend(np.column_stack((t_eval[i_eval:j_eval], dense)))
+                i_eval = j_eval
+                t_next = t_eval[i_eval] if i_eval < len(t_eval) else math.inf
+
+        if writer is None:
+            self.history = np.array(rows, dtype=np.float64).reshape(-1, 5)
+            self.step = len(self.history) - 1
+
+    def run_adaptive(
+        self,
+        t_eval: Optional[np.ndarray] = None,
+        output_every: int = 1,
+        writer: Optional[TrajectoryWriter] = None,
+    ) -> None:
+        """
+        Integrate with the adaptive Dormand-Prince 5(4) method and fill self.history.
+
+        The step size is chosen so that the local error stays below
+        atol + rtol * |state|; dt is only used as the initial step.
+
+        Args:
+            t_eval (Optional[np.ndarray]): Sorted output times, interpolated with
+                the dense output. Defaults to the accepted steps.
+            output_every (int): Without t_eval, record only every output_every-th
+                accepted step (the initial state and the last step are always
+                recorded).
+            writer (Optional[TrajectoryWriter]): Destination of the recorded rows
+                instead of self.history.
+        """
+        t: float = 0.0
+        state: np.ndarray = np.array([self.x0, self.z0, self.vx0, self.vz0])
+        self.nfev = 0
+        k1: np.ndarray = self.derivatives(state)
+        h: float = self.dt
+        accepted: int = 0
+
+        rows: Union[List[np.ndarray], TrajectoryWriter] = (
+            [] if writer is None else writer
+        )
+        if t_eval is None:
+            rows.append(np.concatenate(([t], state)))
+        else:
+            t_eval = np.asarray(t_eval, dtype=float)
+            i_eval: int = int(np.searchsorted(t_eval, t, side="right"))
+            rows.extend(np.concatenate(([te], state)) for te in t_eval[:i_eval])
+
+        while t < self.t_final:
+            last: bool = t + h >= self.t_final
+            if last:
+                h = self.t_final - t
+            state_new, K, err = self.step_rk45(state, k1, h)
+            scale = self.atol + self.rtol * np.maximum(np.abs(state), np.abs(state_new))
+            err_norm: float = float(np.sqrt(np.mean((err / scale) ** 2)))
+
+            if err_norm <= 1:
+                t_new: float = self.t_final if last else t + h
+                accepted += 1
+                if t_eval is None:
+                    if last or accepted % output_every == 0:
+                        rows.append(np.concatenate(([t_new], state_new)))
+                else:
+                    # Interpolate the output times that fall inside this step
+                    j_eval: int = int(np.searchsorted(t_eval, t_new, side="right"))
+                    if j_eval > i_eval:
+                        theta = (t_eval[i_eval:j_eval] - t) / h
+                        powers = np.cumprod(
+                            np.repeat(theta[:, None], 4, axis=1), axis=1
+                        )
+                        dense = state + h * powers @ (K.T @ RK45_P).T
+                        rows.extend(np.column_stack((t_eval[i_eval:j_eval], dense)))
+                        i_eval = j_eval
+                t, state, k1 = t_new, state_new, K[6]
+                factor: float = (
+                    10.0 if err_norm == 0 else min(10.0, 0.9 * err_norm**-0.2)
+                )
+            else:
+                factor = max(0.2, 0.9 * err_norm**-0.2)
+            h *= factor
+
+        if writer is None:
+            self.history = np.array(rows, dtype=np.float64).reshape(-1, 5)
+            self.step = len(self.history) - 1
+        self.t = t
+        self.x, self.z, self.vx, self.vz = state
 
     def run_simulation(
-        self, method: str
-    ) -> Tuple[List[float], List[float], List[float], List[float], List[float]]:
+        self,
+        method: str,
+        t_eval: Optional[np.ndarray] = None,
+        output_every: int = 1,
+        output_path: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
         Run the simulation using the specified integration method.
 
+        Small time steps can be used for accuracy without storing every step:
+        output_every keeps only some of the steps, and t_eval interpolates the
+        state at given times (dense output for 'rk45', cubic Hermite
+        interpolation for the fixed-step methods). With output_path the rows are
+        streamed to a .npy file in blocks as the integration proceeds, and
+        self.history becomes a memory-mapped view of that file.
+
         Args:
-            method (str): Integration method ('euler' or 'rk4').
+            method (str): Integration method ('euler', 'rk4' or 'rk45').
+            t_eval (Optional[np.ndarray]): Sorted output times. Defaults to the steps.
+            output_every (int): Record only every output_every-th step (the initial
+                state and the last step are always recorded). Cannot be combined
+                with t_eval.
+            output_path (Optional[str]): .npy file to stream the trajectory to
+                (columns t, x, z, vx, vz). Defaults to keeping it in memory.
 
         Returns:
-            Tuple containing histories: time, x, z, vx, and vz.
+            Tuple containing histories (views into self.history): time, x, z, vx, and vz.
         """
-        self.initialize()
-        num_steps: int = int(self.t_final / self.dt)
-
-        for _ in range(num_steps):
-            if method.lower() == "euler":
-                self.update_euler()
-            elif method.lower() == "rk4":
-                self.update_rk4()
+        if output_every < 1:
+            raise ValueError("output_every must be at least 1")
+        if t_eval is not None and output_every != 1:
+            raise ValueError("t_eval and output_every cannot be combined")
+
+        if method.lower() not in ("euler", "rk4", "rk45"):
+            raise ValueError(f"Unknown method: {method}")
+
+        writer = TrajectoryWriter(output_path, 5) if output_path else None
+        try:
+            if method.lower() == "rk45":
+                self.run_adaptive(t_eval, output_every, writer)
             else:
-                raise ValueError(f"Unknown method: {method}")
-            self.observe()
+                update = (
+                    self.update_euler if method.lower() == "euler" else self.update_rk4
+                )
+                if t_eval is None:
+                    self.run_fixed(update, output_every, writer)
+                else:
+                    self.run_fixed_eval(update, t_eval, writer)
+        finally:
+            if writer is not None:
+                writer.close()
+        if output_path:
+            self.history = read_trajectory(output_path)
+            self.step = len(self.history) - 1
 
         return (
             self.t_history,
@@ -142,25 +542,28 @@ class Simulation:
 
 
 def generate_comparison_plots(
-    t_euler: List[float],
-    x_euler: List[float],
-    z_euler: List[float],
-    vx_euler: List[float],
-    vz_euler: List[float],
-    t_rk4: List[float],
-    x_rk4: List[float],
-    z_rk4: List[float],
-    vx_rk4: List[float],
-    vz_rk4: List[float],
+    t_euler: np.ndarray,
+    x_euler: np.ndarray,
+    z_euler: np.ndarray,
+    vx_euler: np.ndarray,
+    vz_euler: np.ndarray,
+    t_rk4: np.ndarray,
+    x_rk4: np.ndarray,
+    z_rk4: np.ndarray,
+    vx_rk4: np.ndarray,
+    vz_rk4: np.ndarray,
     dt: float,
 ) -> None:
     """
     Generate plots to compare the Euler and RK4 integration methods.
 
     Args:
-        t_euler, x_euler, z_euler, vx_euler, vz_euler (List[float]): Histories from Euler method.
-        t_rk4, x_rk4, z_rk4, vx_rk4, vz_rk4 (List[float]): Histories from RK4 method.
+        t_euler, x_euler, z_euler, vx_euler, vz_euler (np.ndarray): Histories from Euler method.
+        t_rk4, x_rk4, z_rk4, vx_rk4, vz_rk4 (np.ndarray): Histories from RK4 method.
     """
+    # Imported here so that runs without plots (--no-plot) never load matplotlib
+    import matplotlib.pyplot as plt
+
     fig = plt.figure(constrained_layout=True, figsize=(12, 10))
     fig.suptitle(f"Comparison of Euler and RK4 methods (dt = {dt}s)", fontsize=16)
     gs = fig.add_gridspec(3, 2)
@@ -214,11 +617,11 @@ def generate_comparison_plots(
 
 
 def generate_single_method_plots(
-    t: List[float],
-    x: List[float],
-    z: List[float],
-    vx: List[float],
-    vz: List[float],
+    t: np.ndarray,
+    x: np.ndarray,
+    z: np.ndarray,
+    vx: np.ndarray,
+    vz: np.ndarray,
     dt: float,
     method: str,
 ) -> None:
@@ -226,8 +629,10 @@ def generate_single_method_plots(
     Generate plots for a single integration method.
 
     Args:
-        t, x, z, vx, vz (List[float]): Histories of time, x, z, vx, and vz.
+        t, x, z, vx, vz (np.ndarray): Histories of time, x, z, vx, and vz.
     """
+    import matplotlib.pyplot as plt
+
     fig = plt.figure(constrained_layout=True, figsize=(12, 10))
     fig.suptitle(
         f"Projectile Motion using {method.upper()} method (dt = {dt}s)", fontsize=16
@@ -272,6 +677,27 @@ def generate_single_method_plots(
     plt.show()
 
 
+def print_final_state(
+    method: str,
+    t: np.ndarray,
+    x: np.ndarray,
+    z: np.ndarray,
+    vx: np.ndarray,
+    vz: np.ndarray,
+) -> None:
+    """
+    Print the number of recorded points and the final state of a run.
+
+    Args:
+        method (str): Integration method of the run.
+        t, x, z, vx, vz (np.ndarray): Histories of time, x, z, vx, and vz.
+    """
+    print(
+        f"{method}: {len(t)} points, t = {t[-1]:g}, x = {x[-1]:.6f}, "
+        f"z = {z[-1]:.6f}, vx = {vx[-1]:.6f}, vz = {vz[-1]:.6f}"
+    )
+
+
 def main() -> None:
     """
     Parse command line arguments and execute the simulation.
@@ -282,9 +708,9 @@ def main() -> None:
     parser.add_argument(
         "--method",
         type=str,
-        choices=["euler", "rk4"],
+        choices=["euler", "rk4", "rk45"],
         default="euler",
-        help="Integration method: euler or rk4",
+        help="Integration method: euler, rk4 or adaptive rk45",
     )
     parser.add_argument(
         "--compare",
@@ -308,8 +734,39 @@ def main() -> None:
     parser.add_argument(
         "--gravity", type=float, default=9.81, help="Gravitational acceleration"
     )
+    parser.add_argument(
+        "--rtol", type=float, default=1e-6, help="Relative tolerance (rk45)"
+    )
+    parser.add_argument(
+        "--atol", type=float, default=1e-9, help="Absolute tolerance (rk45)"
+    )
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="Only print the final state, without importing matplotlib",
+    )
+    parser.add_argument(
+        "--output-every",
+        type=int,
+        default=1,
+        help="Record only every N-th step (the last step is always recorded)",
+    )
+    parser.add_argument(
+        "--output-points",
+        type=int,
+        default=0,
+        help="Record N equally spaced times from 0 to tfinal (interpolated)",
+    )
+    parser.add_argument(
+        "--trajectory-path",
+        type=str,
+        default="",
+        help="Stream the trajectory to this .npy file (one per method with --compare)",
+    )
 
     args = parser.parse_args()
+    if args.output_points and args.output_every != 1:
+        parser.error("--output-points and --output-every cannot be combined")
 
     # Create a simulation instance with the provided parameters
     sim = Simulation(
@@ -322,12 +779,43 @@ def main() -> None:
         args.mass,
         args.gravity,
         args.drag,
+        args.rtol,
+        args.atol,
+    )
+
+    t_eval = (
+        np.linspace(0.0, args.tfinal, args.output_points)
+        if args.output_points
+        else None
     )
 
+    # Trajectory file of each method (none: trajectories kept in memory)
+    paths = {}
+    if args.trajectory_path:
+        root, ext = os.path.splitext(args.trajectory_path)
+        if args.compare:
+            paths = {m: f"{root}_{m}{ext or '.npy'}" for m in ("euler", "rk4")}
+        else:
+            paths = {args.method: args.trajectory_path}
+
     if args.compare:
         # Run simulation using both Euler and RK4 methods
-        t_euler, x_euler, z_euler, vx_euler, vz_euler = sim.run_simulation("euler")
-        t_rk4, x_rk4, z_rk4, vx_rk4, vz_rk4 = sim.run_simulation("rk4")
+        t_euler, x_euler, z_euler, vx_euler, vz_euler = sim.run_simulation(
+            "euler", t_eval, args.output_every, paths.get("euler")
+        )
+        t_rk4, x_rk4, z_rk4, vx_rk4, vz_rk4 = sim.run_simulation(
+            "rk4", t_eval, args.output_every, paths.get("rk4")
+        )
+        if args.no_plot:
+            print_final_state("euler", t_euler, x_euler, z_euler, vx_euler, vz_euler)
+            print_final_state("rk4", t_rk4, x_rk4, z_rk4, vx_rk4, vz_rk4)
+            return
+        if paths:
+            # Only the plotted rows are read from disk
+            t_euler, x_euler, z_euler, vx_euler, vz_euler = thin(
+                read_trajectory(paths["euler"])
+            ).T
+            t_rk4, x_rk4, z_rk4, vx_rk4, vz_rk4 = thin(read_trajectory(paths["rk4"])).T
         generate_comparison_plots(
             t_euler,
             x_euler,
@@ -343,8 +831,17 @@ def main() -> None:
         )
     else:
         t_history, x_history, z_history, vx_history, vz_history = sim.run_simulation(
-            args.method
+            args.method, t_eval, args.output_every, paths.get(args.method)
         )
+        if args.no_plot:
+            print_final_state(
+                args.method, t_history, x_history, z_history, vx_history, vz_history
+            )
+            return
+        if paths:
+            t_history, x_history, z_history, vx_history, vz_history = thin(
+                read_trajectory(paths[args.method])
+            ).T
         generate_single_method_plots(
             t_history,
             x_history,
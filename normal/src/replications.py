@@ -0,0 +1,415 @@
+import argparse
+import csv
+import importlib
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Engines that can be replicated, mapped to the module that implements them
+ENGINES: Dict[str, str] = {
+    "nosimpy": "exercise1_nosimpy",
+    "simpy": "exercise1",
+    "vectorized": "exercise1_vectorized",
+}
+
+# Engines whose run_lockstep() runs a whole batch of seeds in one array pass
+LOCKSTEP_ENGINES: Tuple[str, ...] = ("vectorized",)
+
+# Statistics returned by the run_simulation() of every engine
+METRICS: Tuple[str, ...] = (
+    "avg_inspection_wait",
+    "avg_repair_wait",
+    "avg_inspection_queue",
+    "avg_repair_queue",
+    "utilization_inspection",
+    "utilization_repair",
+)
+
+DEFAULT_SEED: int = 42  # Root seed from which every replication seed is derived
+DEFAULT_BATCH: int = 64  # Replications launched per batch by the sequential controller
+
+
+def spawn_seeds(seed: int, n: int) -> List[int]:
+    """
+    Derive independent seeds for n replications from a single root seed.
+
+    Args:
+        seed (int): Root seed of the study.
+        n (int): Number of replications.
+
+    Returns:
+        List[int]: One seed per replication.
+    """
+    return next_seeds(np.random.SeedSequence(seed), n)
+
+
+def next_seeds(root: np.random.SeedSequence, n: int) -> List[int]:
+    """
+    Derive the next n replication seeds from a root seed sequence.
+
+    Successive calls continue where the previous one stopped, so seeds handed out
+    in batches are the same as the ones spawn_seeds() returns all at once.
+
+    Args:
+        root (np.random.SeedSequence): Root seed sequence of the study.
+        n (int): Number of replications.
+
+    Returns:
+        List[int]: One seed per replication.
+    """
+    return [int(child.generate_state(1)[0]) for child in root.spawn(n)]
+
+
+def run_replication(task: Tuple[str, int, int]) -> Dict[str, Any]:
+    """
+    Run a single replication inside a worker process.
+
+    Every worker process has its own copy of the engine module globals, and
+    run_simulation() resets them before starting, so replications never share state.
+
+    Args:
+        task (Tuple[str, int, int]): Engine name, replication index and seed.
+
+    Returns:
+        Dict[str, Any]: Replication index, seed and the statistics of the run.
+    """
+    engine, replication, seed = task
+    module = importlib.import_module(ENGINES[engine])
+    stats = module.run_simulation(seed=seed, print_report=False)
+    return {"replication": replication, "seed": seed, **stats}
+
+
+def run_batch(task: Tuple[str, int, Sequence[int]]) -> List[Dict[str, Any]]:
+    """
+    Run a block of consecutive replications in lock step inside a worker process.
+
+    Args:
+        task (Tuple[str, int, Sequence[int]]): Engine name (one of
+            LOCKSTEP_ENGINES), index of the first replication and the seeds.
+
+    Returns:
+        List[Dict[str, Any]]: Replication index, seed and the statistics of each run.
+    """
+    engine, first, seeds = task
+    module = importlib.import_module(ENGINES[engine])
+    return [
+        {"replication": first + i, "seed": seed, **stats}
+        for i, (seed, stats) in enumerate(zip(seeds, module.run_lockstep(seeds)))
+    ]
+
+
+def map_replications(
+    executor: Optional[ProcessPoolExecutor],
+    engine: str,
+    first: int,
+    seeds: Sequence[int],
+    workers: int,
+) -> Iterable[Dict[str, Any]]:
+    """
+    Run replications first, first + 1, ... with the given seeds, in order.
+
+    Lock-step engines get one contiguous block of seeds per worker, so each
+    process runs its share in a single array pass; the other engines get one
+    task per replication.
+
+    Args:
+        executor (Optional[ProcessPoolExecutor]): Pool to use, or None to run in
+            the calling process.
+        engine (str): Engine name.
+        first (int): Index of the first replication.
+        seeds (Sequence[int]): One seed per replication.
+        workers (int): Number of worker processes.
+
+    Returns:
+        Iterable[Dict[str, Any]]: One row per replication, in order.
+    """
+    if engine in LOCKSTEP_ENGINES:
+        size = max(1, math.ceil(len(seeds) / workers))
+        tasks = [
+            (engine, first + i, seeds[i : i + size]) for i in range(0, len(seeds), size)
+        ]
+        blocks = executor.map(run_batch, tasks) if executor else map(run_batch, tasks)
+        return (row for block in blocks for row in block)
+    tasks = [(engine, first + i, s) for i, s in enumerate(seeds)]
+    if executor is None:
+        return map(run_replication, tasks)
+    chunksize = max(1, len(tasks) // (workers * 4))
+    return executor.map(run_replication, tasks, chunksize=chunksize)
+
+
+def run_replications(
+    engine: str = "nosimpy",
+    n: int = 1000,
+    seed: int = DEFAULT_SEED,
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run n independent replications of a bus depot engine across a process pool.
+
+    Args:
+        engine (str): Engine to run ('nosimpy', 'simpy' or 'vectorized').
+        n (int): Number of replications.
+        seed (int): Root seed used to derive one seed per replication.
+        workers (Optional[int]): Number of worker processes. Defaults to every core.
+
+    Returns:
+        List[Dict[str, Any]]: Merged results table, one row per replication, in order.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    workers = workers or os.cpu_count() or 1
+    seeds = spawn_seeds(seed, n)
+    if workers == 1:
+        return list(map_replications(None, engine, 0, seeds, workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(map_replications(executor, engine, 0, seeds, workers))
+
+
+def t_critical(df: int, confidence: float = 0.95) -> float:
+    """
+    Two-sided critical value of the Student t distribution.
+
+    Exact for 1 and 2 degrees of freedom, Cornish-Fisher expansion otherwise.
+
+    Args:
+        df (int): Degrees of freedom.
+        confidence (float): Confidence level of the interval.
+
+    Returns:
+        float: Critical value t such that P(|T| <= t) = confidence.
+    """
+    p = 0.5 + confidence / 2
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = statistics.NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z**3 + z) / (4 * df)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+        + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3)
+        + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z)
+        / (92160 * df**4)
+    )
+
+
+def summarize(
+    rows: List[Dict[str, Any]], confidence: float = 0.95
+) -> Dict[str, Dict[str, float]]:
+    """
+    Compute mean, standard deviation and confidence interval half-width per metric.
+
+    Args:
+        rows (List[Dict[str, Any]]): Results table returned by run_replications().
+        confidence (float): Confidence level of the intervals.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Summary statistics keyed by metric name.
+    """
+    metrics = [k for k in rows[0] if k not in ("replication", "seed")]
+    n = len(rows)
+    summary: Dict[str, Dict[str, float]] = {}
+    for metric in metrics:
+        values = [row[metric] for row in rows]
+        mean = statistics.fmean(values)
+        std = statistics.stdev(values) if n > 1 else 0.0
+        half_width = (
+            t_critical(n - 1, confidence) * std / math.sqrt(n) if n > 1 else 0.0
+        )
+        summary[metric] = {"mean": mean, "std": std, "half_width": half_width}
+    return summary
+
+
+def precision_reached(
+    summary: Dict[str, Dict[str, float]], metrics: List[str], target: float
+) -> bool:
+    """
+    Check whether every metric has reached the target relative half-width.
+
+    Args:
+        summary (Dict[str, Dict[str, float]]): Output of summarize().
+        metrics (List[str]): Metrics that must reach the target.
+        target (float): Maximum half-width relative to the absolute mean.
+
+    Returns:
+        bool: True when half_width <= target * |mean| for every metric.
+    """
+    return all(
+        summary[m]["half_width"] <= target * abs(summary[m]["mean"]) for m in metrics
+    )
+
+
+def run_until_precision(
+    engine: str = "nosimpy",
+    metrics: Optional[List[str]] = None,
+    target: float = 0.05,
+    seed: int = DEFAULT_SEED,
+    workers: Optional[int] = None,
+    batch: int = DEFAULT_BATCH,
+    min_replications: int = 10,
+    max_replications: int = 100000,
+    confidence: float = 0.95,
+) -> List[Dict[str, Any]]:
+    """
+    Launch replications in parallel batches until every metric is precise enough.
+
+    After each batch the confidence intervals of the requested metrics are
+    recomputed from all replications so far, and no new batch is launched once
+    every half-width is at most `target` times the absolute mean (or after
+    max_replications).
+
+    Args:
+        engine (str): Engine to run ('nosimpy', 'simpy' or 'vectorized').
+        metrics (Optional[List[str]]): Metrics to control. Defaults to every metric.
+        target (float): Target half-width relative to the absolute mean.
+        seed (int): Root seed used to derive one seed per replication.
+        workers (Optional[int]): Number of worker processes. Defaults to every core.
+        batch (int): Replications launched per batch.
+        min_replications (int): Replications run before the first check.
+        max_replications (int): Upper bound on the number of replications.
+        confidence (float): Confidence level of the intervals.
+
+    Returns:
+        List[Dict[str, Any]]: Results table, one row per replication, in order.
+
+    Raises:
+        ValueError: For an unknown engine or metric, or if max_replications is
+            not positive.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    unknown = set(metrics or ()) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}")
+    if max_replications < 1:
+        raise ValueError("max_replications must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    root = np.random.SeedSequence(seed)
+    rows: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        n = min(max(min_replications, batch), max_replications)
+        while n > 0:
+            seeds = next_seeds(root, n)
+            rows.extend(map_replications(executor, engine, len(rows), seeds, workers))
+            summary = summarize(rows, confidence)
+            if precision_reached(summary, metrics or list(summary), target):
+                break
+            n = min(batch, max_replications - len(rows))
+    return rows
+
+
+def write_csv(rows: List[Dict[str, Any]], path: str) -> None:
+    """
+    Write the merged results table to a CSV file.
+
+    Args:
+        rows (List[Dict[str, Any]]): Results table returned by run_replications().
+        path (str): Destination file.
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def report(summary: Dict[str, Dict[str, float]], n: int, confidence: float) -> None:
+    """
+    Print the summary of a replication study.
+
+    Args:
+        summary (Dict[str, Dict[str, float]]): Output of summarize().
+        n (int): Number of replications.
+        confidence (float): Confidence level of the intervals.
+    """
+    print(f"=== Replication Report ({n} replications) ===")
+    for metric, s in summary.items():
+        print(
+            f"{metric}: {s['mean']:.4f} ± {s['half_width']:.4f} "
+            f"({confidence:.0%} CI, std {s['std']:.4f})"
+        )
+
+
+def main() -> None:
+    """
+    Parse command line arguments and run the replication study.
+    """
+    parser = argparse.ArgumentParser(
+        description="Parallel replications of the bus depot simulation"
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=list(ENGINES),
+        default="nosimpy",
+        help="Simulation engine to replicate",
+    )
+    parser.add_argument(
+        "--replications", type=int, default=1000, help="Number of replications"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=DEFAULT_SEED, help="Root seed of the study"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: all cores)",
+    )
+    parser.add_argument(
+        "--confidence", type=float, default=0.95, help="Confidence level of the CIs"
+    )
+    parser.add_argument(
+        "--output", type=str, default="", help="CSV file for the per-replication table"
+    )
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=None,
+        help="Run batches until every CI half-width is at most this fraction of "
+        "its mean (--replications becomes the upper bound)",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        nargs="+",
+        choices=METRICS,
+        default=None,
+        help="Metrics checked by --target (default: all)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=DEFAULT_BATCH,
+        help="Replications per batch with --target",
+    )
+    args = parser.parse_args()
+    if args.replications < 1:
+        parser.error("--replications must be at least 1")
+    if args.batch < 1:
+        parser.error("--batch must be at least 1")
+
+    if args.target is None:
+        rows = run_replications(args.engine, args.replications, args.seed, args.workers)
+    else:
+        rows = run_until_precision(
+            args.engine,
+            args.metrics,
+            args.target,
+            args.seed,
+            args.workers,
+            args.batch,
+            max_replications=args.replications,
+            confidence=args.confidence,
+        )
+    if args.output:
+        write_csv(rows, args.output)
+    report(summarize(rows, args.confidence), len(rows), args.confidence)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+import argparse
+import hashlib
+import importlib
+import inspect
+import itertools
+import json
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from replications import DEFAULT_SEED, ENGINES, spawn_seeds, write_csv
+
+# Bus depot parameters (module constants of both engines) that can be swept
+PARAMETERS: Tuple[str, ...] = (
+    "SIMULATION_TIME",
+    "MEAN_INTERARRIVAL",
+    "INSPECTION_CAPACITY",
+    "INSPECTION_TIME_MIN",
+    "INSPECTION_TIME_MAX",
+    "REPAIR_CAPACITY",
+    "REPAIR_TIME_MIN",
+    "REPAIR_TIME_MAX",
+    "REPAIR_PROB",
+)
+
+DEFAULT_CACHE_DIR: str = ".sweep_cache"  # Directory of the cached sweep points
+
+
+def code_version(engine: str) -> str:
+    """
+    Hash the source code an engine depends on, so cached points are invalidated
+    whenever the engine changes.
+
+    Args:
+        engine (str): Engine name ('nosimpy', 'simpy' or 'vectorized').
+
+    Returns:
+        str: SHA-256 of the engine module and the local modules it imports.
+    """
+    module = importlib.import_module(ENGINES[engine])
+    here = os.path.dirname(os.path.abspath(inspect.getsourcefile(module)))
+    sources = [inspect.getsourcefile(module)]
+    for value in vars(module).values():
+        dependency = inspect.getmodule(value)
+        path = getattr(dependency, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == here:
+            sources.append(path)
+    digest = hashlib.sha256()
+    for path in sorted(set(os.path.abspath(p) for p in sources)):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def normalize(module: Any, name: str, value: Any) -> Any:
+    """
+    Convert a parameter value to the type of the engine's module constant, so the
+    same point always gets the same cache key (e.g. 2 and 2.0 for a float).
+
+    Args:
+        module (Any): Engine module holding the parameter.
+        name (str): Parameter name, one of PARAMETERS.
+        value (Any): Value to convert (a number or a numeric string).
+
+    Returns:
+        Any: The value as an int for integer parameters, otherwise as a float.
+
+    Raises:
+        ValueError: If an integer parameter is given a value that is not a whole
+            number.
+    """
+    number = float(value)
+    if isinstance(getattr(module, name), int):
+        if not number.is_integer():
+            raise ValueError(f"{name} must be a whole number, got {value}")
+        return int(number)
+    return number
+
+
+def effective_parameters(engine: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Complete the values of a sweep point with the engine's current values of the
+    parameters that are not swept.
+
+    Args:
+        engine (str): Engine name.
+        params (Dict[str, Any]): Values of the swept parameters.
+
+    Returns:
+        Dict[str, Any]: Normalized value of every parameter in PARAMETERS.
+    """
+    module = importlib.import_module(ENGINES[engine])
+    return {
+        name: normalize(module, name, params.get(name, getattr(module, name)))
+        for name in PARAMETERS
+    }
+
+
+def cache_key(engine: str, params: Dict[str, Any], seed: int, version: str) -> str:
+    """
+    Build the cache key of a sweep point.
+
+    Args:
+        engine (str): Engine name.
+        params (Dict[str, Any]): Value of every parameter, from
+            effective_parameters().
+        seed (int): Seed of the replication.
+        version (str): Output of code_version() for the engine.
+
+    Returns:
+        str: Hex digest identifying the point.
+    """
+    payload = json.dumps(
+        {"engine": engine, "params": params, "seed": seed, "code": version},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def run_point(task: Tuple[str, Dict[str, Any], int]) -> Dict[str, float]:
+    """
+    Run one replication of a sweep point, possibly inside a worker process.
+
+    Every given module constant is set, so a worker process runs with the values
+    of the calling process rather than its own defaults; they are restored
+    afterwards, so running points in the calling process leaves the engine module
+    as it was.
+
+    Args:
+        task (Tuple[str, Dict[str, Any], int]): Engine name, parameter values (from
+            effective_parameters()) and seed.
+
+    Returns:
+        Dict[str, float]: Statistics of the run.
+    """
+    engine, params, seed = task
+    module = importlib.import_module(ENGINES[engine])
+    defaults = {name: getattr(module, name) for name in params}
+    try:
+        for name, value in params.items():
+            setattr(module, name, value)
+        return module.run_simulation(seed=seed, print_report=False)
+    finally:
+        for name, value in defaults.items():
+            setattr(module, name, value)
+
+
+def sweep(
+    grid: Dict[str, Sequence[Any]],
+    engine: str = "nosimpy",
+    replications: int = 1,
+    seed: int = DEFAULT_SEED,
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+) -> List[Dict[str, Any]]:
+    """
+    Run the cartesian grid of parameter values across a process pool.
+
+    Every (point, seed) result is stored in `cache_dir` under a key made of the
+    values of every parameter (swept or not), the seed and the engine source code
+    hash; only points that are not in the cache are computed.
+
+    Args:
+        grid (Dict[str, Sequence[Any]]): Values of each swept parameter.
+        engine (str): Engine to run ('nosimpy', 'simpy' or 'vectorized').
+        replications (int): Replications per point (seeds derived from `seed`).
+        seed (int): Root seed of the replications.
+        workers (Optional[int]): Number of worker processes. Defaults to every core.
+        cache_dir (Optional[str]): Cache directory, or None to disable caching.
+
+    Returns:
+        List[Dict[str, Any]]: One row per point and replication, with the swept
+        parameter values, the seed and the statistics of the run.
+
+    Raises:
+        ValueError: For an unknown engine or parameter, or a value that is not a
+            whole number for an integer parameter.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    unknown = set(grid) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+
+    names = list(grid)
+    points = [
+        effective_parameters(engine, dict(zip(names, values)))
+        for values in itertools.product(*grid.values())
+    ]
+    seeds = spawn_seeds(seed, replications)
+    version = code_version(engine)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    results: Dict[Tuple[int, int], Dict[str, float]] = {}
+    missing: List[Tuple[int, int]] = []
+    for p, params in enumerate(points):
+        for r, s in enumerate(seeds):
+            path = cache_dir and os.path.join(
+                cache_dir, cache_key(engine, params, s, version) + ".json"
+            )
+            if path and os.path.exists(path):
+                with open(path) as f:
+                    results[p, r] = json.load(f)["stats"]
+            else:
+                missing.append((p, r))
+
+    tasks = [(engine, points[p], seeds[r]) for p, r in missing]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        computed = [run_point(task) for task in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            computed = list(executor.map(run_point, tasks, chunksize=chunksize))
+
+    for (p, r), stats in zip(missing, computed):
+        results[p, r] = stats
+        if cache_dir:
+            path = os.path.join(
+                cache_dir, cache_key(engine, points[p], seeds[r], version) + ".json"
+            )
+            with open(path, "w") as f:
+                json.dump(
+                    {
+                        "engine": engine,
+                        "params": points[p],
+                        "seed": seeds[r],
+                        "stats": stats,
+                    },
+                    f,
+                )
+
+    return [
+        {
+            **{name: points[p][name] for name in names},
+            "seed": seeds[r],
+            **results[p, r],
+        }
+        for p in range(len(points))
+        for r in range(len(seeds))
+    ]
+
+
+def main() -> None:
+    """
+    Parse command line arguments and run the parameter sweep.
+    """
+    parser = argparse.ArgumentParser(
+        description="Parallel parameter sweep of the bus depot simulation"
+    )
+    parser.add_argument(
+        "--param",
+        nargs="+",
+        action="append",
+        required=True,
+        metavar=("NAME", "VALUE"),
+        help=f"Parameter and its values, repeatable (one of: {', '.join(PARAMETERS)})",
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=list(ENGINES),
+        default="nosimpy",
+        help="Simulation engine to run",
+    )
+    parser.add_argument(
+        "--replications", type=int, default=1, help="Replications per point"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=DEFAULT_SEED, help="Root seed of the replications"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: all cores)",
+    )
+    parser.add_argument(
+        "--cache-dir", type=str, default=DEFAULT_CACHE_DIR, help="Cache directory"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Disable the cache")
+    parser.add_argument(
+        "--output", type=str, default="", help="CSV file for the per-run table"
+    )
+    args = parser.parse_args()
+    if args.replications < 1:
+        parser.error("--replications must be at least 1")
+
+    module = importlib.import_module(ENGINES[args.engine])
+    grid: Dict[str, List[Any]] = {}
+    for name, *values in args.param:
+        if name not in PARAMETERS or not values:
+            parser.error(f"--param needs a parameter from {PARAMETERS} and values")
+        try:
+            grid[name] = [normalize(module, name, v) for v in values]
+        except ValueError as error:
+            parser.error(f"--param {name}: {error}")
+
+    rows = sweep(
+        grid,
+        args.engine,
+        args.replications,
+        args.seed,
+        args.workers,
+        None if args.no_cache else args.cache_dir,
+    )
+    if args.output:
+        write_csv(rows, args.output)
+
+    metrics = [k for k in rows[0] if k not in grid and k != "seed"]
+    print(" ".join(f"{name:>20}" for name in [*grid, *metrics]))
+    for i in range(0, len(rows), args.replications):
+        point = rows[i : i + args.replications]
+        means = [statistics.fmean(row[m] for row in point) for m in metrics]
+        print(
+            " ".join(f"{point[0][name]:>20}" for name in grid)
+            + " "
+            + " ".join(f"{m:>20.4f}" for m in means)
+        )
+
+
+if __name__ == "__main__":
+    main()
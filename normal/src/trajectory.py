@@ -0,0 +1,126 @@
+import struct
+from array import array
+from typing import Iterable, Sequence
+
+import numpy as np
+
+NPY_MAGIC: bytes = b"\x93NUMPY\x01\x00"  # .npy format, version 1.0
+HEADER_SIZE: int = 128  # Bytes reserved for the .npy header (multiple of 64)
+BUFFER_ROWS: int = 65536  # Rows kept in memory between writes
+PLOT_POINTS: int = 100000  # Most rows read from disk to draw a plot
+
+
+def npy_header(rows: int, columns: int) -> bytes:
+    """
+    Build a fixed-size .npy header for a (rows, columns) float64 array, so it can
+    be rewritten in place as the file grows.
+
+    Args:
+        rows (int): Number of rows.
+        columns (int): Number of columns.
+
+    Returns:
+        bytes: Header of HEADER_SIZE bytes.
+    """
+    header = repr(
+        {"descr": np.dtype(float).str, "fortran_order": False, "shape": (rows, columns)}
+    )
+    header = header.ljust(HEADER_SIZE - len(NPY_MAGIC) - 3) + "\n"
+    return NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+class TrajectoryWriter:
+    """
+    Stream a trajectory to disk while it is being integrated.
+
+    Rows (e.g. t, x, z, vx, vz) are collected in a flat array of doubles and
+    appended to a .npy file in blocks. The header is rewritten after every block,
+    so the file is always a valid .npy holding the rows written so far, and the
+    memory used does not grow with the length of the trajectory.
+    """
+
+    def __init__(self, path: str, columns: int, buffer_rows: int = BUFFER_ROWS) -> None:
+        """
+        Create the trajectory file and write its (still empty) header.
+
+        Args:
+            path (str): Destination .npy file.
+            columns (int): Number of values per row.
+            buffer_rows (int): Rows collected before each write.
+        """
+        self.path: str = path
+        self.columns: int = columns
+        self.buffer_rows: int = buffer_rows
+        self.rows: array = array("d")  # Pending values, row after row
+        self.written: int = 0
+        self.file = open(path, "wb")
+        self.file.write(npy_header(0, columns))
+
+    def append(self, row: Sequence[float]) -> None:
+        """Append one row to the trajectory."""
+        self.rows.extend(row)
+        if len(self.rows) >= self.buffer_rows * self.columns:
+            self.flush()
+
+    def extend(self, rows: Iterable[Sequence[float]]) -> None:
+        """Append several rows to the trajectory."""
+        for row in rows:
+            self.rows.extend(row)
+        if len(self.rows) >= self.buffer_rows * self.columns:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending rows to the file and update the header."""
+        if self.rows:
+            self.rows.tofile(self.file)
+            self.written += len(self.rows) // self.columns
+            del self.rows[:]
+            self.file.seek(0)
+            self.file.write(npy_header(self.written, self.columns))
+            self.file.seek(0, 2)
+        self.file.flush()
+
+    def close(self) -> None:
+        """Write the pending rows and close the file."""
+        self.flush()
+        self.file.close()
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def read_trajectory(path: str) -> np.ndarray:
+    """
+    Open a stored trajectory as a memory-mapped array (rows are only read from
+    disk when used).
+
+    Args:
+        path (str): Trajectory .npy file.
+
+    Returns:
+        np.ndarray: Read-only (rows, columns) array; column 0 holds the times.
+    """
+    return np.load(path, mmap_mode="r")
+
+
+def thin(trajectory: np.ndarray, max_points: int = PLOT_POINTS) -> np.ndarray:
+    """
+    Keep at most max_points evenly spaced rows of a trajectory (plus the last one)
+    without loading it whole: on a memory-mapped array only the kept rows are
+    read from disk.
+
+    Args:
+        trajectory (np.ndarray): (rows, columns) array, e.g. from read_trajectory().
+        max_points (int): Most rows to keep.
+
+    Returns:
+        np.ndarray: The kept rows (at most max_points + 1).
+    """
+    stride = max(1, -(-len(trajectory) // max_points))
+    rows = np.asarray(trajectory[::stride])
+    if stride > 1 and (len(trajectory) - 1) % stride:
+        rows = np.vstack((rows, trajectory[-1:]))
+    return rows
@@ -0,0 +1,78 @@
+import itertools
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+
+BLOCK_SIZE: int = 65536  # Maximum number of variates generated per block
+FIRST_BLOCK_SIZE: int = 64  # Size of the first block (doubles on every refill)
+
+Seed = Union[None, int, np.random.SeedSequence]
+
+
+class VariateBuffer:
+    """
+    Supply of random variates pre-generated in NumPy blocks.
+
+    A whole block is drawn at once from a numpy.random.Generator and handed out one
+    value at a time by `next`, a C-level cursor (itertools.chain over the blocks),
+    so the event loop pays no Python-level generator call per draw. New blocks are
+    generated lazily when the cursor runs out; they start small and double up to
+    the maximum block size, so short runs do not pay for large blocks.
+    """
+
+    def __init__(
+        self,
+        rng: np.random.Generator,
+        kind: str = "uniform",
+        block_size: int = BLOCK_SIZE,
+    ) -> None:
+        """
+        Create the supply; the first block is generated on the first request.
+
+        Args:
+            rng (np.random.Generator): Generator the blocks are drawn from.
+            kind (str): 'uniform' for U[0, 1) or 'exponential' for mean-1 exponentials.
+            block_size (int): Maximum block size.
+        """
+        if kind not in ("uniform", "exponential"):
+            raise ValueError(f"Unknown variate kind: {kind}")
+        self.rng: np.random.Generator = rng
+        self.kind: str = kind
+        self.block_size: int = block_size
+        self.next_size: int = min(FIRST_BLOCK_SIZE, block_size)
+        self.next: Callable[[], float] = itertools.chain.from_iterable(self).__next__
+
+    def __iter__(self) -> "VariateBuffer":
+        return self
+
+    def __next__(self) -> List[float]:
+        """
+        Generate the next block of variates (called by the cursor when it runs out).
+
+        Returns:
+            List[float]: The new block.
+        """
+        if self.kind == "exponential":
+            block = self.rng.standard_exponential(self.next_size)
+        else:
+            block = self.rng.random(self.next_size)
+        self.next_size = min(2 * self.next_size, self.block_size)
+        return block.tolist()
+
+
+def make_buffers(
+    seed: Seed, kinds: Dict[str, str], block_size: int = BLOCK_SIZE
+) -> Dict[str, VariateBuffer]:
+    """
+    Create one variate supply per purpose, all drawing from a generator seeded once.
+
+    Args:
+        seed (Seed): Seed of the replication (None for fresh OS entropy).
+        kinds (Dict[str, str]): Kind of variate of each purpose.
+        block_size (int): Maximum block size.
+
+    Returns:
+        Dict[str, VariateBuffer]: One supply per purpose.
+    """
+    rng = np.random.default_rng(seed)
+    return {name: VariateBuffer(rng, kind, block_size) for name, kind in kinds.items()}
@@ -0,0 +1,439 @@
+import argparse
+import heapq
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from event_list import EVENT_LISTS, make_event_list
+from simulate import Simulation
+from simulate_simpy import SimPySimulation
+
+# Motores comparados pelo benchmark "engines"
+ENGINES = {"simulate": Simulation, "simpy": SimPySimulation}
+
+# Linhas de comando medidas pelo benchmark "startup": diretório (relativo a src/)
+# e argumentos do interpretador
+STARTUP_COMMANDS = {
+    "python": ("ex1", ["-c", "pass"]),
+    "numpy": ("ex1", ["-c", "import numpy"]),
+    "ex1": ("ex1", ["main.py", "--simtime", "1"]),
+    "ex1 --simpy": ("ex1", ["main.py", "--simtime", "1", "--simpy"]),
+    "ex2 --no-plot": ("ex2", ["main.py", "--tfinal", "1", "--no-plot"]),
+}
+
+
+def bench_servers(server_counts, sim_time, seed, event_list="heap"):
+    """
+    Mede o custo por evento do motor simulate.py em função do número de servidores.
+    A taxa de chegada é escalada com o número de servidores A para manter a carga
+    por servidor constante; há metade dos servidores B (mínimo 1).
+    Inputs:
+        server_counts: lista com os números de servidores A a testar
+        sim_time: tempo de simulação de cada execução
+        seed: semente do gerador aleatório
+        event_list: implementação da lista de eventos futuros
+    Returns:
+        lista de dicionários com servidores, eventos, tempo total e µs por evento
+    """
+    results = []
+    for num_A in server_counts:
+        num_B = max(1, num_A // 2)
+        sim = Simulation(
+            num_servers_A=num_A,
+            num_servers_B=num_B,
+            sim_time=sim_time,
+            seed=seed,
+            event_list=event_list,
+        )
+        sim.mean_interarrival *= 2 / num_A
+        start = time.perf_counter()
+        sim.run(print_stats=False)
+        elapsed = time.perf_counter() - start
+        results.append(
+            {
+                "servers_A": num_A,
+                "servers_B": num_B,
+                "events": sim.num_events,
+                "seconds": elapsed,
+                "us_per_event": 1e6 * elapsed / sim.num_events,
+            }
+        )
+    return results
+
+
+def code_version():
+    """
+    Identifica a versão do código medido.
+    Inputs: Nenhum
+    Returns:
+        hash curto do commit git, ou "unknown" fora de um repositório git
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_engine(engine, params, seeds):
+    """
+    Mede o tempo de um motor ao longo de várias sementes e o seu pico de memória.
+    Inputs:
+        engine: classe da simulação (Simulation ou SimPySimulation)
+        params: dicionário com sim_time, mean_interarrival, servers_A e servers_B
+        seeds: sementes, uma execução por semente
+    Returns:
+        dicionário com tempo total, eventos, eventos por segundo, pico de memória
+        e o resumo estatístico de cada execução
+    """
+
+    def make(seed):
+        sim = engine(
+            num_servers_A=params["servers_A"],
+            num_servers_B=params["servers_B"],
+            sim_time=params["sim_time"],
+            seed=seed,
+            verbose=False,
+        )
+        sim.mean_interarrival = params["mean_interarrival"]
+        return sim
+
+    runs = []
+    wall = 0.0
+    events = 0
+    for seed in seeds:
+        sim = make(seed)
+        start = time.perf_counter()
+        stats = sim.run(print_stats=False)
+        wall += time.perf_counter() - start
+        events += sim.num_events
+        runs.append(stats.summary(sim.sim_time))
+
+    # A memória é medida numa execução à parte para não distorcer os tempos
+    sim = make(seeds[0])
+    tracemalloc.start()
+    sim.run(print_stats=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_time": wall,
+        "events": events,
+        "events_per_second": events / wall,
+        "peak_memory_kib": peak / 1024,
+        "runs": runs,
+    }
+
+
+def agreement(runs_a, runs_b):
+    """
+    Compara os resumos de dois motores executados com as mesmas sementes.
+    Inputs:
+        runs_a: resumos do primeiro motor, um por semente
+        runs_b: resumos do segundo motor, pela mesma ordem
+    Returns:
+        maior diferença absoluta de cada métrica entre os dois motores
+    """
+    return {
+        key: max(abs(a[key] - b[key]) for a, b in zip(runs_a, runs_b))
+        for key in runs_a[0]
+    }
+
+
+def bench_engines(sim_times, interarrivals, server_pairs, replications):
+    """
+    Compara os motores simulate.py e simulate_simpy.py numa grelha de parâmetros.
+    Inputs:
+        sim_times: tempos de simulação a testar
+        interarrivals: tempos médios entre chegadas a testar
+        server_pairs: pares (servidores A, servidores B) a testar
+        replications: número de execuções (sementes 0..n-1) por motor e ponto da grelha
+    Returns:
+        documento com metadados e uma entrada por ponto da grelha, pronto para JSON
+    """
+    seeds = list(range(replications))
+    results = []
+    for sim_time, interarrival, (num_A, num_B) in itertools.product(
+        sim_times, interarrivals, server_pairs
+    ):
+        params = {
+            "sim_time": sim_time,
+            "mean_interarrival": interarrival,
+            "servers_A": num_A,
+            "servers_B": num_B,
+        }
+        engines = {
+            name: bench_engine(engine, params, seeds)
+            for name, engine in ENGINES.items()
+        }
+        diff = agreement(engines["simulate"]["runs"], engines["simpy"]["runs"])
+        for e in engines.values():
+            del e["runs"]
+        results.append({"params": params, "engines": engines, "max_abs_diff": diff})
+
+    return {
+        "benchmark": "ex1_engines",
+        "version": code_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "replications": replications,
+        "results": results,
+    }
+
+
+def hold(kind, size, operations, seed=0):
+    """
+    Mede o modelo "hold" numa lista de eventos futuros: com size eventos pendentes,
+    retira repetidamente o mais cedo e agenda um novo um tempo exponencial depois,
+    pelo que o número de eventos pendentes se mantém constante.
+    Inputs:
+        kind: implementação da lista de eventos ("heap", "calendar" ou "ladder")
+        size: número de eventos pendentes
+        operations: número de operações medidas (depois de outras tantas de aquecimento)
+        seed: semente dos tempos dos eventos
+    Returns:
+        tempo médio de uma operação (um pop e um push) em nanossegundos
+    """
+    rng = random.Random(seed)
+    events = make_event_list(kind)
+    for i in range(size):
+        events.push((rng.expovariate(1.0), i))
+    seq = size
+    # A primeira passagem (não medida) deixa o calendar queue e a ladder queue
+    # estabilizarem depois do enchimento inicial; só a segunda é medida
+    for _ in range(2):
+        delays = [rng.expovariate(1.0) for _ in range(operations)]
+        start = time.perf_counter()
+        for delay in delays:
+            seq += 1
+            events.push((events.pop()[0] + delay, seq))
+        elapsed = time.perf_counter() - start
+    return 1e9 * elapsed / operations
+
+
+def check_event_lists(size=5000, operations=20000, seeds=4):
+    """
+    Compara cada lista de eventos com o heapq numa sequência hold aleatória com
+    tempos quase sempre inteiros, para que muitos eventos empatem e os baldes
+    sejam divididos em degraus encaixados da ladder queue.
+    Inputs:
+        size: número de eventos pendentes
+        operations: número de operações hold (um pop e um push)
+        seeds: número de sequências aleatórias (sementes 0, 1, ...) por lista
+    Returns: Nenhum (lança RuntimeError se uma lista retirar um evento por outra
+        ordem, perder um evento ou indicar outro tamanho)
+    """
+    for kind, seed in itertools.product(EVENT_LISTS, range(seeds)):
+        rng = random.Random(seed)
+        events = make_event_list(kind)
+        reference = []
+        for seq in range(size):
+            event = (float(rng.randint(0, 100)), seq)
+            events.push(event)
+            heapq.heappush(reference, event)
+        for seq in range(size, size + operations):
+            expected = heapq.heappop(reference)
+            try:
+                got = events.pop()
+            except IndexError:
+                got = None
+            if got != expected or len(events) != len(reference):
+                raise RuntimeError(f"A lista {kind} retirou {got} em vez de {expected}")
+            delay = rng.randint(0, 60) if rng.random() < 0.9 else rng.expovariate(0.1)
+            event = (expected[0] + delay, seq)
+            events.push(event)
+            heapq.heappush(reference, event)
+
+
+def bench_event_lists(sizes, operations):
+    """
+    Corre o modelo hold para cada implementação da lista de eventos e cada tamanho.
+    Inputs:
+        sizes: números de eventos pendentes a testar
+        operations: número de operações medidas por tamanho
+    Returns:
+        lista de dicionários com o tamanho, os ns por operação de cada
+        implementação e a mais rápida
+    """
+    # Cada implementação tem de retirar os mesmos eventos que o heapq antes de ser
+    # medida
+    check_event_lists()
+    results = []
+    for size in sizes:
+        ns = {kind: hold(kind, size, operations) for kind in EVENT_LISTS}
+        results.append(
+            {"size": size, "ns_per_hold": ns, "fastest": min(ns, key=ns.get)}
+        )
+    return results
+
+
+def bench_startup(runs):
+    """
+    Mede o tempo de execuções curtas da linha de comandos, do arranque do processo
+    até ao fim. Cada comando corre num interpretador novo, pelo que o tempo inclui
+    todas as importações; "python" e "numpy" dão o mínimo possível.
+    Inputs:
+        runs: número de execuções de cada comando
+    Returns:
+        dicionário com o melhor tempo e a mediana (ms) de cada comando
+    """
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for name, (directory, command) in STARTUP_COMMANDS.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, *command],
+                cwd=os.path.join(src, directory),
+                check=True,
+                capture_output=True,
+            )
+            times.append(1e3 * (time.perf_counter() - start))
+        results[name] = {"best_ms": min(times), "median_ms": statistics.median(times)}
+    return results
+
+
+def parse_servers(text):
+    """
+    Converte um par de servidores no formato "AxB" (por exemplo "2x1").
+    Inputs:
+        text: texto a converter
+    Returns:
+        tuplo (servidores A, servidores B)
+    """
+    num_A, num_B = text.lower().split("x")
+    return int(num_A), int(num_B)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks do exercício 1")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    p_servers = sub.add_parser(
+        "servers", help="Custo por evento em função do número de servidores"
+    )
+    p_servers.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=[2, 8, 32, 128, 500, 2000],
+        help="Números de servidores A a testar",
+    )
+    p_servers.add_argument(
+        "--simtime", type=float, default=200.0, help="Tempo de cada simulação"
+    )
+    p_servers.add_argument("--seed", type=int, default=1, help="Semente")
+    p_servers.add_argument(
+        "--event-list",
+        type=str,
+        choices=list(EVENT_LISTS),
+        default="heap",
+        help="Implementação da lista de eventos futuros",
+    )
+
+    p_engines = sub.add_parser(
+        "engines", help="Compara os motores simulate.py e simulate_simpy.py"
+    )
+    p_engines.add_argument(
+        "--simtime",
+        type=float,
+        nargs="+",
+        default=[1000.0, 10000.0],
+        help="Tempos de simulação a testar",
+    )
+    p_engines.add_argument(
+        "--interarrival",
+        type=float,
+        nargs="+",
+        default=[1.0, 0.5],
+        help="Tempos médios entre chegadas a testar",
+    )
+    p_engines.add_argument(
+        "--servers",
+        type=parse_servers,
+        nargs="+",
+        default=[(2, 1), (4, 2)],
+        help="Pares de servidores no formato AxB (por exemplo 2x1)",
+    )
+    p_engines.add_argument(
+        "--replications", type=int, default=5, help="Execuções por ponto da grelha"
+    )
+    p_engines.add_argument(
+        "--output", type=str, default="", help="Ficheiro JSON para os resultados"
+    )
+
+    p_events = sub.add_parser(
+        "events", help="Modelo hold das listas de eventos futuros"
+    )
+    p_events.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 10000, 100000, 1000000],
+        help="Números de eventos pendentes a testar",
+    )
+    p_events.add_argument(
+        "--operations", type=int, default=100000, help="Operações medidas por tamanho"
+    )
+
+    p_startup = sub.add_parser(
+        "startup", help="Tempo de arranque das linhas de comandos dos exercícios"
+    )
+    p_startup.add_argument(
+        "--runs", type=int, default=10, help="Execuções de cada comando"
+    )
+
+    args = parser.parse_args()
+
+    if args.benchmark == "servers":
+        print(f"{'A':>6} {'B':>6} {'eventos':>10} {'tempo (s)':>10} {'µs/evento':>10}")
+        for r in bench_servers(args.counts, args.simtime, args.seed, args.event_list):
+            print(
+                f"{r['servers_A']:>6} {r['servers_B']:>6} {r['events']:>10} "
+                f"{r['seconds']:>10.3f} {r['us_per_event']:>10.2f}"
+            )
+    elif args.benchmark == "engines":
+        document = bench_engines(
+            args.simtime, args.interarrival, args.servers, args.replications
+        )
+        for r in document["results"]:
+            p = r["params"]
+            print(
+                f"T={p['sim_time']:g} chegadas={p['mean_interarrival']:g} "
+                f"A={p['servers_A']} B={p['servers_B']} | "
+                f"diferença máx. = {max(r['max_abs_diff'].values()):.3g}"
+            )
+            for name, e in r["engines"].items():
+                print(
+                    f"    {name:>8}: {e['wall_time']:8.3f} s, "
+                    f"{e['events_per_second']:10.0f} eventos/s, "
+                    f"pico {e['peak_memory_kib']:8.1f} KiB"
+                )
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(document, f, indent=2)
+    elif args.benchmark == "events":
+        print(f"{'eventos':>10} " + " ".join(f"{k:>10}" for k in EVENT_LISTS))
+        for r in bench_event_lists(args.sizes, args.operations):
+            print(
+                f"{r['size']:>10} "
+                + " ".join(f"{r['ns_per_hold'][k]:>10.0f}" for k in EVENT_LISTS)
+                + f"  mais rápida: {r['fastest']}"
+            )
+    elif args.benchmark == "startup":
+        print(f"{'comando':>14} {'melhor (ms)':>12} {'mediana (ms)':>12}")
+        for name, r in bench_startup(args.runs).items():
+            print(f"{name:>14} {r['best_ms']:>12.1f} {r['median_ms']:>12.1f}")
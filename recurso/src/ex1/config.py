@@ -8,4 +8,11 @@ NUM_SERVERS_A = 2                # Número de servidores do tipo A
 NUM_SERVERS_B = 1                # Número de servidores do tipo B
 USE_SIMPY = False                # Usar SimPy para simulação
 VERBOSE = False                  # Controlo de logging detalhado (ativar com --verbose)
-SEED = None                      # Semente para aleatoriedade (pode ser definida via --seed)
\ No newline at end of file
+SEED = None                      # Semente para aleatoriedade (pode ser definida via --seed)
+STEADY_STATE = False             # Estimativas de estado estacionário numa execução longa (--steady-state)
+BIN_WIDTH = 1.0                  # Largura (minutos) dos intervalos das médias de filas em estado estacionário
+NUM_BATCHES = 20                 # Número de lotes do método das médias de lotes
+CHECKPOINT_EVERY = None          # Intervalo de tempo simulado entre checkpoints (None desativa)
+CHECKPOINT_PATH = "simulation.ckpt"  # Ficheiro onde os checkpoints são gravados
+TRACE_PATH = None                # Ficheiro do traço binário dos eventos (None desativa; --trace)
+EVENT_LIST = "heap"              # Lista de eventos futuros: "heap", "calendar" ou "ladder" (--event-list)
\ No newline at end of file
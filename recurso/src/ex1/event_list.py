@@ -0,0 +1,347 @@
+import bisect
+import heapq
+import math
+
+# Os eventos são tuplos cujo primeiro campo é o tempo; os restantes campos (por
+# exemplo um número de sequência) tornam cada evento único, pelo que os empates
+# nunca chegam a comparar os dados do evento
+
+
+class HeapEventList(list):
+    """
+    Lista de eventos futuros mantida como heap binária (O(log n) por operação).
+    Por ser uma subclasse de list, len() e os testes de verdade correm em C e o
+    heapq faz as trocas em C, o que a torna a opção mais rápida para listas
+    pequenas e médias.
+    """
+
+    def push(self, event):
+        """
+        Insere um evento.
+        Inputs:
+            event: tuplo do evento
+        Returns: Nenhum
+        """
+        heapq.heappush(self, event)
+
+    def pop(self):
+        """
+        Remove e devolve o evento mais cedo.
+        Inputs: Nenhum
+        Returns:
+            tuplo do evento
+        """
+        return heapq.heappop(self)
+
+    def peek(self):
+        """
+        Devolve o evento mais cedo sem o remover.
+        Inputs: Nenhum
+        Returns:
+            tuplo do evento
+        """
+        return self[0]
+
+
+class CalendarQueue:
+    """
+    Calendar queue (Brown, 1988): os eventos são distribuídos pelo tempo num anel
+    de baldes ("dias") de largura fixa, cada um ordenado, e retirados percorrendo
+    os dias do "ano" corrente. O número de baldes duplica ou passa a metade com o
+    número de eventos e a largura é reestimada a partir do espaçamento dos
+    primeiros eventos, pelo que inserir e retirar custam O(1) em média.
+    """
+
+    MIN_BUCKETS = 4  # O calendário nunca fica com menos baldes do que estes
+    SAMPLE_SIZE = 25  # Primeiros eventos usados para estimar a largura dos baldes
+
+    def __init__(self, width=1.0):
+        """
+        Cria um calendário vazio.
+        Inputs:
+            width: largura inicial dos baldes (reestimada em cada redimensionamento)
+        Returns: Nenhum
+        """
+        self.width = width
+        self.buckets = [[] for _ in range(self.MIN_BUCKETS)]
+        self.current = 0  # Número absoluto do dia a ser percorrido
+        self.last_time = 0.0  # Tempo do último evento retirado
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, event):
+        """
+        Insere um evento no balde do seu dia.
+        Inputs:
+            event: tuplo do evento
+        Returns: Nenhum
+        """
+        buckets = self.buckets
+        bisect.insort(buckets[int(event[0] / self.width) % len(buckets)], event)
+        self.size += 1
+        if self.size > 2 * len(buckets):
+            self.resize(2 * len(buckets))
+
+    def locate(self):
+        """
+        Procura o balde com o evento mais cedo e torna o seu dia o dia corrente.
+        Inputs: Nenhum
+        Returns:
+            o balde, cujo primeiro evento é o mais cedo
+        """
+        if not self.size:
+            raise IndexError("Lista de eventos vazia")
+        buckets, width = self.buckets, self.width
+        n = len(buckets)
+        day = self.current
+        for _ in range(n):
+            bucket = buckets[day % n]
+            if bucket and int(bucket[0][0] / width) <= day:
+                self.current = day
+                return bucket
+            day += 1
+        # Nenhum evento no próximo ano: salta diretamente para o mais cedo
+        bucket = min((b for b in buckets if b), key=lambda b: b[0])
+        self.current = int(bucket[0][0] / width)
+        return bucket
+
+    def pop(self):
+        """
+        Remove e devolve o evento mais cedo.
+        Inputs: Nenhum
+        Returns:
+            tuplo do evento
+        """
+        event = self.locate().pop(0)
+        self.last_time = event[0]
+        self.size -= 1
+        if self.size < len(self.buckets) // 2 and len(self.buckets) > self.MIN_BUCKETS:
+            self.resize(len(self.buckets) // 2)
+        return event
+
+    def peek(self):
+        """
+        Devolve o evento mais cedo sem o remover.
+        Inputs: Nenhum
+        Returns:
+            tuplo do evento
+        """
+        return self.locate()[0]
+
+    def resize(self, num_buckets):
+        """
+        Reconstrói o calendário com outro número de baldes e uma nova largura.
+        Inputs:
+            num_buckets: número de baldes do novo calendário
+        Returns: Nenhum
+        """
+        events = sorted(event for bucket in self.buckets for event in bucket)
+        sample = [event[0] for event in events[: self.SAMPLE_SIZE]]
+        gaps = [b - a for a, b in zip(sample, sample[1:])]
+        if gaps:
+            mean = sum(gaps) / len(gaps)
+            # Ignora grupos de eventos distantes, como na estimativa de Brown
+            close = [g for g in gaps if g <= 2 * mean]
+            if close and sum(close) > 0:
+                self.width = 3 * sum(close) / len(close)
+        self.buckets = [[] for _ in range(num_buckets)]
+        for event in events:
+            self.buckets[int(event[0] / self.width) % num_buckets].append(event)
+        # Ainda podem ser agendados eventos a partir do último evento retirado
+        start = min(events[0][0], self.last_time) if events else self.last_time
+        self.current = int(start / self.width)
+
+
+class LadderRung:
+    """
+    Degrau de uma ladder queue: baldes de igual largura a partir de start.
+    """
+
+    def __init__(self, start, width, events):
+        """
+        Cria um degrau com um balde por evento e distribui os eventos por ele.
+        Inputs:
+            start: início do primeiro balde (no máximo o tempo do evento mais cedo)
+            width: largura dos baldes
+            events: eventos a distribuir
+        Returns: Nenhum
+        """
+        self.start = start
+        self.width = width
+        self.buckets = [[] for _ in events]
+        self.current = 0  # Primeiro balde ainda não passado para baixo na escada
+        if width > 0:
+            buckets, last = self.buckets, len(events) - 1
+            for event in events:
+                index = int((event[0] - start) / width)
+                buckets[
+                    index if 0 <= index < last else (0 if index < 0 else last)
+                ].append(event)
+        else:
+            self.buckets[0].extend(events)
+
+    def threshold(self):
+        """
+        Início do primeiro balde ainda não passado para baixo na escada.
+        Inputs: Nenhum
+        Returns:
+            tempo de início do balde
+        """
+        return self.start + self.current * self.width
+
+    def index(self, time):
+        """
+        Balde de um tempo, calculado exatamente como no preenchimento do degrau.
+        O índice nunca diminui com o tempo, pelo que compará-lo com current
+        indica se um evento pertence a este degrau ou mais abaixo na escada, sem
+        os arredondamentos de um tempo limite recalculado.
+        Inputs:
+            time: tempo do evento
+        Returns:
+            índice do balde (tempos fora do degrau vão para o primeiro ou o último)
+        """
+        if self.width <= 0:
+            return 0
+        index = int((time - self.start) / self.width)
+        last = len(self.buckets) - 1
+        return index if 0 <= index < last else (0 if index < 0 else last)
+
+
+class LadderQueue:
+    """
+    Ladder queue (Tang, Goh e Thng, 2005): os eventos do futuro distante são
+    acrescentados sem ordem a Top; quando o futuro próximo se esgota, Top é
+    espalhado por um degrau de baldes e os baldes são divididos em degraus mais
+    finos até um ser pequeno o suficiente para ser ordenado em Bottom, de onde
+    os eventos são retirados. Os eventos só são ordenados quando estão prestes a
+    ser usados, o que dá tempo O(1) amortizado sem os redimensionamentos do
+    calendar queue.
+    """
+
+    THRESHOLD = 50  # Maior balde ordenado em Bottom em vez de ser dividido
+    MAX_RUNGS = 8  # Número máximo de degraus; baldes maiores são então ordenados
+
+    def __init__(self):
+        """
+        Cria uma escada vazia.
+        Inputs: Nenhum
+        Returns: Nenhum
+        """
+        self.top = []
+        self.top_min = math.inf
+        self.top_max = -math.inf
+        self.top_start = -math.inf  # Eventos depois deste tempo vão para Top
+        self.rungs = []
+        self.bottom = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, event):
+        """
+        Insere um evento em Top, no degrau que cobre o seu tempo ou em Bottom.
+        Inputs:
+            event: tuplo do evento
+        Returns: Nenhum
+        """
+        self.size += 1
+        time = event[0]
+        if time > self.top_start:
+            self.top.append(event)
+            if time < self.top_min:
+                self.top_min = time
+            if time > self.top_max:
+                self.top_max = time
+            return
+        # Um degrau só recebe eventos de baldes que ainda não passou para baixo
+        # (nunca um degrau esgotado); os anteriores descem para o degrau seguinte
+        for rung in self.rungs:
+            index = rung.index(time)
+            if index >= rung.current:
+                rung.buckets[index].append(event)
+                return
+        bisect.insort(self.bottom, event)
+
+    def refill(self):
+        """
+        Passa o balde mais cedo da escada, ordenado, para Bottom.
+        Inputs: Nenhum
+        Returns: Nenhum
+        """
+        while True:
+            if not self.rungs:
+                if not self.top:
+                    raise IndexError("Lista de eventos vazia")
+                width = (self.top_max - self.top_min) / len(self.top)
+                self.rungs.append(LadderRung(self.top_min, width, self.top))
+                self.top_start = self.top_max
+                self.top, self.top_min, self.top_max = [], math.inf, -math.inf
+            rung = self.rungs[-1]
+            buckets = rung.buckets
+            while rung.current < len(buckets) and not buckets[rung.current]:
+                rung.current += 1
+            if rung.current == len(buckets):
+                self.rungs.pop()
+                continue
+            bucket = buckets[rung.current]
+            buckets[rung.current] = []
+            start = rung.threshold()
+            rung.current += 1
+            if (
+                len(bucket) > self.THRESHOLD
+                and len(self.rungs) < self.MAX_RUNGS
+                and rung.width > 0
+            ):
+                width = rung.width / len(bucket)
+                self.rungs.append(LadderRung(start, width, bucket))
+                continue
+            bucket.sort()
+            self.bottom = bucket
+            return
+
+    def pop(self):
+        """
+        Remove e devolve o evento mais cedo.
+        Inputs: Nenhum
+        Returns:
+            tuplo do evento
+        """
+        if not self.bottom:
+            self.refill()
+        self.size -= 1
+        return self.bottom.pop(0)
+
+    def peek(self):
+        """
+        Devolve o evento mais cedo sem o remover.
+        Inputs: Nenhum
+        Returns:
+            tuplo do evento
+        """
+        if not self.bottom:
+            self.refill()
+        return self.bottom[0]
+
+
+# Implementações da lista de eventos futuros selecionáveis pelo nome
+EVENT_LISTS = {
+    "heap": HeapEventList,
+    "calendar": CalendarQueue,
+    "ladder": LadderQueue,
+}
+
+
+def make_event_list(kind="heap"):
+    """
+    Cria uma lista de eventos futuros vazia.
+    Inputs:
+        kind: "heap", "calendar" ou "ladder"
+    Returns:
+        a nova lista de eventos; todas suportam push(), pop(), peek() e len()
+    """
+    if kind not in EVENT_LISTS:
+        raise ValueError(f"Lista de eventos inválida: {kind}")
+    return EVENT_LISTS[kind]()
@@ -0,0 +1,180 @@
+import numpy as np
+
+# Registo de tamanho fixo de cada evento do traço (26 bytes)
+TRACE_DTYPE = np.dtype(
+    [
+        ("t", "<f8"),  # tempo do evento
+        ("code", "u1"),  # código do evento (ARRIVAL, START ou DEPARTURE)
+        ("ctype", "u1"),  # tipo do cliente (1 ou 2)
+        ("srv_a", "<i2"),  # índice do servidor A (-1 se nenhum)
+        ("srv_b", "<i2"),  # índice do servidor B (-1 se nenhum)
+        ("ref", "<f8"),  # tempo de chegada do cliente
+    ]
+)
+TRACE_MAGIC = b"EX1TRACE\x01\x00\x00\x00\x00\x00\x00\x00"  # Cabeçalho de 16 bytes
+
+ARRIVAL = 0  # Chegada de um cliente
+START = 1  # Início de serviço
+DEPARTURE = 2  # Fim de serviço (saída do sistema)
+
+BUFFER_RECORDS = 65536  # Registos acumulados em memória antes de cada escrita
+
+
+class TraceWriter:
+    """
+    Gravador de traços binários: cada evento é um registo de tamanho fixo
+    (TRACE_DTYPE) acumulado numa lista e escrito no ficheiro em blocos, sem
+    formatação de texto por evento.
+    """
+
+    def __init__(self, path, buffer_records=BUFFER_RECORDS):
+        """
+        Cria o ficheiro do traço e escreve o cabeçalho.
+        Inputs:
+            path: ficheiro de destino
+            buffer_records: registos acumulados antes de cada escrita
+        Returns: Nenhum
+        """
+        self.path = path
+        self.buffer_records = buffer_records
+        self.records = []
+        self.file = open(path, "wb")
+        self.file.write(TRACE_MAGIC)
+
+    def record(self, t, code, ctype, srv_a, srv_b, ref):
+        """
+        Acrescenta um evento ao traço.
+        Inputs:
+            t: tempo do evento
+            code: código do evento
+            ctype: tipo do cliente
+            srv_a: índice do servidor A (-1 se nenhum)
+            srv_b: índice do servidor B (-1 se nenhum)
+            ref: tempo de chegada do cliente
+        Returns: Nenhum
+        """
+        self.records.append((t, code, ctype, srv_a, srv_b, ref))
+        if len(self.records) >= self.buffer_records:
+            self.flush()
+
+    def flush(self):
+        """
+        Escreve no ficheiro os registos acumulados.
+        Inputs: Nenhum
+        Returns: Nenhum
+        """
+        if self.records:
+            np.array(self.records, dtype=TRACE_DTYPE).tofile(self.file)
+            self.records = []
+        self.file.flush()
+
+    def close(self):
+        """
+        Escreve os registos pendentes e fecha o ficheiro.
+        Inputs: Nenhum
+        Returns: Nenhum
+        """
+        self.flush()
+        self.file.close()
+
+
+def read_trace(path):
+    """
+    Carrega um traço como array estruturado NumPy mapeado em memória
+    (os dados só são lidos do disco quando usados).
+    Inputs:
+        path: ficheiro do traço
+    Returns:
+        array estruturado com os campos de TRACE_DTYPE, por ordem temporal
+    """
+    with open(path, "rb") as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"{path} não é um traço da simulação")
+    return np.memmap(path, dtype=TRACE_DTYPE, mode="r", offset=len(TRACE_MAGIC))
+
+
+def select(trace, code, ctype=None):
+    """
+    Seleciona os registos de um código de evento e, opcionalmente, de um tipo.
+    Inputs:
+        trace: traço devolvido por read_trace()
+        code: código do evento
+        ctype: tipo do cliente (padrão: ambos)
+    Returns:
+        registos selecionados
+    """
+    mask = trace["code"] == code
+    if ctype is not None:
+        mask &= trace["ctype"] == ctype
+    return trace[mask]
+
+
+def sojourn_times(trace, ctype=None):
+    """
+    Tempos de permanência no sistema (saída - chegada) de cada cliente servido.
+    Inputs:
+        trace: traço devolvido por read_trace()
+        ctype: tipo do cliente (padrão: ambos)
+    Returns:
+        array com um tempo de permanência por cliente, pela ordem das saídas
+    """
+    departures = select(trace, DEPARTURE, ctype)
+    return departures["t"] - departures["ref"]
+
+
+def delays(trace, ctype=None):
+    """
+    Tempos de espera em fila (início de serviço - chegada) de cada cliente.
+    Inputs:
+        trace: traço devolvido por read_trace()
+        ctype: tipo do cliente (padrão: ambos)
+    Returns:
+        array com um atraso por cliente, pela ordem de início de serviço
+    """
+    starts = select(trace, START, ctype)
+    return starts["t"] - starts["ref"]
+
+
+def count_at(trace, times, entering, leaving, ctype=None):
+    """
+    Número de clientes entre dois eventos (por exemplo, chegada e início de
+    serviço) em cada instante pedido.
+    Inputs:
+        trace: traço devolvido por read_trace()
+        times: instantes a avaliar
+        entering: código do evento de entrada
+        leaving: código do evento de saída
+        ctype: tipo do cliente (padrão: ambos)
+    Returns:
+        array com o número de clientes em cada instante
+    """
+    times = np.asarray(times, dtype=float)
+    entered = np.searchsorted(select(trace, entering, ctype)["t"], times, "right")
+    left = np.searchsorted(select(trace, leaving, ctype)["t"], times, "right")
+    return entered - left
+
+
+def queue_length(trace, times, ctype=None):
+    """
+    Número de clientes em fila em cada instante pedido.
+    Inputs:
+        trace: traço devolvido por read_trace()
+        times: instantes a avaliar
+        ctype: tipo do cliente (padrão: ambos)
+    Returns:
+        array com o número em fila em cada instante
+    """
+    return count_at(trace, times, ARRIVAL, START, ctype)
+
+
+def number_in_system(trace, times, ctype=None):
+    """
+    Número de clientes no sistema (em fila ou em serviço) em cada instante pedido.
+    Inputs:
+        trace: traço devolvido por read_trace()
+        times: instantes a avaliar
+        ctype: tipo do cliente (padrão: ambos)
+    Returns:
+        array com o número no sistema em cada instante
+    """
+    return count_at(trace, times, ARRIVAL, DEPARTURE, ctype)
@@ -1,8 +1,7 @@
 import argparse
-import random
 import config
-from simulate import simulate
-from simulate_simpy import simulate_simpy
+from event_list import EVENT_LISTS
+from simulate import resume, simulate
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -33,18 +32,77 @@ if __name__ == "__main__":
         help="Usa SimPy para simulação",
         default=config.USE_SIMPY,
     )
+    parser.add_argument(
+        "--steady-state",
+        action="store_true",
+        help="Estima o estado estacionário numa única execução longa (MSER-5 e médias de lotes)",
+        default=config.STEADY_STATE,
+    )
+    parser.add_argument(
+        "--simtime",
+        type=float,
+        help="Tempo total de simulação em minutos (com --resume, o novo horizonte)",
+        default=None,
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=float,
+        help="Grava um checkpoint a cada intervalo de tempo simulado",
+        default=config.CHECKPOINT_EVERY,
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        help=f"Ficheiro dos checkpoints (padrão: {config.CHECKPOINT_PATH})",
+        default=None,
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        help="Continua a simulação gravada neste checkpoint",
+        default=None,
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        help="Grava o traço binário dos eventos neste ficheiro",
+        default=config.TRACE_PATH,
+    )
+    parser.add_argument(
+        "--event-list",
+        type=str,
+        choices=list(EVENT_LISTS),
+        help="Implementação da lista de eventos futuros",
+        default=config.EVENT_LIST,
+    )
     args = parser.parse_args()
+    if args.simpy and (args.checkpoint_every or args.checkpoint or args.resume):
+        parser.error(
+            "As simulações SimPy não podem ser gravadas em checkpoints: "
+            "--checkpoint-every, --checkpoint e --resume não são suportados com --simpy"
+        )
 
-    if args.seed:
-        random.seed(args.seed)
     if args.verbose:
         config.VERBOSE = True
 
     config.NUM_SERVERS_A = args.serversA
     config.NUM_SERVERS_B = args.serversB
     config.USE_SIMPY = args.simpy
+    config.STEADY_STATE = args.steady_state
+    config.CHECKPOINT_EVERY = args.checkpoint_every
+    if args.checkpoint:
+        config.CHECKPOINT_PATH = args.checkpoint
+    config.TRACE_PATH = args.trace
+    config.EVENT_LIST = args.event_list
+    if args.simtime is not None:
+        config.SIM_TIME = args.simtime
+
+    if args.resume:
+        resume(args.resume, until=args.simtime)
+    elif config.USE_SIMPY:
+        # Importado só aqui: o SimPy atrasa o arranque de todas as outras execuções
+        from simulate_simpy import simulate_simpy
 
-    if config.USE_SIMPY:
-        simulate_simpy()
+        simulate_simpy(seed=args.seed)
     else:
-        simulate()
+        simulate(seed=args.seed)
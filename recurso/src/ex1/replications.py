@@ -0,0 +1,354 @@
+import argparse
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+import config
+from simulate import Simulation
+from stats import Statistics, t_critical
+
+CONTROLS = ("interarrival", "service1", "service2")  # Variáveis de controlo disponíveis
+METRICS = ("delay1", "delay2", "queue1", "queue2")  # Métricas controladas por omissão
+BATCH = 32  # Replicações lançadas em cada lote pelo controlo sequencial
+
+
+def parse_config(text):
+    """
+    Converte uma configuração de servidores no formato "2A1B".
+    Inputs:
+        text: texto a converter
+    Returns:
+        tuplo (servidores A, servidores B)
+    """
+    num_A, rest = text.upper().split("A")
+    return int(num_A), int(rest.rstrip("B"))
+
+
+def metric_names(num_A, num_B):
+    """
+    Nomes das métricas recolhidas por observe() para uma configuração de
+    servidores (as chaves de summary() e as variáveis de controlo).
+    Inputs:
+        num_A: número de servidores do tipo A
+        num_B: número de servidores do tipo B
+    Returns:
+        conjunto com os nomes das métricas
+    """
+    stats = Statistics(
+        num_A, num_B, config.STEADY_STATE, config.BIN_WIDTH, config.NUM_BATCHES
+    )
+    return set(stats.summary(1.0)) | {f"control_{name}" for name in CONTROLS}
+
+
+def check_metrics(metrics, num_A, num_B):
+    """
+    Verifica, antes de qualquer replicação, que as métricas pedidas existem.
+    Inputs:
+        metrics: nomes das métricas
+        num_A: número de servidores do tipo A
+        num_B: número de servidores do tipo B
+    Returns: Nenhum
+    """
+    unknown = set(metrics) - metric_names(num_A, num_B)
+    if unknown:
+        raise ValueError(f"Métricas inválidas: {', '.join(sorted(unknown))}")
+
+
+def observe(num_A, num_B, seed, antithetic=False, sim_time=None):
+    """
+    Executa uma simulação e recolhe as métricas e as variáveis de controlo.
+    Inputs:
+        num_A: número de servidores do tipo A
+        num_B: número de servidores do tipo B
+        seed: semente dos geradores aleatórios
+        antithetic: usa os números aleatórios antitéticos
+        sim_time: tempo de simulação (padrão: config.SIM_TIME)
+    Returns:
+        dicionário com as métricas de summary() e as chaves control_<nome>
+    """
+    sim = Simulation(
+        num_servers_A=num_A,
+        num_servers_B=num_B,
+        sim_time=sim_time,
+        seed=seed,
+        verbose=False,
+        antithetic=antithetic,
+    )
+    stats = sim.run(print_stats=False)
+    row = stats.summary(sim.sim_time)
+    for name, value in sim.controls().items():
+        row[f"control_{name}"] = value
+    return row
+
+
+def run_config(num_A, num_B, seeds, antithetic=False, sim_time=None):
+    """
+    Executa uma replicação por semente para uma configuração de servidores.
+    Com antithetic, cada replicação é a média de um par de execuções (normal e
+    antitética) com a mesma semente.
+    Inputs:
+        num_A: número de servidores do tipo A
+        num_B: número de servidores do tipo B
+        seeds: sementes das replicações
+        antithetic: usa pares de variáveis antitéticas
+        sim_time: tempo de simulação (padrão: config.SIM_TIME)
+    Returns:
+        lista de dicionários, um por replicação
+    """
+    rows = []
+    for seed in seeds:
+        row = observe(num_A, num_B, seed, False, sim_time)
+        if antithetic:
+            anti = observe(num_A, num_B, seed, True, sim_time)
+            row = {key: (row[key] + anti[key]) / 2 for key in row}
+        rows.append(row)
+    return rows
+
+
+def estimate(values, controls=None, confidence=0.95):
+    """
+    Estima a média de uma série de replicações e a semi-amplitude do intervalo
+    de confiança, opcionalmente corrigida por uma variável de controlo de média nula:
+    Y - c X, com c = cov(Y, X) / var(X).
+    Inputs:
+        values: observações Y, uma por replicação
+        controls: variável de controlo X de cada replicação (opcional)
+        confidence: nível de confiança do intervalo
+    Returns:
+        tuplo (média, semi-amplitude do intervalo de confiança)
+    """
+    n = len(values)
+    df = n - 1
+    if controls is not None and n > 2 and statistics.variance(controls) > 0:
+        c = statistics.covariance(values, controls) / statistics.variance(controls)
+        values = [y - c * x for y, x in zip(values, controls)]
+        df = n - 2
+    mean = statistics.fmean(values)
+    if n < 2:
+        return mean, 0.0
+    return mean, t_critical(df, confidence) * statistics.stdev(values) / math.sqrt(n)
+
+
+def compare(
+    configs,
+    n,
+    metric="delay1",
+    seed=0,
+    crn=True,
+    antithetic=False,
+    control=None,
+    confidence=0.95,
+    sim_time=None,
+):
+    """
+    Compara configurações de servidores numa métrica. Com números aleatórios
+    comuns (crn) todas as configurações usam as mesmas sementes, pelo que as
+    diferenças em relação à primeira configuração são estimadas com replicações
+    emparelhadas; sem crn cada configuração usa sementes diferentes.
+    Inputs:
+        configs: lista de configurações (servidores A, servidores B)
+        n: número de replicações por configuração
+        metric: métrica de summary() a comparar
+        seed: primeira semente
+        crn: usa números aleatórios comuns entre configurações
+        antithetic: usa pares de variáveis antitéticas em cada replicação
+        control: variável de controlo a usar (um de CONTROLS) ou None
+        confidence: nível de confiança dos intervalos
+        sim_time: tempo de simulação (padrão: config.SIM_TIME)
+    Returns:
+        lista de dicionários com a configuração, a média e a semi-amplitude da
+        métrica e da diferença em relação à primeira configuração
+    """
+    for num_A, num_B in configs:
+        check_metrics([metric], num_A, num_B)
+    results = []
+    base = None
+    for i, (num_A, num_B) in enumerate(configs):
+        first = seed if crn else seed + i * n
+        rows = run_config(num_A, num_B, range(first, first + n), antithetic, sim_time)
+        values = [row[metric] for row in rows]
+        controls = [row[f"control_{control}"] for row in rows] if control else None
+        mean, half_width = estimate(values, controls, confidence)
+        result = {
+            "config": f"{num_A}A{num_B}B",
+            "mean": mean,
+            "half_width": half_width,
+        }
+        if base is None:
+            base = (values, controls)
+        else:
+            diffs = [y - b for y, b in zip(values, base[0])]
+            diff_controls = (
+                [(x + b) / 2 for x, b in zip(controls, base[1])] if control else None
+            )
+            result["diff"], result["diff_half_width"] = estimate(
+                diffs, diff_controls, confidence
+            )
+        results.append(result)
+    return results
+
+
+def sequential(
+    num_A,
+    num_B,
+    metrics=METRICS,
+    target=0.05,
+    seed=0,
+    batch=BATCH,
+    min_replications=10,
+    max_replications=10000,
+    workers=None,
+    confidence=0.95,
+    sim_time=None,
+):
+    """
+    Lança replicações em lotes paralelos até que todas as métricas pedidas atinjam
+    a precisão relativa desejada: semi-amplitude do intervalo de confiança menor
+    ou igual a target vezes o valor absoluto da média. As sementes são
+    seed, seed + 1, ..., pelo que o resultado não depende do número de processos.
+    Inputs:
+        num_A: número de servidores do tipo A
+        num_B: número de servidores do tipo B
+        metrics: métricas de summary() a controlar
+        target: semi-amplitude relativa desejada
+        seed: primeira semente
+        batch: replicações por lote
+        min_replications: replicações antes da primeira verificação
+        max_replications: limite máximo de replicações
+        workers: número de processos (padrão: todos os núcleos)
+        confidence: nível de confiança dos intervalos
+        sim_time: tempo de simulação (padrão: config.SIM_TIME)
+    Returns:
+        tuplo (lista de replicações, {métrica: (média, semi-amplitude)})
+    """
+    check_metrics(metrics, num_A, num_B)
+    if max_replications < 1:
+        raise ValueError("max_replications tem de ser pelo menos 1")
+    workers = workers or os.cpu_count() or 1
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        n = min(max(min_replications, batch), max_replications)
+        while n > 0:
+            seeds = range(seed + len(rows), seed + len(rows) + n)
+            rows.extend(
+                executor.map(
+                    observe,
+                    [num_A] * n,
+                    [num_B] * n,
+                    seeds,
+                    [False] * n,
+                    [sim_time] * n,
+                    chunksize=max(1, n // (workers * 4)),
+                )
+            )
+            result = {
+                m: estimate([row[m] for row in rows], confidence=confidence)
+                for m in metrics
+            }
+            if all(hw <= target * abs(mean) for mean, hw in result.values()):
+                break
+            n = min(batch, max_replications - len(rows))
+    return rows, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Comparação de configurações de servidores com redução de variância"
+    )
+    parser.add_argument(
+        "--configs",
+        nargs="+",
+        default=["2A1B", "3A1B", "2A2B"],
+        help="Configurações a comparar (a primeira é a referência)",
+    )
+    parser.add_argument(
+        "--replications", type=int, default=100, help="Replicações por configuração"
+    )
+    parser.add_argument(
+        "--metric", type=str, default="delay1", help="Métrica a comparar"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Primeira semente")
+    parser.add_argument(
+        "--no-crn",
+        action="store_true",
+        help="Usa sementes diferentes em cada configuração",
+    )
+    parser.add_argument(
+        "--antithetic", action="store_true", help="Usa pares de variáveis antitéticas"
+    )
+    parser.add_argument(
+        "--control", choices=CONTROLS, default=None, help="Variável de controlo"
+    )
+    parser.add_argument(
+        "--confidence", type=float, default=0.95, help="Nível de confiança"
+    )
+    parser.add_argument(
+        "--simtime", type=float, default=None, help="Tempo de cada simulação"
+    )
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=None,
+        help="Replica cada configuração em lotes até a semi-amplitude relativa de "
+        "todas as métricas ser no máximo este valor (--replications passa a ser o limite)",
+    )
+    parser.add_argument(
+        "--metrics",
+        nargs="+",
+        default=list(METRICS),
+        help="Métricas controladas com --target",
+    )
+    parser.add_argument("--batch", type=int, default=BATCH, help="Replicações por lote")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Processos (padrão: todos os núcleos)"
+    )
+    args = parser.parse_args()
+    if args.replications < 1:
+        parser.error("--replications tem de ser pelo menos 1")
+    if args.batch < 1:
+        parser.error("--batch tem de ser pelo menos 1")
+    configs = [parse_config(c) for c in args.configs]
+    metrics = args.metrics if args.target is not None else [args.metric]
+    try:
+        for num_A, num_B in configs:
+            check_metrics(metrics, num_A, num_B)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.target is not None:
+        for num_A, num_B in configs:
+            rows, result = sequential(
+                num_A,
+                num_B,
+                args.metrics,
+                args.target,
+                args.seed,
+                args.batch,
+                max_replications=args.replications,
+                workers=args.workers,
+                confidence=args.confidence,
+                sim_time=args.simtime,
+            )
+            print(f"{num_A}A{num_B}B: {len(rows)} replicações")
+            for metric, (mean, half_width) in result.items():
+                print(f"{metric:>22}: {mean:.4f} ± {half_width:.4f}")
+    else:
+        results = compare(
+            configs,
+            args.replications,
+            args.metric,
+            args.seed,
+            not args.no_crn,
+            args.antithetic,
+            args.control,
+            args.confidence,
+            args.simtime,
+        )
+        print(f"{'config':>8} {args.metric:>22} {'diferença':>22}")
+        for r in results:
+            diff = (
+                f"{r['diff']:.4f} ± {r['diff_half_width']:.4f}" if "diff" in r else "-"
+            )
+            print(
+                f"{r['config']:>8} {r['mean']:>13.4f} ± {r['half_width']:.4f} {diff:>22}"
+            )
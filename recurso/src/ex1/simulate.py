@@ -1,299 +1,628 @@
 from collections import deque
-import heapq
-import random
+import math
+import os
+import pickle
+import zlib
 import config
-import stats
+from event_list import make_event_list
+from event_trace import ARRIVAL, DEPARTURE, START, TraceWriter
+from stats import Statistics
+from variates import spawn_buffers
 
+CHECKPOINT_MAGIC = b"EX1CKPT2"  # Identificador do formato dos ficheiros de checkpoint
 
-def init_state():
-    """
-    Inicializa o estado da simulação.
-    Inputs: Nenhum
-    Returns: Nenhum
-    """
-    global servers_A, servers_B, server_A_type, server_B_type
-    global queue_type1, queue_type2
-    global clock, last_event_time
-    global event_list
-
-    servers_A = [False for _ in range(config.NUM_SERVERS_A)]
-    servers_B = [False for _ in range(config.NUM_SERVERS_B)]
-
-    server_A_type = [None for _ in range(config.NUM_SERVERS_A)]
-    server_B_type = [None for _ in range(config.NUM_SERVERS_B)]
-
-    stats.server_A_time_type1 = [0.0 for _ in range(config.NUM_SERVERS_A)]
-    stats.server_A_time_type2 = [0.0 for _ in range(config.NUM_SERVERS_A)]
-    stats.server_B_time_type1 = [0.0 for _ in range(config.NUM_SERVERS_B)]
-    stats.server_B_time_type2 = [0.0 for _ in range(config.NUM_SERVERS_B)]
-
-    queue_type1 = deque()
-    queue_type2 = deque()
+# Códigos dos tipos de evento (índices de Simulation.EVENT_HANDLERS)
+EVENT_ARRIVAL = 0
+EVENT_DEPARTURE_TYPE1 = 1
+EVENT_DEPARTURE_TYPE2 = 2
+EVENT_NAMES = ("arrival", "departure_type1", "departure_type2")
 
-    clock = 0.0
-    last_event_time = 0.0
 
-    event_list = []
-
-
-def schedule_event(time, event_type, data=None):
+class Simulation:
     """
-    Adiciona um novo evento à lista de eventos futuros por ordem.
-    Inputs:
-        time: tempo em que o evento ocorrerá
-        event_type: tipo do evento
-        data: dados associados ao evento
-    Returns: Nenhum
-    """
-    heapq.heappush(event_list, (time, event_type, data))
-
-
-def exponential(mean):
-    """
-    Gera uma variável aleatória exponencial com a média fornecida.
-    Inputs:
-        mean: média da distribuição exponencial
-    Returns:
-        float: valor gerado da distribuição exponencial
-    """
-    return random.expovariate(1.0 / mean)
-
-
-def uniform(a, b):
-    """
-    Gera uma variável aleatória uniforme entre a e b.
-    Inputs:
-        a: limite inferior
-        b: limite superior
-    Returns:
-        float: valor gerado da distribuição uniforme
-    """
-    return random.uniform(a, b)
-
-
-def find_free_server(servers):
-    """
-    Encontra o índice de um servidor livre na lista dada, ou None se nenhum estiver livre.
-    Inputs:
-        servers: lista indicando se cada servidor está ocupado
-    Returns:
-        índice do servidor livre ou None se nenhum disponível
-    """
-    for i, busy in enumerate(servers):
-        if not busy:
-            return i
-    return None
-
-
-def serve_type1(idx, server_type):
-    """
-    Atende um cliente do tipo 1 no servidor especificado e agenda a sua saída.
-    Inputs:
-        idx: índice do servidor
-        server_type: tipo do servidor ("A" ou "B")
-    Returns:
-        tempo de serviço gerado para o atendimento
-    """
-    service_time = exponential(config.MEAN_SERVICE_TYPE1)
-    if server_type == "A":
-        servers_A[idx] = True
-        server_A_type[idx] = "type1"
-        stats.server_A_time_type1[idx] += service_time
-    else:
-        servers_B[idx] = True
-        server_B_type[idx] = "type1"
-        stats.server_B_time_type1[idx] += service_time
-    schedule_event(clock + service_time, "departure_type1", (server_type, idx))
-    return service_time
-
-
-def serve_type2(idx_A, idx_B):
-    """
-    Atende um cliente do tipo 2 utilizando servidores A e B e agenda a sua saída.
-    Inputs:
-        idx_A: índice do servidor A
-        idx_B: índice do servidor B
-    Returns:
-        tempo de serviço gerado para o atendimento
-    """
-    service_time = uniform(config.UNIF_SERVICE_TYPE2_MIN, config.UNIF_SERVICE_TYPE2_MAX)
-    servers_A[idx_A] = True
-    servers_B[idx_B] = True
-    server_A_type[idx_A] = "type2"
-    server_B_type[idx_B] = "type2"
-    stats.server_A_time_type2[idx_A] += service_time
-    stats.server_B_time_type2[idx_B] += service_time
-    schedule_event(clock + service_time, "departure_type2", (idx_A, idx_B))
-    return service_time
-
-
-def try_serve_type1_from_queue(idx, server_type):
-    """
-    Tenta atender um cliente do tipo 1 da fila, se houver algum à espera.
-    Inputs:
-        idx: índice do servidor disponível
-        server_type: tipo do servidor ("A" ou "B")
-    Returns:
-        True se um cliente foi atendido, False caso contrário
+    Simulação por eventos discretos do sistema com servidores A e B.
+    Todo o estado (servidores, filas, relógio, lista de eventos, geradores aleatórios
+    e estatísticas) pertence à instância, pelo que várias simulações podem correr
+    em paralelo no mesmo processo.
+
+    Cada finalidade tem o seu próprio fornecedor de variáveis pré-geradas em blocos
+    (tempos entre chegadas, tipo de cliente, serviço tipo 1 e serviço tipo 2) e os
+    atributos de cada cliente (tipo e tempo de serviço) são gerados à chegada. Assim, com a mesma semente,
+    o n-ésimo cliente é igual em qualquer configuração de servidores (números
+    aleatórios comuns).
     """
-    if queue_type1:
-        arrival_time = queue_type1.popleft()
-        delay = clock - arrival_time
-        stats.delays_type1.append(delay)
-        service_time = serve_type1(idx, server_type)
-        stats.waiting_times_type1.append(delay + service_time)
-        return True
-    return False
 
-
-def try_serve_type2_from_queue(idx_A, idx_B):
-    """
-    Tenta atender um cliente do tipo 2 da fila, se houver algum à espera.
-    Inputs:
-        idx_A: índice do servidor A disponível
-        idx_B: índice do servidor B disponível
-    Returns:
-        True se um cliente foi atendido, False caso contrário
-    """
-    if queue_type2:
-        arrival_time = queue_type2.popleft()
-        delay = clock - arrival_time
-        stats.delays_type2.append(delay)
-        service_time = serve_type2(idx_A, idx_B)
-        stats.waiting_times_type2.append(delay + service_time)
-        return True
-    return False
-
-
-def arrival():
-    """
-    Trata eventos de chegada: atribui clientes a servidores ou filas conforme apropriado.
-    Inputs: Nenhum
-    Returns: Nenhum
-    """
-    global clock
-
-    interarrival = exponential(config.MEAN_INTERARRIVAL)
-    schedule_event(clock + interarrival, "arrival")
-
-    if random.random() < config.P_TYPE1:
-        idx_A = find_free_server(servers_A)
-        if idx_A is not None:
-            serve_type1(idx_A, "A")
+    # Fornecedores por finalidade e tipo de variável que geram
+    STREAMS = {
+        "interarrival": "exponential",
+        "type": "uniform",
+        "service1": "exponential",
+        "service2": "uniform",
+    }
+
+    def __init__(
+        self,
+        num_servers_A=None,
+        num_servers_B=None,
+        sim_time=None,
+        seed=None,
+        verbose=None,
+        antithetic=False,
+        steady_state=None,
+        trace=None,
+        event_list=None,
+    ):
+        """
+        Cria uma simulação. Os parâmetros omitidos são lidos de config.
+        Inputs:
+            num_servers_A: número de servidores do tipo A
+            num_servers_B: número de servidores do tipo B
+            sim_time: tempo total de simulação
+            seed: semente dos geradores aleatórios da simulação
+            verbose: ativa o registo detalhado de eventos
+            antithetic: usa as variáveis antitéticas (1 - u) dos números aleatórios
+            steady_state: recolhe as séries para estimativas de estado estacionário
+            trace: ficheiro onde gravar o traço binário dos eventos (padrão:
+                config.TRACE_PATH; None desativa)
+            event_list: lista de eventos futuros ("heap", "calendar" ou "ladder")
+        Returns: Nenhum
+        """
+        self.num_servers_A = (
+            config.NUM_SERVERS_A if num_servers_A is None else num_servers_A
+        )
+        self.num_servers_B = (
+            config.NUM_SERVERS_B if num_servers_B is None else num_servers_B
+        )
+        self.sim_time = config.SIM_TIME if sim_time is None else sim_time
+        self.verbose = config.VERBOSE if verbose is None else verbose
+        self.steady_state = (
+            config.STEADY_STATE if steady_state is None else steady_state
+        )
+
+        self.mean_interarrival = config.MEAN_INTERARRIVAL
+        self.mean_service_type1 = config.MEAN_SERVICE_TYPE1
+        self.unif_service_type2_min = config.UNIF_SERVICE_TYPE2_MIN
+        self.unif_service_type2_max = config.UNIF_SERVICE_TYPE2_MAX
+        self.p_type1 = config.P_TYPE1
+
+        self.antithetic = antithetic
+        self.variates = spawn_buffers(seed, self.STREAMS, antithetic)
+        self.event_list_kind = config.EVENT_LIST if event_list is None else event_list
+        trace = config.TRACE_PATH if trace is None else trace
+        self.trace = TraceWriter(trace) if trace else None
+        self.init_state()
+
+    def __getstate__(self):
+        """
+        Estado serializado pelos checkpoints: tudo exceto o gravador do traço,
+        que tem um ficheiro aberto.
+        Inputs: Nenhum
+        Returns:
+            dicionário com os atributos da simulação
+        """
+        state = self.__dict__.copy()
+        state["trace"] = None
+        return state
+
+    def init_state(self):
+        """
+        Inicializa o estado da simulação e as estatísticas.
+        Inputs: Nenhum
+        Returns: Nenhum
+        """
+        # Servidores livres como bitmasks (bit i ligado = servidor i livre)
+        self.free_A = (1 << self.num_servers_A) - 1
+        self.free_B = (1 << self.num_servers_B) - 1
+        # Tempo de chegada do cliente em serviço em cada servidor
+        self.arrival_A = [0.0] * self.num_servers_A
+        self.arrival_B = [0.0] * self.num_servers_B
+
+        # Número de clientes de cada tipo em serviço (tipo 2 ocupa um A e um B)
+        self.in_service_type1 = 0
+        self.in_service_type2 = 0
+
+        self.stats = Statistics(
+            self.num_servers_A,
+            self.num_servers_B,
+            self.steady_state,
+            config.BIN_WIDTH,
+            config.NUM_BATCHES,
+        )
+
+        # Filas de clientes em espera: (tempo de chegada, tempo de serviço)
+        self.queue_type1 = deque()
+        self.queue_type2 = deque()
+
+        self.clock = 0.0
+        self.last_event_time = 0.0
+
+        # Cada evento é um tuplo (tempo, sequência, código, servidor A, servidor B):
+        # a sequência desempata eventos simultâneos por ordem de agendamento, pelo
+        # que a heap nunca compara os restantes campos
+        self.event_list = make_event_list(self.event_list_kind)
+        self.event_seq = 0
+        self.num_events = 0
+        self.started = False
+
+        # Somas das variáveis geradas, usadas como variáveis de controlo
+        self.variate_sums = {"interarrival": 0.0, "service1": 0.0, "service2": 0.0}
+        self.variate_counts = {"interarrival": 0, "service1": 0, "service2": 0}
+
+    def schedule_event(self, time, code, idx_A=-1, idx_B=-1):
+        """
+        Adiciona um novo evento à lista de eventos futuros por ordem.
+        Inputs:
+            time: tempo em que o evento ocorrerá
+            code: código do tipo do evento (EVENT_*)
+            idx_A: índice do servidor A envolvido (-1 se nenhum)
+            idx_B: índice do servidor B envolvido (-1 se nenhum)
+        Returns: Nenhum
+        """
+        self.event_seq += 1
+        self.event_list.push((time, self.event_seq, code, idx_A, idx_B))
+
+    def random(self, stream):
+        """
+        Devolve um número aleatório uniforme em (0, 1) do fornecedor indicado.
+        Em modo antitético é 1 - u, pelo que uma execução antitética usa
+        exatamente os complementos dos números da execução normal com a mesma semente.
+        Inputs:
+            stream: nome de um fornecedor uniforme de STREAMS
+        Returns:
+            float: número aleatório em (0, 1)
+        """
+        return self.variates[stream].next()
+
+    def exponential(self, mean, stream):
+        """
+        Gera uma variável aleatória exponencial com a média fornecida (inversão da
+        função de distribuição, feita por blocos no fornecedor).
+        Inputs:
+            mean: média da distribuição exponencial
+            stream: nome de um fornecedor exponencial de STREAMS
+        Returns:
+            float: valor gerado da distribuição exponencial
+        """
+        value = mean * self.variates[stream].next()
+        self.variate_sums[stream] += value
+        self.variate_counts[stream] += 1
+        return value
+
+    def uniform(self, a, b, stream):
+        """
+        Gera uma variável aleatória uniforme entre a e b (inversão da função de
+        distribuição).
+        Inputs:
+            a: limite inferior
+            b: limite superior
+            stream: nome de um fornecedor uniforme de STREAMS
+        Returns:
+            float: valor gerado da distribuição uniforme
+        """
+        value = a + (b - a) * self.variates[stream].next()
+        self.variate_sums[stream] += value
+        self.variate_counts[stream] += 1
+        return value
+
+    def controls(self):
+        """
+        Calcula as variáveis de controlo da execução: a diferença entre a média
+        amostral de cada variável gerada e o seu valor esperado, conhecido à partida.
+        Inputs: Nenhum
+        Returns:
+            dicionário {finalidade: média amostral - valor esperado}
+        """
+        expected = {
+            "interarrival": self.mean_interarrival,
+            "service1": self.mean_service_type1,
+            "service2": (self.unif_service_type2_min + self.unif_service_type2_max) / 2,
+        }
+        return {
+            name: (
+                self.variate_sums[name] / self.variate_counts[name] - expected[name]
+                if self.variate_counts[name]
+                else 0.0
+            )
+            for name in expected
+        }
+
+    @staticmethod
+    def find_free_server(free):
+        """
+        Encontra o menor índice de um servidor livre, ou None se nenhum estiver livre.
+        Inputs:
+            free: bitmask dos servidores livres
+        Returns:
+            índice do servidor livre ou None se nenhum disponível
+        """
+        if not free:
+            return None
+        return (free & -free).bit_length() - 1
+
+    def serve_type1(self, idx, server_type, service_time, arrival_time):
+        """
+        Atende um cliente do tipo 1 no servidor especificado e agenda a sua saída.
+        Inputs:
+            idx: índice do servidor
+            server_type: tipo do servidor ("A" ou "B")
+            service_time: tempo de serviço do cliente
+            arrival_time: tempo de chegada do cliente
+        Returns: Nenhum
+        """
+        self.in_service_type1 += 1
+        if server_type == "A":
+            self.free_A &= ~(1 << idx)
+            self.arrival_A[idx] = arrival_time
+            self.stats.server_A_time_type1[idx] += service_time
+            idx_A, idx_B = idx, -1
         else:
-            idx_B = find_free_server(servers_B)
-            if idx_B is not None:
-                serve_type1(idx_B, "B")
+            self.free_B &= ~(1 << idx)
+            self.arrival_B[idx] = arrival_time
+            self.stats.server_B_time_type1[idx] += service_time
+            idx_A, idx_B = -1, idx
+        if self.trace is not None:
+            self.trace.record(self.clock, START, 1, idx_A, idx_B, arrival_time)
+        self.schedule_event(
+            self.clock + service_time, EVENT_DEPARTURE_TYPE1, idx_A, idx_B
+        )
+
+    def serve_type2(self, idx_A, idx_B, service_time, arrival_time):
+        """
+        Atende um cliente do tipo 2 utilizando servidores A e B e agenda a sua saída.
+        Inputs:
+            idx_A: índice do servidor A
+            idx_B: índice do servidor B
+            service_time: tempo de serviço do cliente
+            arrival_time: tempo de chegada do cliente
+        Returns: Nenhum
+        """
+        self.free_A &= ~(1 << idx_A)
+        self.free_B &= ~(1 << idx_B)
+        self.arrival_A[idx_A] = arrival_time
+        self.arrival_B[idx_B] = arrival_time
+        if self.trace is not None:
+            self.trace.record(self.clock, START, 2, idx_A, idx_B, arrival_time)
+        self.in_service_type2 += 1
+        self.stats.server_A_time_type2[idx_A] += service_time
+        self.stats.server_B_time_type2[idx_B] += service_time
+        self.schedule_event(
+            self.clock + service_time, EVENT_DEPARTURE_TYPE2, idx_A, idx_B
+        )
+
+    def try_serve_type1_from_queue(self, idx, server_type):
+        """
+        Tenta atender um cliente do tipo 1 da fila, se houver algum à espera.
+        Inputs:
+            idx: índice do servidor disponível
+            server_type: tipo do servidor ("A" ou "B")
+        Returns:
+            True se um cliente foi atendido, False caso contrário
+        """
+        if self.queue_type1:
+            arrival_time, service_time = self.queue_type1.popleft()
+            delay = self.clock - arrival_time
+            self.stats.delays_type1.add(delay)
+            self.serve_type1(idx, server_type, service_time, arrival_time)
+            self.stats.waiting_times_type1.add(delay + service_time)
+            return True
+        return False
+
+    def try_serve_type2_from_queue(self, idx_A, idx_B):
+        """
+        Tenta atender um cliente do tipo 2 da fila, se houver algum à espera.
+        Inputs:
+            idx_A: índice do servidor A disponível
+            idx_B: índice do servidor B disponível
+        Returns:
+            True se um cliente foi atendido, False caso contrário
+        """
+        if self.queue_type2:
+            arrival_time, service_time = self.queue_type2.popleft()
+            delay = self.clock - arrival_time
+            self.stats.delays_type2.add(delay)
+            self.serve_type2(idx_A, idx_B, service_time, arrival_time)
+            self.stats.waiting_times_type2.add(delay + service_time)
+            return True
+        return False
+
+    def arrival(self, idx_A=-1, idx_B=-1):
+        """
+        Trata eventos de chegada: atribui clientes a servidores ou filas conforme apropriado.
+        Inputs:
+            idx_A, idx_B: campos de servidor do evento (não usados pelas chegadas)
+        Returns: Nenhum
+        """
+        interarrival = self.exponential(self.mean_interarrival, "interarrival")
+        self.schedule_event(self.clock + interarrival, EVENT_ARRIVAL)
+
+        if self.random("type") < self.p_type1:
+            if self.trace is not None:
+                self.trace.record(self.clock, ARRIVAL, 1, -1, -1, self.clock)
+            service_time = self.exponential(self.mean_service_type1, "service1")
+            idx_A = self.find_free_server(self.free_A)
+            if idx_A is not None:
+                self.serve_type1(idx_A, "A", service_time, self.clock)
             else:
-                queue_type1.append(clock)
-    else:
-        idx_A = find_free_server(servers_A)
-        idx_B = find_free_server(servers_B)
-        if idx_A is not None and idx_B is not None:
-            serve_type2(idx_A, idx_B)
+                idx_B = self.find_free_server(self.free_B)
+                if idx_B is not None:
+                    self.serve_type1(idx_B, "B", service_time, self.clock)
+                else:
+                    self.queue_type1.append((self.clock, service_time))
         else:
-            queue_type2.append(clock)
-
-
-def departure_type1(info):
-    """
-    Trata eventos de saída para clientes do tipo 1 e gerencia o atendimento das filas.
-    Inputs:
-        info: tuple contendo tipo do servidor e índice
-    Returns: Nenhum
-    """
-    server_type, server_idx = info
-
-    if server_type == "A":
-        servers_A[server_idx] = False
-        server_A_type[server_idx] = None
-    else:
-        servers_B[server_idx] = False
-        server_B_type[server_idx] = None
-
-    idx_A = server_idx if server_type == "A" else find_free_server(servers_A)
-    idx_B = server_idx if server_type == "B" else find_free_server(servers_B)
-    if (
-        idx_A is not None
-        and idx_B is not None
-        and try_serve_type2_from_queue(idx_A, idx_B)
+            if self.trace is not None:
+                self.trace.record(self.clock, ARRIVAL, 2, -1, -1, self.clock)
+            service_time = self.uniform(
+                self.unif_service_type2_min, self.unif_service_type2_max, "service2"
+            )
+            idx_A = self.find_free_server(self.free_A)
+            idx_B = self.find_free_server(self.free_B)
+            if idx_A is not None and idx_B is not None:
+                self.serve_type2(idx_A, idx_B, service_time, self.clock)
+            else:
+                self.queue_type2.append((self.clock, service_time))
+
+    def departure_type1(self, idx_A, idx_B):
+        """
+        Trata eventos de saída para clientes do tipo 1 e gerencia o atendimento das filas.
+        Inputs:
+            idx_A: índice do servidor A libertado (-1 se foi um servidor B)
+            idx_B: índice do servidor B libertado (-1 se foi um servidor A)
+        Returns: Nenhum
+        """
+        self.in_service_type1 -= 1
+
+        if idx_A >= 0:
+            self.free_A |= 1 << idx_A
+            if self.trace is not None:
+                self.trace.record(
+                    self.clock, DEPARTURE, 1, idx_A, -1, self.arrival_A[idx_A]
+                )
+            idx_B = self.find_free_server(self.free_B)
+        else:
+            self.free_B |= 1 << idx_B
+            if self.trace is not None:
+                self.trace.record(
+                    self.clock, DEPARTURE, 1, -1, idx_B, self.arrival_B[idx_B]
+                )
+            idx_A = self.find_free_server(self.free_A)
+
+        if (
+            idx_A is not None
+            and idx_B is not None
+            and self.try_serve_type2_from_queue(idx_A, idx_B)
+        ):
+            return
+        if idx_A is not None and self.try_serve_type1_from_queue(idx_A, "A"):
+            return
+        if idx_B is not None and self.try_serve_type1_from_queue(idx_B, "B"):
+            return
+
+    def departure_type2(self, server_idx_A, server_idx_B):
+        """
+        Trata eventos de saída para clientes do tipo 2 e gerencia o atendimento das filas.
+        Inputs:
+            server_idx_A: índice do servidor A libertado
+            server_idx_B: índice do servidor B libertado
+        Returns: Nenhum
+        """
+        self.free_A |= 1 << server_idx_A
+        self.free_B |= 1 << server_idx_B
+        self.in_service_type2 -= 1
+        if self.trace is not None:
+            self.trace.record(
+                self.clock,
+                DEPARTURE,
+                2,
+                server_idx_A,
+                server_idx_B,
+                self.arrival_A[server_idx_A],
+            )
+
+        if self.try_serve_type2_from_queue(server_idx_A, server_idx_B):
+            return
+        if self.try_serve_type1_from_queue(server_idx_A, "A"):
+            return
+
+    # Tratamento de cada código de evento, indexado por EVENT_*
+    EVENT_HANDLERS = (arrival, departure_type1, departure_type2)
+
+    def update_stats(self, dt):
+        """
+        Atualiza estatísticas dependentes do tempo com base no tempo desde o último evento.
+        Inputs:
+            dt: intervalo de tempo desde o último evento
+        Returns: Nenhum
+        """
+        self.stats.area_num_in_queue_type1 += len(self.queue_type1) * dt
+        self.stats.area_num_in_queue_type2 += len(self.queue_type2) * dt
+
+        num_in_system_type1 = len(self.queue_type1) + self.in_service_type1
+        num_in_system_type2 = len(self.queue_type2) + self.in_service_type2
+
+        self.stats.area_num_in_system_type1 += num_in_system_type1 * dt
+        self.stats.area_num_in_system_type2 += num_in_system_type2 * dt
+
+        if self.stats.time_bins is not None:
+            self.stats.time_bins.add(
+                self.last_event_time,
+                dt,
+                (
+                    len(self.queue_type1),
+                    len(self.queue_type2),
+                    num_in_system_type1,
+                    num_in_system_type2,
+                ),
+            )
+
+    def process_event(self, time, code, idx_A, idx_B):
+        """
+        Avança o relógio até ao evento, atualiza as estatísticas e trata o evento.
+        Inputs:
+            time: tempo do evento
+            code: código do tipo do evento (EVENT_*)
+            idx_A: índice do servidor A do evento (-1 se nenhum)
+            idx_B: índice do servidor B do evento (-1 se nenhum)
+        Returns: Nenhum
+        """
+        self.clock = time
+        self.num_events += 1
+        if self.verbose:
+            print(
+                f"[{self.clock:.2f}] Evento: {EVENT_NAMES[code]}, "
+                f"servidores: ({idx_A}, {idx_B})"
+            )
+        dt = self.clock - self.last_event_time
+        self.update_stats(dt)
+
+        self.last_event_time = self.clock
+
+        self.EVENT_HANDLERS[code](self, idx_A, idx_B)
+
+    def finish(self, print_stats=True):
+        """
+        Fecha as estatísticas dependentes do tempo no fim do horizonte e gera o relatório.
+        O traço, se existir, é fechado: uma continuação com novo until já não o grava.
+        Inputs:
+            print_stats: indica se as estatísticas devem ser impressas
+        Returns:
+            estatísticas (Statistics) recolhidas durante a simulação
+        """
+        self.clock = self.sim_time
+        self.update_stats(self.clock - self.last_event_time)
+        self.last_event_time = self.clock
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+        self.stats.report(self.sim_time, print_stats)
+        return self.stats
+
+    def advance(self, until):
+        """
+        Trata todos os eventos com tempo menor ou igual a until.
+        Inputs:
+            until: tempo simulado até onde avançar
+        Returns: Nenhum
+        """
+        event_list = self.event_list
+        while event_list and event_list.peek()[0] <= until:
+            time, _, code, idx_A, idx_B = event_list.pop()
+            self.process_event(time, code, idx_A, idx_B)
+
+    def run(
+        self, print_stats=True, until=None, checkpoint_every=None, checkpoint_path=None
     ):
-        return
-    if idx_A is not None and try_serve_type1_from_queue(idx_A, "A"):
-        return
-    if idx_B is not None and try_serve_type1_from_queue(idx_B, "B"):
-        return
-
-
-def departure_type2(indices):
-    """
-    Trata eventos de saída para clientes do tipo 2 e gerencia o atendimento das filas.
-    Inputs:
-        indices: tupla contendo índices dos servidores A e B
-    Returns: Nenhum
-    """
-    server_idx_A, server_idx_B = indices
-
-    servers_A[server_idx_A] = False
-    server_A_type[server_idx_A] = None
-    servers_B[server_idx_B] = False
-    server_B_type[server_idx_B] = None
-
-    if try_serve_type2_from_queue(server_idx_A, server_idx_B):
-        return
-    if try_serve_type1_from_queue(server_idx_A, "A"):
-        return
-
-
-def update_stats(dt):
+        """
+        Executa a simulação até que o tempo especificado seja alcançado.
+        Eventos posteriores a sim_time ficam na lista de eventos por tratar, pelo que
+        uma simulação terminada (ou restaurada de um checkpoint) pode continuar com
+        um novo until; as estatísticas cobrem sempre o intervalo [0, sim_time].
+        Inputs:
+            print_stats: indica se as estatísticas devem ser impressas ao final (padrão: True)
+            until: novo horizonte da simulação (padrão: sim_time)
+            checkpoint_every: intervalo de tempo simulado entre checkpoints (padrão: nenhum)
+            checkpoint_path: ficheiro onde cada checkpoint é gravado
+        Returns:
+            estatísticas (Statistics) recolhidas durante a simulação
+        """
+        if until is not None:
+            self.sim_time = until
+        if not self.started:
+            self.started = True
+            self.schedule_event(0.0, EVENT_ARRIVAL)
+
+        if checkpoint_every:
+            t = (math.floor(self.clock / checkpoint_every) + 1) * checkpoint_every
+            while t < self.sim_time:
+                self.advance(t)
+                self.save(checkpoint_path)
+                t += checkpoint_every
+        self.advance(self.sim_time)
+
+        return self.finish(print_stats)
+
+    def save(self, path):
+        """
+        Grava o estado completo da simulação (lista de eventos, filas, servidores,
+        relógio, estatísticas e estado dos geradores aleatórios) num ficheiro
+        binário comprimido. A escrita é atómica: um checkpoint anterior só é
+        substituído quando o novo estiver completo.
+        Inputs:
+            path: ficheiro de destino
+        Returns: Nenhum
+        """
+        # O traço não faz parte do checkpoint, mas fica no disco até este instante
+        if self.trace is not None:
+            self.trace.flush()
+        data = zlib.compress(pickle.dumps(self, pickle.HIGHEST_PROTOCOL))
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(CHECKPOINT_MAGIC)
+            f.write(data)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path):
+        """
+        Restaura uma simulação gravada com save().
+        Inputs:
+            path: ficheiro do checkpoint
+        Returns:
+            simulação (Simulation) no estado em que foi gravada
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(CHECKPOINT_MAGIC):
+            raise ValueError(f"{path} não é um checkpoint da simulação")
+        return pickle.loads(zlib.decompress(data[len(CHECKPOINT_MAGIC) :]))
+
+    def fork(self, seed=None):
+        """
+        Cria uma cópia independente da simulação no estado atual, por exemplo para
+        ramos "e se" a partir de um sistema já aquecido. Os parâmetros da cópia
+        (mean_interarrival, p_type1, ...) podem ser alterados antes de continuar.
+        Inputs:
+            seed: se indicada, a cópia usa novos geradores com esta semente; caso
+                contrário continua a sequência aleatória do original (números
+                aleatórios comuns entre ramos)
+        Returns:
+            nova simulação (Simulation)
+        """
+        branch = pickle.loads(pickle.dumps(self, pickle.HIGHEST_PROTOCOL))
+        if seed is not None:
+            branch.variates = spawn_buffers(seed, self.STREAMS, self.antithetic)
+        return branch
+
+
+def simulate(print_stats=True, seed=None):
     """
-    Atualiza estatísticas dependentes do tempo com base no tempo desde o último evento.
+    Executa uma simulação com os parâmetros definidos em config, gravando
+    checkpoints se config.CHECKPOINT_EVERY estiver definido.
     Inputs:
-        dt: intervalo de tempo desde o último evento
-    Returns: Nenhum
+        print_stats: indica se as estatísticas devem ser impressas ao final (padrão: True)
+        seed: semente do gerador aleatório (padrão: None)
+    Returns:
+        estatísticas (Statistics) recolhidas durante a simulação
     """
-    stats.area_num_in_queue_type1 += len(queue_type1) * dt
-    stats.area_num_in_queue_type2 += len(queue_type2) * dt
-
-    num_in_service_type1 = sum(1 for t in server_A_type if t == "type1") + sum(
-        1 for t in server_B_type if t == "type1"
+    return Simulation(seed=seed).run(
+        print_stats,
+        checkpoint_every=config.CHECKPOINT_EVERY,
+        checkpoint_path=config.CHECKPOINT_PATH,
     )
-    num_in_system_type1 = len(queue_type1) + num_in_service_type1
-    num_in_service_type2 = sum(1 for t in server_A_type if t == "type2")
-    num_in_system_type2 = len(queue_type2) + num_in_service_type2
-
-    stats.area_num_in_system_type1 += num_in_system_type1 * dt
-    stats.area_num_in_system_type2 += num_in_system_type2 * dt
 
 
-def simulate(print_stats=True):
+def resume(path, print_stats=True, until=None):
     """
-    Executa a simulação até que o tempo especificado seja alcançado.
+    Restaura uma simulação de um checkpoint e continua-a até ao fim.
     Inputs:
+        path: ficheiro do checkpoint
         print_stats: indica se as estatísticas devem ser impressas ao final (padrão: True)
-    Returns: Nenhum
+        until: novo horizonte da simulação (padrão: o horizonte gravado)
+    Returns:
+        estatísticas (Statistics) recolhidas durante a simulação
     """
-    init_state()
-
-    global clock, last_event_time
-    global stats
-
-    schedule_event(0.0, "arrival")
-
-    while event_list and clock < config.SIM_TIME:
-        clock, event_type, data = heapq.heappop(event_list)
-        if config.VERBOSE:
-            print(f"[{clock:.2f}] Evento: {event_type}, dados: {data}")
-        dt = clock - last_event_time
-        update_stats(dt)
-
-        last_event_time = clock
-
-        if event_type == "arrival":
-            arrival()
-        elif event_type == "departure_type1":
-            departure_type1(data)
-        elif event_type == "departure_type2":
-            departure_type2(data)
-
-    stats.report(print_stats)
+    return Simulation.load(path).run(
+        print_stats,
+        until,
+        checkpoint_every=config.CHECKPOINT_EVERY,
+        checkpoint_path=config.CHECKPOINT_PATH,
+    )
@@ -1,15 +1,5 @@
-delays_type1 = []
-delays_type2 = []
-waiting_times_type1 = []
-waiting_times_type2 = []
-area_num_in_queue_type1 = 0.0
-area_num_in_queue_type2 = 0.0
-area_num_in_system_type1 = 0.0
-area_num_in_system_type2 = 0.0
-server_A_time_type1 = []
-server_A_time_type2 = []
-server_B_time_type1 = []
-server_B_time_type2 = []
+import math
+import statistics
 
 
 def format_time(minutes):
@@ -26,67 +16,491 @@ def format_time(minutes):
     return f"{h}h {m}m {s}s"
 
 
-def report(print_stats=True):
+def t_critical(df, confidence=0.95):
     """
-    Imprime um relatório com estatísticas da simulação.
+    Valor crítico bilateral da distribuição t de Student.
+    Exato para 1 e 2 graus de liberdade, expansão de Cornish-Fisher nos restantes.
     Inputs:
-        print_stats: se True, imprime os resultados no terminal
-    Returns: Nenhum
-    """
-    import config
-
-    global area_num_in_queue_type1, area_num_in_queue_type2
-    global delays_type1, delays_type2
-    global waiting_times_type1, waiting_times_type2
-    global area_num_in_system_type1, area_num_in_system_type2
-    global server_A_time_type1, server_A_time_type2, server_B_time_type1, server_B_time_type2
-
-    mean_delay_type1 = sum(delays_type1) / len(delays_type1) if delays_type1 else 0
-    mean_delay_type2 = sum(delays_type2) / len(delays_type2) if delays_type2 else 0
-    mean_waiting_time_type1 = (
-        sum(waiting_times_type1) / len(waiting_times_type1)
-        if waiting_times_type1
-        else 0
-    )
-    mean_waiting_time_type2 = (
-        sum(waiting_times_type2) / len(waiting_times_type2)
-        if waiting_times_type2
-        else 0
+        df: graus de liberdade
+        confidence: nível de confiança do intervalo
+    Returns:
+        valor t tal que P(|T| <= t) = confidence
+    """
+    p = 0.5 + confidence / 2
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = statistics.NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z**3 + z) / (4 * df)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+        + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3)
+        + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z)
+        / (92160 * df**4)
     )
-    mean_area_num_in_queue_type1 = area_num_in_queue_type1 / config.SIM_TIME
-    mean_area_num_in_queue_type2 = area_num_in_queue_type2 / config.SIM_TIME
-    mean_num_in_system_type1 = area_num_in_system_type1 / config.SIM_TIME
-    mean_num_in_system_type2 = area_num_in_system_type2 / config.SIM_TIME
 
-    if print_stats == False:
-        return
 
-    print(
-        "\n---------------------------- Simulation Report ----------------------------"
-    )
-    print(
-        f"Steady-state average delay - Type 1: {format_time(mean_delay_type1)}, Type 2: {format_time(mean_delay_type2)}"
-    )
-    print(
-        f"Steady-state average waiting time - Type 1: {format_time(mean_waiting_time_type1)}, Type 2: {format_time(mean_waiting_time_type2)}"
-    )
-    print(
-        f"Steady-state average number in queue - Type 1: {mean_area_num_in_queue_type1:.2f}, Type 2: {mean_area_num_in_queue_type2:.2f}"
-    )
-    print(
-        f"Steady-state average number in system - Type 1: {mean_num_in_system_type1:.2f}, Type 2: {mean_num_in_system_type2:.2f}"
-    )
+QUANTILES = (0.5, 0.9, 0.95)  # Percentis estimados para atrasos e tempos de espera
+MSER_BATCH = 5  # Observações por micro-lote no MSER-5
 
-    print("\nServer utilization:")
-    for i in range(len(server_A_time_type1)):
-        perc1 = 100 * server_A_time_type1[i] / config.SIM_TIME
-        perc2 = 100 * server_A_time_type2[i] / config.SIM_TIME
-        print(f"\tServer A{i+1} - Type 1: {perc1:.2f}%, Type 2: {perc2:.2f}%")
-
-    for i in range(len(server_B_time_type1)):
-        perc1 = 100 * server_B_time_type1[i] / config.SIM_TIME
-        perc2 = 100 * server_B_time_type2[i] / config.SIM_TIME
-        print(f"\tServer B{i+1} - Type 1: {perc1:.2f}%, Type 2: {perc2:.2f}%")
-    print(
-        "---------------------------------------------------------------------------\n"
-    )
+
+class P2Quantile:
+    """
+    Estimador de um quantil em memória constante (algoritmo P² de Jain e Chlamtac).
+    Mantém apenas cinco marcadores, cujas alturas são ajustadas a cada observação.
+    """
+
+    def __init__(self, p):
+        """
+        Inicializa o estimador.
+        Inputs:
+            p: quantil a estimar (entre 0 e 1)
+        Returns: Nenhum
+        """
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        """
+        Atualiza os marcadores com uma nova observação.
+        Inputs:
+            x: valor observado
+        Returns: Nenhum
+        """
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                # Interpolação parabólica; se sair do intervalo, usa a linear
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp
+                n[i] += d
+
+    def value(self):
+        """
+        Devolve a estimativa atual do quantil.
+        Inputs: Nenhum
+        Returns:
+            estimativa do quantil (0 se não houver observações)
+        """
+        q = self.heights
+        if not q:
+            return 0
+        if len(q) < 5:
+            return q[int(round(self.p * (len(q) - 1)))]
+        return q[2]
+
+
+class RunningStat:
+    """
+    Acumulador online de uma série de observações: contagem, média e variância
+    (método de Welford), mínimo, máximo e quantis P², em memória constante.
+    """
+
+    def __init__(self, quantiles=QUANTILES, batch_size=None):
+        """
+        Inicializa o acumulador vazio.
+        Inputs:
+            quantiles: quantis a estimar
+            batch_size: se indicado, guarda também a média de cada micro-lote de
+                batch_size observações consecutivas (série para estado estacionário)
+        Returns: Nenhum
+        """
+        self.batch_size = batch_size
+        self.batch_means = []
+        self.batch_sum = 0.0
+        self.batch_count = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.quantiles = [P2Quantile(p) for p in quantiles]
+
+    def add(self, x):
+        """
+        Acrescenta uma observação.
+        Inputs:
+            x: valor observado
+        Returns: Nenhum
+        """
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        for q in self.quantiles:
+            q.add(x)
+        if self.batch_size:
+            self.batch_sum += x
+            self.batch_count += 1
+            if self.batch_count == self.batch_size:
+                self.batch_means.append(self.batch_sum / self.batch_size)
+                self.batch_sum = 0.0
+                self.batch_count = 0
+
+    def variance(self):
+        """
+        Devolve a variância amostral das observações.
+        Inputs: Nenhum
+        Returns:
+            variância amostral (0 com menos de duas observações)
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def std(self):
+        """
+        Devolve o desvio padrão amostral das observações.
+        Inputs: Nenhum
+        Returns:
+            desvio padrão amostral
+        """
+        return self.variance() ** 0.5
+
+    def percentiles(self):
+        """
+        Devolve as estimativas dos quantis.
+        Inputs: Nenhum
+        Returns:
+            dicionário {p: estimativa}
+        """
+        return {q.p: q.value() for q in self.quantiles}
+
+    def __len__(self):
+        return self.count
+
+
+class TimeBins:
+    """
+    Médias temporais de várias grandezas em intervalos consecutivos de largura fixa
+    (por exemplo, o número médio em fila em cada minuto), usadas como série para a
+    estimação em estado estacionário de médias ponderadas pelo tempo.
+    """
+
+    def __init__(self, width, num_series):
+        """
+        Inicializa os intervalos vazios.
+        Inputs:
+            width: largura de cada intervalo de tempo
+            num_series: número de grandezas acumuladas
+        Returns: Nenhum
+        """
+        self.width = width
+        self.end = width
+        self.areas = [0.0] * num_series
+        self.means = [[] for _ in range(num_series)]
+
+    def add(self, start, dt, values):
+        """
+        Acumula grandezas constantes no intervalo [start, start + dt].
+        Inputs:
+            start: início do intervalo
+            dt: duração do intervalo
+            values: valor de cada grandeza durante o intervalo
+        Returns: Nenhum
+        """
+        stop = start + dt
+        while stop >= self.end:
+            part = self.end - start
+            for i, v in enumerate(values):
+                self.means[i].append((self.areas[i] + v * part) / self.width)
+                self.areas[i] = 0.0
+            start = self.end
+            self.end += self.width
+        part = stop - start
+        for i, v in enumerate(values):
+            self.areas[i] += v * part
+
+
+def mser(series):
+    """
+    Determina o ponto de truncagem do período transitório pela regra MSER:
+    o número d de observações iniciais a descartar que minimiza
+    sum((x_i - média)^2) / (n - d)^2 sobre as restantes, com d <= n / 2.
+    Aplicada a médias de micro-lotes de 5 observações é a regra MSER-5.
+    Inputs:
+        series: série de observações por ordem temporal
+    Returns:
+        número de observações iniciais a descartar
+    """
+    n = len(series)
+    if n < 2:
+        return 0
+    # Somas dos sufixos para avaliar todas as truncagens em O(n)
+    suffix_sum = [0.0] * (n + 1)
+    suffix_sq = [0.0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix_sum[i] = suffix_sum[i + 1] + series[i]
+        suffix_sq[i] = suffix_sq[i + 1] + series[i] * series[i]
+    best, best_d = float("inf"), 0
+    for d in range(n // 2 + 1):
+        m = n - d
+        mean = suffix_sum[d] / m
+        value = max(suffix_sq[d] / m - mean * mean, 0.0) / m
+        if value < best:
+            best, best_d = value, d
+    return best_d
+
+
+def batch_means(series, num_batches=20, confidence=0.95):
+    """
+    Estima a média de uma série estacionária e o intervalo de confiança pelo
+    método das médias de lotes não sobrepostos.
+    Inputs:
+        series: série (já sem o período transitório)
+        num_batches: número de lotes
+        confidence: nível de confiança do intervalo
+    Returns:
+        tuplo (média, semi-amplitude do intervalo de confiança); a semi-amplitude
+        é nan se a série tiver menos de duas observações por lote
+    """
+    if not series:
+        return 0.0, float("nan")
+    size = len(series) // num_batches
+    if size == 0:
+        return statistics.fmean(series), float("nan")
+    means = [
+        statistics.fmean(series[i * size : (i + 1) * size]) for i in range(num_batches)
+    ]
+    half_width = t_critical(num_batches - 1, confidence) * statistics.stdev(means)
+    return statistics.fmean(series), half_width / math.sqrt(num_batches)
+
+
+def steady_state(series, scale=1, num_batches=20, confidence=0.95):
+    """
+    Estimativa de estado estacionário de uma série: truncagem MSER seguida de
+    médias de lotes.
+    Inputs:
+        series: série de observações (ou médias de micro-lotes) por ordem temporal
+        scale: observações representadas por cada elemento da série
+        num_batches: número de lotes
+        confidence: nível de confiança do intervalo
+    Returns:
+        dicionário com a média, a semi-amplitude e o aquecimento descartado
+        (em observações originais)
+    """
+    d = mser(series)
+    mean, half_width = batch_means(series[d:], num_batches, confidence)
+    return {"mean": mean, "half_width": half_width, "warmup": d * scale}
+
+
+class Statistics:
+    """
+    Acumuladores estatísticos de uma única simulação. Atrasos e tempos de espera
+    são acumulados online (RunningStat), sem guardar as observações.
+    Cada simulação tem a sua própria instância, pelo que várias simulações podem
+    correr no mesmo processo sem partilhar estado.
+    Em modo de estado estacionário guarda também as médias de micro-lotes das
+    observações e as médias por intervalo de tempo das filas e do sistema, a
+    partir das quais são estimados o aquecimento (MSER-5) e os intervalos de
+    confiança (médias de lotes) numa única execução longa.
+    """
+
+    def __init__(
+        self,
+        num_servers_A,
+        num_servers_B,
+        steady_state=False,
+        bin_width=1.0,
+        num_batches=20,
+    ):
+        """
+        Inicializa os acumuladores a zero.
+        Inputs:
+            num_servers_A: número de servidores do tipo A
+            num_servers_B: número de servidores do tipo B
+            steady_state: recolhe as séries para a estimação em estado estacionário
+            bin_width: largura dos intervalos de tempo das médias de filas/sistema
+            num_batches: número de lotes das médias de lotes
+        Returns: Nenhum
+        """
+        batch_size = MSER_BATCH if steady_state else None
+        self.num_batches = num_batches
+        self.delays_type1 = RunningStat(batch_size=batch_size)
+        self.delays_type2 = RunningStat(batch_size=batch_size)
+        self.waiting_times_type1 = RunningStat(batch_size=batch_size)
+        self.waiting_times_type2 = RunningStat(batch_size=batch_size)
+        # Número em fila e no sistema (tipo 1, tipo 2) por intervalo de tempo
+        self.time_bins = TimeBins(bin_width, 4) if steady_state else None
+        self.area_num_in_queue_type1 = 0.0
+        self.area_num_in_queue_type2 = 0.0
+        self.area_num_in_system_type1 = 0.0
+        self.area_num_in_system_type2 = 0.0
+        self.server_A_time_type1 = [0.0 for _ in range(num_servers_A)]
+        self.server_A_time_type2 = [0.0 for _ in range(num_servers_A)]
+        self.server_B_time_type1 = [0.0 for _ in range(num_servers_B)]
+        self.server_B_time_type2 = [0.0 for _ in range(num_servers_B)]
+
+    def summary(self, sim_time):
+        """
+        Calcula as métricas finais da simulação.
+        Inputs:
+            sim_time: tempo total de simulação
+        Returns:
+            dicionário com atrasos, tempos de espera, números médios em fila/sistema
+            e utilização (%) de cada servidor por tipo de cliente
+        """
+        result = {
+            "delay1": self.delays_type1.mean,
+            "delay2": self.delays_type2.mean,
+            "waiting1": self.waiting_times_type1.mean,
+            "waiting2": self.waiting_times_type2.mean,
+            "queue1": self.area_num_in_queue_type1 / sim_time,
+            "queue2": self.area_num_in_queue_type2 / sim_time,
+            "system1": self.area_num_in_system_type1 / sim_time,
+            "system2": self.area_num_in_system_type2 / sim_time,
+        }
+        for key, acc in (
+            ("delay1", self.delays_type1),
+            ("delay2", self.delays_type2),
+            ("waiting1", self.waiting_times_type1),
+            ("waiting2", self.waiting_times_type2),
+        ):
+            result[f"{key}_std"] = acc.std()
+            result[f"{key}_max"] = acc.max if acc.count else 0
+            for p, value in acc.percentiles().items():
+                result[f"{key}_p{round(p * 100)}"] = value
+        for i in range(len(self.server_A_time_type1)):
+            result[f"utilA{i+1}_type1"] = 100 * self.server_A_time_type1[i] / sim_time
+            result[f"utilA{i+1}_type2"] = 100 * self.server_A_time_type2[i] / sim_time
+        for i in range(len(self.server_B_time_type1)):
+            result[f"utilB{i+1}_type1"] = 100 * self.server_B_time_type1[i] / sim_time
+            result[f"utilB{i+1}_type2"] = 100 * self.server_B_time_type2[i] / sim_time
+        if self.time_bins is not None:
+            for key, acc in (
+                ("delay1", self.delays_type1),
+                ("delay2", self.delays_type2),
+                ("waiting1", self.waiting_times_type1),
+                ("waiting2", self.waiting_times_type2),
+            ):
+                self.add_steady_state(result, key, acc.batch_means, MSER_BATCH)
+            for key, means in zip(
+                ("queue1", "queue2", "system1", "system2"), self.time_bins.means
+            ):
+                self.add_steady_state(result, key, means, self.time_bins.width)
+        return result
+
+    def add_steady_state(self, result, key, series, scale):
+        """
+        Acrescenta ao resumo a estimativa de estado estacionário de uma série:
+        chaves {key}_ss (média), {key}_ss_hw (semi-amplitude) e {key}_warmup
+        (observações, ou tempo no caso das filas, descartados como aquecimento).
+        Inputs:
+            result: dicionário do resumo a completar
+            key: nome da métrica
+            series: série de micro-lotes ou de intervalos de tempo
+            scale: observações (ou tempo) representados por cada elemento
+        Returns: Nenhum
+        """
+        estimate = steady_state(series, scale, self.num_batches)
+        result[f"{key}_ss"] = estimate["mean"]
+        result[f"{key}_ss_hw"] = estimate["half_width"]
+        result[f"{key}_warmup"] = estimate["warmup"]
+
+    def report(self, sim_time, print_stats=True):
+        """
+        Imprime um relatório com estatísticas da simulação.
+        Inputs:
+            sim_time: tempo total de simulação
+            print_stats: se True, imprime os resultados no terminal
+        Returns:
+            dicionário com as métricas calculadas por summary()
+        """
+        result = self.summary(sim_time)
+
+        if print_stats == False:
+            return result
+
+        print(
+            "\n---------------------------- Simulation Report ----------------------------"
+        )
+        print(
+            f"Steady-state average delay - Type 1: {format_time(result['delay1'])}, Type 2: {format_time(result['delay2'])}"
+        )
+        print(
+            f"Steady-state average waiting time - Type 1: {format_time(result['waiting1'])}, Type 2: {format_time(result['waiting2'])}"
+        )
+        for label, key in (("delay", "delay"), ("waiting time", "waiting")):
+            for t in (1, 2):
+                percentiles = ", ".join(
+                    f"p{round(p * 100)} {format_time(result[f'{key}{t}_p{round(p * 100)}'])}"
+                    for p in QUANTILES
+                )
+                print(
+                    f"\t{label.capitalize()} Type {t} - std: {format_time(result[f'{key}{t}_std'])}, "
+                    f"{percentiles}, max: {format_time(result[f'{key}{t}_max'])}"
+                )
+        print(
+            f"Steady-state average number in queue - Type 1: {result['queue1']:.2f}, Type 2: {result['queue2']:.2f}"
+        )
+        print(
+            f"Steady-state average number in system - Type 1: {result['system1']:.2f}, Type 2: {result['system2']:.2f}"
+        )
+
+        if self.time_bins is not None:
+            print(
+                f"\nSteady-state estimates (MSER-5 warm-up, {self.num_batches} batch means):"
+            )
+            for t in (1, 2):
+                for label, key in (("Delay", "delay"), ("Waiting time", "waiting")):
+                    print(
+                        f"\t{label} Type {t}: {format_time(result[f'{key}{t}_ss'])} "
+                        f"± {60 * result[f'{key}{t}_ss_hw']:.1f}s "
+                        f"(warm-up: {result[f'{key}{t}_warmup']} customers)"
+                    )
+                for label, key in (("queue", "queue"), ("system", "system")):
+                    print(
+                        f"\tNumber in {label} Type {t}: {result[f'{key}{t}_ss']:.3f} "
+                        f"± {result[f'{key}{t}_ss_hw']:.3f} "
+                        f"(warm-up: {result[f'{key}{t}_warmup']:g} min)"
+                    )
+
+        print("\nServer utilization:")
+        for i in range(len(self.server_A_time_type1)):
+            perc1 = result[f"utilA{i+1}_type1"]
+            perc2 = result[f"utilA{i+1}_type2"]
+            print(f"\tServer A{i+1} - Type 1: {perc1:.2f}%, Type 2: {perc2:.2f}%")
+
+        for i in range(len(self.server_B_time_type1)):
+            perc1 = result[f"utilB{i+1}_type1"]
+            perc2 = result[f"utilB{i+1}_type2"]
+            print(f"\tServer B{i+1} - Type 1: {perc1:.2f}%, Type 2: {perc2:.2f}%")
+        print(
+            "---------------------------------------------------------------------------\n"
+        )
+        return result
@@ -0,0 +1,95 @@
+import itertools
+import numpy as np
+
+BLOCK_SIZE = 65536  # Tamanho máximo de cada bloco de variáveis pré-geradas
+FIRST_BLOCK_SIZE = 64  # Tamanho do primeiro bloco (duplica a cada recarga)
+
+
+class VariateBuffer:
+    """
+    Fornecedor de variáveis aleatórias pré-geradas em blocos NumPy.
+    Cada bloco é gerado de uma só vez por um numpy.random.Generator (por inversão
+    da função de distribuição, a partir de uniformes) e as variáveis são entregues
+    uma a uma por next, um cursor em C (itertools.chain sobre os blocos), o que
+    evita uma chamada ao gerador em Python por variável. Os blocos são gerados
+    quando o cursor se esgota, começam pequenos e duplicam até ao tamanho máximo,
+    para que simulações curtas não paguem a geração de blocos grandes.
+    O cursor não é gravado por pickle (os objetos do itertools deixaram de o
+    suportar): grava-se o iterador do bloco corrente, que guarda a sua posição, e
+    o cursor é reconstruído a partir dele.
+    """
+
+    def __init__(self, seed, kind="uniform", antithetic=False, block_size=BLOCK_SIZE):
+        """
+        Cria o fornecedor; o primeiro bloco só é gerado no primeiro pedido.
+        Inputs:
+            seed: semente (int, numpy.random.SeedSequence ou None)
+            kind: "uniform" para uniformes em (0, 1) ou "exponential" para
+                exponenciais de média 1
+            antithetic: gera a partir de 1 - u em vez de u
+            block_size: tamanho máximo dos blocos
+        Returns: Nenhum
+        """
+        if kind not in ("uniform", "exponential"):
+            raise ValueError(f"Tipo de variável inválido: {kind}")
+        self.rng = np.random.default_rng(seed)
+        self.kind = kind
+        self.antithetic = antithetic
+        self.block_size = block_size
+        self.next_size = min(FIRST_BLOCK_SIZE, block_size)
+        self.block = iter(())  # Iterador do bloco corrente
+        self.next = itertools.chain.from_iterable(self).__next__
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["next"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Retoma o bloco corrente na posição gravada antes de gerar novos blocos
+        self.next = itertools.chain.from_iterable(
+            itertools.chain((self.block,), self)
+        ).__next__
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """
+        Gera o próximo bloco de variáveis (chamado pelo cursor quando se esgota).
+        Inputs: Nenhum
+        Returns:
+            iterador sobre as variáveis do bloco
+        """
+        u = self.rng.random(self.next_size)
+        # Descarta u = 0 para que u e 1 - u estejam ambos em (0, 1)
+        zeros = u == 0.0
+        while zeros.any():
+            u[zeros] = self.rng.random(int(zeros.sum()))
+            zeros = u == 0.0
+        if self.antithetic:
+            u = 1.0 - u
+        if self.kind == "exponential":
+            u = -np.log1p(-u)
+        self.next_size = min(2 * self.next_size, self.block_size)
+        self.block = iter(u.tolist())
+        return self.block
+
+
+def spawn_buffers(seed, kinds, antithetic=False, block_size=BLOCK_SIZE):
+    """
+    Cria um fornecedor independente por finalidade a partir de uma única semente.
+    Inputs:
+        seed: semente da simulação (None para entropia do sistema)
+        kinds: dicionário {finalidade: tipo de variável}
+        antithetic: gera a partir de 1 - u em vez de u
+        block_size: tamanho máximo dos blocos
+    Returns:
+        dicionário {finalidade: VariateBuffer}
+    """
+    children = np.random.SeedSequence(seed).spawn(len(kinds))
+    return {
+        name: VariateBuffer(child, kind, antithetic, block_size)
+        for (name, kind), child in zip(kinds.items(), children)
+    }
@@ -7,6 +7,12 @@ GAMMA = 0.4       # Taxa de mortalidade per capita dos predadores
 DT = 0.1          # Intervalo de tempo
 T_FINAL = 1000    # Tempo total da simulação
 METHOD = "rk4"    # Método de variação de Lotka-Volterra
+RTOL = 1e-6       # Tolerância relativa do método adaptativo (rk45)
+ATOL = 1e-9       # Tolerância absoluta do método adaptativo (rk45)
 SAVE_PATH = ""    # Caminho para salvar os resultados
 COMPARE = False   # Flag para comparar métodos
+NO_PLOT = False   # Flag para escrever só os resultados, sem gráficos
+OUTPUT_EVERY = 1  # Regista só um em cada OUTPUT_EVERY passos
+OUTPUT_POINTS = 0 # Número de tempos de saída igualmente espaçados (0: todos os passos)
+TRAJECTORY_PATH = "" # Ficheiro .npy para escrever a trajetória em disco
 
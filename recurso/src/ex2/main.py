@@ -1,8 +1,11 @@
 import argparse
 import config
+import numpy as np
 import os
 from methods import simulate
-from plotting import plot_comparison, plot_single
+from trajectory import read_trajectory, thin
+
+# O matplotlib só é importado quando há gráficos para desenhar (ver --no-plot)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -16,19 +19,57 @@ if __name__ == "__main__":
     parser.add_argument("--tfinal", type=float, help="Tempo final da simulação", default=config.T_FINAL)
     parser.add_argument(
         "--method",
-        choices=["euler", "rk4"],
-        help="Método numérico a usar (euler ou rk4)",
+        choices=["euler", "rk4", "rk45"],
+        help="Método numérico a usar (euler, rk4 ou rk45 adaptativo)",
         default=config.METHOD,
     )
+    parser.add_argument("--rtol", type=float, help="Tolerância relativa do método rk45", default=config.RTOL)
+    parser.add_argument("--atol", type=float, help="Tolerância absoluta do método rk45", default=config.ATOL)
     parser.add_argument(
         "--compare",
         action="store_true",
         help="Compara os métodos de Euler e RK4",
     )
     parser.add_argument("--save_path", type=str, help="Diretório para guardar os gráficos gerados", default=config.SAVE_PATH)
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="Escreve apenas o estado final, sem importar o matplotlib nem desenhar gráficos",
+        default=config.NO_PLOT,
+    )
+    parser.add_argument(
+        "--output_every",
+        type=int,
+        help="Regista só um em cada N passos (o último passo é sempre registado)",
+        default=config.OUTPUT_EVERY,
+    )
+    parser.add_argument(
+        "--output_points",
+        type=int,
+        help="Regista N tempos igualmente espaçados entre 0 e tfinal (interpolados)",
+        default=config.OUTPUT_POINTS,
+    )
+    parser.add_argument(
+        "--trajectory_path",
+        type=str,
+        help="Ficheiro .npy onde a trajetória é escrita por blocos durante a simulação (com --compare, um por método)",
+        default=config.TRAJECTORY_PATH,
+    )
     args = parser.parse_args()
+    if args.output_points and args.output_every != 1:
+        parser.error("--output_points e --output_every não podem ser combinados")
+    t_eval = np.linspace(0.0, args.tfinal, args.output_points) if args.output_points else None
+
+    # Ficheiro da trajetória de cada método (vazio: trajetórias em memória)
+    paths = {}
+    if args.trajectory_path:
+        root, ext = os.path.splitext(args.trajectory_path)
+        if args.compare:
+            paths = {m: f"{root}_{m}{ext or '.npy'}" for m in ("euler", "rk4")}
+        else:
+            paths = {args.method: args.trajectory_path}
 
-    if args.save_path:
+    if args.save_path and not args.no_plot:
         if not os.path.exists(args.save_path):
             os.makedirs(args.save_path)
 
@@ -43,6 +84,9 @@ if __name__ == "__main__":
             args.dt,
             args.tfinal,
             "euler",
+            t_eval=t_eval,
+            output_every=args.output_every,
+            output_path=paths.get("euler"),
         )
         times_rk, xs_rk, ys_rk = simulate(
             args.x0,
@@ -54,10 +98,23 @@ if __name__ == "__main__":
             args.dt,
             args.tfinal,
             "rk4",
+            t_eval=t_eval,
+            output_every=args.output_every,
+            output_path=paths.get("rk4"),
         )
-        plot_comparison(
-            times_e, xs_e, ys_e, times_rk, xs_rk, ys_rk, args.dt, args.save_path
-        )
+        if args.no_plot:
+            print(f"euler: t = {times_e[-1]:g}, presas = {xs_e[-1]:.6f}, predadores = {ys_e[-1]:.6f}")
+            print(f"rk4: t = {times_rk[-1]:g}, presas = {xs_rk[-1]:.6f}, predadores = {ys_rk[-1]:.6f}")
+        else:
+            from plotting import plot_comparison
+
+            if paths:
+                # Só as linhas desenhadas são lidas do disco
+                times_e, xs_e, ys_e = thin(read_trajectory(paths["euler"])).T
+                times_rk, xs_rk, ys_rk = thin(read_trajectory(paths["rk4"])).T
+            plot_comparison(
+                times_e, xs_e, ys_e, times_rk, xs_rk, ys_rk, args.dt, args.save_path
+            )
     else:
         times, xs, ys = simulate(
             args.x0,
@@ -69,6 +126,18 @@ if __name__ == "__main__":
             args.dt,
             args.tfinal,
             args.method,
+            args.rtol,
+            args.atol,
+            t_eval=t_eval,
+            output_every=args.output_every,
+            output_path=paths.get(args.method),
         )
 
-        plot_single(times, xs, ys, args.method, args.dt, args.save_path)
+        if args.no_plot:
+            print(f"{args.method}: t = {times[-1]:g}, presas = {xs[-1]:.6f}, predadores = {ys[-1]:.6f}")
+        else:
+            from plotting import plot_single
+
+            if paths:
+                times, xs, ys = thin(read_trajectory(paths[args.method])).T
+            plot_single(times, xs, ys, args.method, args.dt, args.save_path)
@@ -1,3 +1,7 @@
+import numpy as np
+from trajectory import TrajectoryWriter, read_trajectory
+
+
 def initialize(x0, y0):
     """
     Inicializa o estado da simulação com os valores iniciais.
@@ -34,6 +38,28 @@ def observe(t, x, y, times, xs, ys):
     ys.append(y)
 
 
+def hermite(t0, s0, f0, t1, s1, f1, times):
+    """
+    Interpolação cúbica de Hermite do estado dentro de um passo, a partir dos
+    estados e das derivadas nos dois extremos (terceira ordem no passo).
+    Inputs:
+        t0, t1: tempos de início e de fim do passo
+        s0, s1: estados em t0 e t1
+        f0, f1: derivadas do estado em t0 e t1
+        times: tempos de saída dentro de [t0, t1]
+    Returns:
+        array (len(times), n) com os estados interpolados
+    """
+    h = t1 - t0
+    theta = ((np.asarray(times) - t0) / h)[:, None]
+    return (
+        (1 + 2 * theta) * (1 - theta) ** 2 * np.asarray(s0)
+        + theta * (1 - theta) ** 2 * h * np.asarray(f0)
+        + theta**2 * (3 - 2 * theta) * np.asarray(s1)
+        + theta**2 * (theta - 1) * h * np.asarray(f1)
+    )
+
+
 def dx(x, y, alpha, beta):
     """
     Calcula a taxa de variação da população de presas (dx/dt) no modelo Lotka-Volterra adaptado.
@@ -105,30 +131,489 @@ def update_rk4(x, y, alpha, beta, delta, gamma, dt):
     return x_new, y_new
 
 
-def simulate(x0, y0, alpha, beta, delta, gamma, dt, t_final, method):
+# Tabela de Butcher do método embebido de Dormand-Prince 5(4)
+RK45_A = [
+    np.array([]),
+    np.array([1 / 5]),
+    np.array([3 / 40, 9 / 40]),
+    np.array([44 / 45, -56 / 15, 32 / 9]),
+    np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+]
+RK45_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+# Diferença entre a solução de ordem 5 e a de ordem 4 (estimativa do erro local)
+RK45_E = np.array(
+    [-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40]
+)
+# Coeficientes da interpolação contínua de ordem 4 (dense output)
+RK45_P = np.array(
+    [
+        [
+            1,
+            -8048581381 / 2820520608,
+            8663915743 / 2820520608,
+            -12715105075 / 11282082432,
+        ],
+        [0, 0, 0, 0],
+        [
+            0,
+            131558114200 / 32700410799,
+            -68118460800 / 10900136933,
+            87487479700 / 32700410799,
+        ],
+        [
+            0,
+            -1754552775 / 470086768,
+            14199869525 / 1410260304,
+            -10690763975 / 1880347072,
+        ],
+        [
+            0,
+            127303824393 / 49829197408,
+            -318862633887 / 49829197408,
+            701980252875 / 199316789632,
+        ],
+        [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+        [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+    ]
+)
+
+
+def rk45_step(f, state, k1, h):
+    """
+    Realiza um passo do método de Dormand-Prince 5(4).
+    Inputs:
+        f: função que devolve a derivada do estado
+        state: estado atual (array)
+        k1: derivada no estado atual (reaproveitada do passo anterior)
+        h: passo de tempo
+    Returns:
+        state_new: estado após o passo h (ordem 5)
+        K: array (7, n) com as derivadas de todos os estágios
+        err: estimativa do erro local do passo
+    """
+    K = np.empty((7, len(state)))
+    K[0] = k1
+    for s in range(1, 6):
+        K[s] = f(state + h * (RK45_A[s] @ K[:s]))
+    state_new = state + h * (RK45_B @ K[:6])
+    K[6] = f(state_new)
+    err = h * (RK45_E @ K)
+    return state_new, K, err
+
+
+def integrate_rk45(
+    f, state0, t_final, h0, rtol, atol, t_eval=None, output_every=1, writer=None
+):
+    """
+    Integra um sistema de EDOs com o método adaptativo de Dormand-Prince 5(4).
+    O passo é escolhido para manter o erro local abaixo de atol + rtol * |estado|.
+    Inputs:
+        f: função que devolve a derivada do estado
+        state0: estado inicial
+        t_final: tempo final da integração
+        h0: passo inicial
+        rtol, atol: tolerâncias relativa e absoluta
+        t_eval: tempos de saída (ordenados); se None, devolve os passos aceites
+        output_every: sem t_eval, regista só um em cada output_every passos
+            aceites (o estado inicial e o último passo são sempre registados)
+        writer: TrajectoryWriter onde escrever as linhas (t, *estado); se None,
+            são guardadas em memória
+    Returns:
+        times: lista de tempos (vazia se writer for dado)
+        states: lista de estados nesses tempos (vazia se writer for dado)
+        nfev: número de avaliações de f
+    """
+    t = 0.0
+    state = np.array(state0, dtype=float)
+    k1 = f(state)
+    nfev = 1
+    h = h0
+    accepted = 0
+
+    times, states = [], []
+    if t_eval is None:
+        t_eval_start = [t]
+    else:
+        t_eval = np.asarray(t_eval, dtype=float)
+        i_eval = np.searchsorted(t_eval, t, side="right")
+        t_eval_start = t_eval[:i_eval]
+    if writer is None:
+        times.extend(t_eval_start)
+        states.extend(state for _ in t_eval_start)
+    else:
+        writer.extend(np.concatenate(([te], state)) for te in t_eval_start)
+
+    while t < t_final:
+        last = t + h >= t_final
+        if last:
+            h = t_final - t
+        state_new, K, err = rk45_step(f, state, k1, h)
+        nfev += 6
+
+        scale = atol + rtol * np.maximum(np.abs(state), np.abs(state_new))
+        err_norm = np.sqrt(np.mean((err / scale) ** 2))
+
+        if err_norm <= 1:
+            t_new = t_final if last else t + h
+            accepted += 1
+            if t_eval is None:
+                if (last or accepted % output_every == 0) and writer is None:
+                    times.append(t_new)
+                    states.append(state_new)
+                elif last or accepted % output_every == 0:
+                    writer.append(np.concatenate(([t_new], state_new)))
+            else:
+                # Interpolação contínua para os tempos de saída dentro do passo
+                j_eval = np.searchsorted(t_eval, t_new, side="right")
+                if j_eval > i_eval:
+                    theta = (t_eval[i_eval:j_eval] - t) / h
+                    powers = np.cumprod(np.repeat(theta[:, None], 4, axis=1), axis=1)
+                    dense = state + h * powers @ (K.T @ RK45_P).T
+                    if writer is None:
+                        times.extend(t_eval[i_eval:j_eval])
+                        states.extend(dense)
+                    else:
+                        writer.extend(np.column_stack((t_eval[i_eval:j_eval], dense)))
+                    i_eval = j_eval
+            t, state, k1 = t_new, state_new, K[6]
+            factor = 10.0 if err_norm == 0 else min(10.0, 0.9 * err_norm**-0.2)
+        else:
+            factor = max(0.2, 0.9 * err_norm**-0.2)
+        h *= factor
+
+    return times, states, nfev
+
+
+def simulate_rk45(
+    x0,
+    y0,
+    alpha,
+    beta,
+    delta,
+    gamma,
+    dt,
+    t_final,
+    rtol,
+    atol,
+    t_eval=None,
+    output_every=1,
+    writer=None,
+):
+    """
+    Simula o sistema Lotka-Volterra adaptado com passo adaptativo (Dormand-Prince 5(4)).
+    Inputs:
+        x0, y0: populações iniciais
+        alpha, beta, delta, gamma: parâmetros do modelo
+        dt: passo inicial
+        t_final: tempo final da simulação
+        rtol, atol: tolerâncias relativa e absoluta
+        t_eval: tempos de saída (ordenados); se None, devolve os passos aceites
+        output_every: sem t_eval, regista só um em cada output_every passos aceites
+        writer: TrajectoryWriter onde escrever as linhas (t, x, y); se None, são
+            guardadas em memória
+    Returns:
+        times, xs, ys: listas de tempos e populações (vazias se writer for dado)
+        nfev: número de avaliações da derivada
+    """
+
+    def f(state):
+        x, y = state
+        return np.array([dx(x, y, alpha, beta), dy(x, y, delta, gamma)])
+
+    times, states, nfev = integrate_rk45(
+        f, (x0, y0), t_final, dt, rtol, atol, t_eval, output_every, writer
+    )
+    xs = [float(s[0]) for s in states]
+    ys = [float(s[1]) for s in states]
+    return [float(t) for t in times], xs, ys, nfev
+
+
+def simulate(
+    x0,
+    y0,
+    alpha,
+    beta,
+    delta,
+    gamma,
+    dt,
+    t_final,
+    method,
+    rtol=1e-6,
+    atol=1e-9,
+    t_eval=None,
+    output_every=1,
+    output_path=None,
+):
     """
     Simula o sistema Lotka-Volterra adaptado usando o método especificado.
+    Com output_every ou t_eval pode usar-se um dt pequeno sem guardar todos os
+    passos; com output_path a trajetória é escrita em disco por blocos à medida
+    que a integração avança, em vez de ficar em memória.
     Inputs:
         x0, y0: populações iniciais
         alpha, beta, delta, gamma: parâmetros do modelo
         dt: passo de tempo
         t_final: tempo final da simulação
-        method: método numérico ("euler" ou "rk4")
+        method: método numérico ("euler", "rk4" ou "rk45")
+        rtol, atol: tolerâncias do método adaptativo "rk45" (dt é o passo inicial)
+        t_eval: tempos de saída (ordenados), interpolados com a interpolação
+            contínua do "rk45" ou com a interpolação de Hermite nos métodos de
+            passo fixo; se None, devolve os passos
+        output_every: regista só um em cada output_every passos (o estado inicial
+            e o último passo são sempre registados); não se combina com t_eval
+        output_path: ficheiro .npy onde escrever a trajetória (colunas t, x, y);
+            se None, a trajetória fica em memória
     Returns:
         times: lista de tempos simulados
         xs: lista de populações de presas ao longo do tempo
         ys: lista de populações de predadores ao longo do tempo
+        (com output_path, colunas do ficheiro mapeado em memória)
+    """
+    if output_every < 1:
+        raise ValueError("output_every tem de ser pelo menos 1.")
+    if t_eval is not None and output_every != 1:
+        raise ValueError("t_eval e output_every não podem ser combinados.")
+    if method == "euler":
+        update = update_euler
+    elif method == "rk4":
+        update = update_rk4
+    elif method != "rk45":
+        raise ValueError("Método inválido. Use 'euler', 'rk4' ou 'rk45'.")
+
+    writer = TrajectoryWriter(output_path, 3) if output_path else None
+    try:
+        if method == "rk45":
+            times, xs, ys, _ = simulate_rk45(
+                x0,
+                y0,
+                alpha,
+                beta,
+                delta,
+                gamma,
+                dt,
+                t_final,
+                rtol,
+                atol,
+                t_eval,
+                output_every,
+                writer,
+            )
+        elif t_eval is not None:
+            times, xs, ys = simulate_eval(
+                x0, y0, alpha, beta, delta, gamma, dt, t_final, update, t_eval, writer
+            )
+        else:
+            times, xs, ys = simulate_fixed(
+                x0,
+                y0,
+                alpha,
+                beta,
+                delta,
+                gamma,
+                dt,
+                t_final,
+                update,
+                output_every,
+                writer,
+            )
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        return times, xs, ys
+    trajectory = read_trajectory(output_path)
+    return trajectory[:, 0], trajectory[:, 1], trajectory[:, 2]
+
+
+def simulate_fixed(
+    x0, y0, alpha, beta, delta, gamma, dt, t_final, update, output_every, writer=None
+):
+    """
+    Simula com um método de passo fixo e regista um em cada output_every passos.
+    Inputs:
+        x0, y0: populações iniciais
+        alpha, beta, delta, gamma: parâmetros do modelo
+        dt: passo de tempo
+        t_final: tempo final da simulação
+        update: função de atualização (update_euler ou update_rk4)
+        output_every: regista só um em cada output_every passos (o estado inicial
+            e o último passo são sempre registados)
+        writer: TrajectoryWriter onde escrever as linhas (t, x, y); se None, são
+            guardadas em memória
+    Returns:
+        times, xs, ys: listas de tempos e populações (vazias se writer for dado)
     """
     t, x, y, times, xs, ys = initialize(x0, y0)
+    if writer is not None:
+        times, xs, ys = [], [], []
+        writer.append((t, x, y))
 
+    step = 0
     while t < t_final:
-        if method == "euler":
-            x, y = update_euler(x, y, alpha, beta, delta, gamma, dt)
-        elif method == "rk4":
-            x, y = update_rk4(x, y, alpha, beta, delta, gamma, dt)
-        else:
-            raise ValueError("Método inválido. Use 'euler' ou 'rk4'.")
+        x, y = update(x, y, alpha, beta, delta, gamma, dt)
+        t += dt
+        step += 1
+        if step % output_every == 0 or t >= t_final:
+            if writer is None:
+                observe(t, x, y, times, xs, ys)
+            else:
+                writer.append((t, x, y))
+
+    return times, xs, ys
+
+
+def simulate_eval(
+    x0, y0, alpha, beta, delta, gamma, dt, t_final, update, t_eval, writer=None
+):
+    """
+    Simula com um método de passo fixo e regista só os tempos de saída pedidos,
+    interpolando o estado com a interpolação de Hermite do passo que os contém.
+    Inputs:
+        x0, y0: populações iniciais
+        alpha, beta, delta, gamma: parâmetros do modelo
+        dt: passo de tempo
+        t_final: tempo final da simulação
+        update: função de atualização (update_euler ou update_rk4)
+        t_eval: tempos de saída (ordenados)
+        writer: TrajectoryWriter onde escrever as linhas (t, x, y); se None, são
+            guardadas em memória
+    Returns:
+        times, xs, ys: listas de tempos e populações nos tempos de saída
+        (vazias se writer for dado)
+    """
+    t, x, y = 0.0, x0, y0
+    t_eval = np.asarray(t_eval, dtype=float)
+    i_eval = int(np.searchsorted(t_eval, t, side="right"))
+    times, xs, ys = [], [], []
+    if writer is None:
+        times.extend(t_eval[:i_eval].tolist())
+        xs.extend([x0] * i_eval)
+        ys.extend([y0] * i_eval)
+    else:
+        writer.extend((te, x0, y0) for te in t_eval[:i_eval])
+    # Só os passos que chegam ao próximo tempo de saída pagam a interpolação
+    t_next = t_eval[i_eval] if i_eval < len(t_eval) else np.inf
+
+    while t < t_final:
+        t_prev, x_prev, y_prev = t, x, y
+        x, y = update(x, y, alpha, beta, delta, gamma, dt)
         t += dt
-        observe(t, x, y, times, xs, ys)
+        if t >= t_next:
+            j_eval = int(np.searchsorted(t_eval, t, side="right"))
+            dense = hermite(
+                t_prev,
+                (x_prev, y_prev),
+                (dx(x_prev, y_prev, alpha, beta), dy(x_prev, y_prev, delta, gamma)),
+                t,
+                (x, y),
+                (dx(x, y, alpha, beta), dy(x, y, delta, gamma)),
+                t_eval[i_eval:j_eval],
+            )
+            if writer is None:
+                times.extend(t_eval[i_eval:j_eval].tolist())
+                xs.extend(dense[:, 0].tolist())
+                ys.extend(dense[:, 1].tolist())
+            else:
+                writer.extend(np.column_stack((t_eval[i_eval:j_eval], dense)))
+            i_eval = j_eval
+            t_next = t_eval[i_eval] if i_eval < len(t_eval) else np.inf
 
     return times, xs, ys
+
+
+def step_times(dt, t_final):
+    """
+    Calcula os instantes percorridos por simulate(), acumulando dt da mesma forma.
+    Inputs:
+        dt: passo de tempo
+        t_final: tempo final da simulação
+    Returns:
+        array com os tempos simulados (incluindo t = 0)
+    """
+    if t_final <= 0:
+        return np.zeros(1)
+    acc = np.add.accumulate(np.full(int(np.ceil(t_final / dt)) + 2, dt))
+    steps = int(np.argmax(acc >= t_final)) + 1
+    return np.concatenate(([0.0], acc[:steps]))
+
+
+def simulate_batch(x0, y0, alpha, beta, delta, gamma, dt, t_final, method):
+    """
+    Simula várias trajetórias do sistema Lotka-Volterra adaptado em simultâneo.
+    Os parâmetros e condições iniciais podem ser escalares ou arrays (com broadcast
+    entre si); todas as trajetórias avançam juntas com operações vetoriais NumPy.
+    Inputs:
+        x0, y0: populações iniciais
+        alpha, beta, delta, gamma: parâmetros do modelo
+        dt: passo de tempo (comum a todas as trajetórias)
+        t_final: tempo final da simulação
+        method: método numérico ("euler" ou "rk4")
+    Returns:
+        times: array (n_steps,) de tempos simulados
+        xs: array (n_traj, n_steps) de populações de presas
+        ys: array (n_traj, n_steps) de populações de predadores
+    """
+    if method not in ("euler", "rk4"):
+        raise ValueError("Método inválido. Use 'euler' ou 'rk4'.")
+
+    x, y, alpha, beta, delta, gamma = (
+        np.array(a, dtype=float)
+        for a in np.broadcast_arrays(np.atleast_1d(x0), y0, alpha, beta, delta, gamma)
+    )
+    times = step_times(dt, t_final)
+
+    # Cada passo escreve uma linha contígua; devolve-se a transposta (n_traj, n_steps)
+    xs = np.empty((len(times), len(x)))
+    ys = np.empty((len(times), len(x)))
+    xs[0] = x
+    ys[0] = y
+
+    # Parâmetros pré-multiplicados por dt e buffers reutilizados em todos os passos
+    a, b, d, g = alpha * dt, beta * dt, delta * dt, gamma * dt
+    kx = np.empty((4, len(x)))
+    ky = np.empty((4, len(x)))
+    xm = np.empty(len(x))
+    ym = np.empty(len(x))
+    tmp = np.empty(len(x))
+    stages = ((0, 0.5), (1, 0.5), (2, 1.0))
+
+    def rates(x, y, kx, ky):
+        # kx = dt * x * (alpha - beta * y), ky = dt * y * (delta * x - gamma)
+        np.multiply(b, y, out=tmp)
+        np.subtract(a, tmp, out=tmp)
+        np.multiply(x, tmp, out=kx)
+        np.multiply(d, x, out=tmp)
+        np.subtract(tmp, g, out=tmp)
+        np.multiply(y, tmp, out=ky)
+
+    for i in range(1, len(times)):
+        x_prev, y_prev = xs[i - 1], ys[i - 1]
+        x_next, y_next = xs[i], ys[i]
+        rates(x_prev, y_prev, kx[0], ky[0])
+        if method == "euler":
+            np.add(x_prev, kx[0], out=x_next)
+            np.add(y_prev, ky[0], out=y_next)
+            continue
+        for k, c in stages:
+            np.multiply(kx[k], c, out=xm)
+            np.add(x_prev, xm, out=xm)
+            np.multiply(ky[k], c, out=ym)
+            np.add(y_prev, ym, out=ym)
+            rates(xm, ym, kx[k + 1], ky[k + 1])
+        # x_next = x + (k1 + 2 k2 + 2 k3 + k4) / 6
+        np.add(kx[1], kx[2], out=tmp)
+        np.multiply(tmp, 2, out=tmp)
+        np.add(tmp, kx[0], out=tmp)
+        np.add(tmp, kx[3], out=tmp)
+        np.divide(tmp, 6, out=tmp)
+        np.add(x_prev, tmp, out=x_next)
+        np.add(ky[1], ky[2], out=tmp)
+        np.multiply(tmp, 2, out=tmp)
+        np.add(tmp, ky[0], out=tmp)
+        np.add(tmp, ky[3], out=tmp)
+        np.divide(tmp, 6, out=tmp)
+        np.add(y_prev, tmp, out=y_next)
+
+    return times, xs.T, ys.T
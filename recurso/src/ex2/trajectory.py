@@ -0,0 +1,135 @@
+import struct
+from array import array
+import numpy as np
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"  # Formato .npy, versão 1.0
+HEADER_SIZE = 128  # Bytes reservados para o cabeçalho .npy (múltiplo de 64)
+BUFFER_ROWS = 65536  # Linhas acumuladas em memória antes de cada escrita
+PLOT_POINTS = 100000  # Máximo de linhas lidas do disco para desenhar um gráfico
+
+
+def npy_header(rows, columns):
+    """
+    Constrói um cabeçalho .npy de tamanho fixo para um array float64 (rows, columns),
+    para que possa ser reescrito no lugar à medida que o ficheiro cresce.
+    Inputs:
+        rows: número de linhas
+        columns: número de colunas
+    Returns:
+        cabeçalho com HEADER_SIZE bytes
+    """
+    header = repr(
+        {"descr": np.dtype(float).str, "fortran_order": False, "shape": (rows, columns)}
+    )
+    header = header.ljust(HEADER_SIZE - len(NPY_MAGIC) - 3) + "\n"
+    return NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+class TrajectoryWriter:
+    """
+    Gravador de trajetórias em disco: cada linha (por exemplo t, x, y) é acumulada
+    num array de doubles e escrita num ficheiro .npy em blocos, à medida que a
+    integração avança. O cabeçalho é reescrito em cada escrita, pelo que o
+    ficheiro é sempre um .npy válido com as linhas já escritas, e a memória usada
+    não depende do tamanho da trajetória.
+    """
+
+    def __init__(self, path, columns, buffer_rows=BUFFER_ROWS):
+        """
+        Cria o ficheiro da trajetória e escreve o cabeçalho (ainda sem linhas).
+        Inputs:
+            path: ficheiro de destino (.npy)
+            columns: número de colunas de cada linha
+            buffer_rows: linhas acumuladas antes de cada escrita
+        Returns: Nenhum
+        """
+        self.path = path
+        self.columns = columns
+        self.buffer_rows = buffer_rows
+        self.rows = array("d")  # Valores acumulados, linha a linha
+        self.written = 0
+        self.file = open(path, "wb")
+        self.file.write(npy_header(0, columns))
+
+    def append(self, row):
+        """
+        Acrescenta uma linha à trajetória.
+        Inputs:
+            row: sequência com columns valores
+        Returns: Nenhum
+        """
+        self.rows.extend(row)
+        if len(self.rows) >= self.buffer_rows * self.columns:
+            self.flush()
+
+    def extend(self, rows):
+        """
+        Acrescenta várias linhas à trajetória.
+        Inputs:
+            rows: sequência de linhas
+        Returns: Nenhum
+        """
+        for row in rows:
+            self.rows.extend(row)
+        if len(self.rows) >= self.buffer_rows * self.columns:
+            self.flush()
+
+    def flush(self):
+        """
+        Escreve no ficheiro as linhas acumuladas e atualiza o cabeçalho.
+        Inputs: Nenhum
+        Returns: Nenhum
+        """
+        if self.rows:
+            self.rows.tofile(self.file)
+            self.written += len(self.rows) // self.columns
+            del self.rows[:]
+            self.file.seek(0)
+            self.file.write(npy_header(self.written, self.columns))
+            self.file.seek(0, 2)
+        self.file.flush()
+
+    def close(self):
+        """
+        Escreve as linhas pendentes e fecha o ficheiro.
+        Inputs: Nenhum
+        Returns: Nenhum
+        """
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trajectory(path):
+    """
+    Abre uma trajetória gravada como array NumPy mapeado em memória
+    (os dados só são lidos do disco quando usados).
+    Inputs:
+        path: ficheiro .npy da trajetória
+    Returns:
+        array (linhas, colunas) só de leitura; por exemplo, a coluna 0 são os tempos
+    """
+    return np.load(path, mmap_mode="r")
+
+
+def thin(trajectory, max_points=PLOT_POINTS):
+    """
+    Reduz uma trajetória a no máximo max_points linhas igualmente espaçadas (mais
+    a última), sem a carregar inteira: num array mapeado em memória, só as linhas
+    escolhidas são lidas do disco.
+    Inputs:
+        trajectory: array (linhas, colunas), por exemplo de read_trajectory()
+        max_points: número máximo de linhas a manter
+    Returns:
+        array (no máximo max_points + 1 linhas) com as linhas escolhidas
+    """
+    stride = max(1, -(-len(trajectory) // max_points))
+    rows = np.asarray(trajectory[::stride])
+    if stride > 1 and (len(trajectory) - 1) % stride:
+        rows = np.vstack((rows, trajectory[-1:]))
+    return rows